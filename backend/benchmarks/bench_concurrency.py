@@ -0,0 +1,231 @@
+"""Benchmark API throughput under many parallel requests against a slow database.
+
+Seeds an in-memory fake database (benchmarks.bench_scrape.FakeSupabase)
+whose every round trip blocks its thread for `--latency` seconds, like
+the real synchronous supabase client waiting on the network. Then fires
+`--requests` GETs at the app, `--concurrency` at a time, spread over the
+dashboard, profile, bookmarks, applications, preferences and
+recommendations routes (or `--routes`) of `--users` users — once per DB
+pool size in `--pool-sizes`. A pool of 1 runs one query at a time, which
+is what the routes did when they called `.execute()` straight on the
+event loop. `--no-rpc` serves the dashboard without the get_dashboard
+function, from its parallel-query fallback. `--page-loads` sends each
+user's requests for every route together, like the frontend does, and
+`--fields` adds a `fields=` projection to every request.
+
+Reports requests/sec, latency percentiles, response size and DB round
+trips per pool size.
+
+Usage (from backend/):
+    python -m benchmarks.bench_concurrency [--requests N] [--concurrency N]
+        [--latency SECONDS] [--users N] [--pool-sizes 1,8,32] [--routes dashboard,...] [--no-rpc]
+        [--page-loads] [--fields id,company,...]
+"""
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import time
+import uuid
+
+import httpx
+
+import supabase_client
+from benchmarks.bench_scrape import FakeSupabase
+from services import db_pool
+
+SKILLS = ["python", "javascript", "react", "sql", "django", "machine learning", "java", "docker", "aws", "figma"]
+WORK_TYPES = ["Remote", "On-site", "Hybrid"]
+ROUTES = {
+    "dashboard": "/api/dashboard/{user}",
+    "profile": "/api/profile/{user}",
+    "bookmarks": "/api/bookmarks/{user}",
+    "applications": "/api/applications/{user}",
+    "preferences": "/api/preferences/{user}",
+    "recommendations": "/api/recommendations/{user}?limit=20",
+}
+MATCH_OVERVIEW = {
+    "scored": 1, "materialized": True, "average_score": 50, "top_score": 90, "above_80": 3, "above_60": 10, "total_internships": 500,
+}
+
+
+def get_dashboard_rpc(db: FakeSupabase):
+    """In-memory stand-in for the get_dashboard SQL function."""
+    def rpc(params):
+        user = params["p_user_id"]
+        postings = {p["id"]: p for p in db.tables["internships"]}
+
+        def with_internship(row, *fields):
+            posting = postings.get(row["internship_id"], {})
+            return {
+                **{field: row.get(field) for field in fields},
+                "internships": {key: posting.get(key) for key in ("company", "role", "skills")},
+            }
+
+        resumes = sorted((r for r in db.tables["resumes"] if r["user_id"] == user),
+                         key=lambda r: r["created_at"], reverse=True)
+        bookmarks = sorted((b for b in db.tables["bookmarks"] if b["user_id"] == user),
+                           key=lambda b: b["created_at"], reverse=True)
+        applications = sorted((a for a in db.tables["applications"] if a["user_id"] == user),
+                              key=lambda a: a["updated_at"], reverse=True)
+        return {
+            "skills": resumes[0]["skills"] if resumes else None,
+            "bookmarks": [with_internship(b, "created_at") for b in bookmarks],
+            "applications": [with_internship(a, "status", "applied_at") for a in applications],
+            "match_overview": dict(MATCH_OVERVIEW),
+        }
+    return rpc
+
+
+def missing_rpc(params):
+    raise Exception("{'code': 'PGRST202', 'message': 'Could not find the function public.get_dashboard'}")
+
+
+def seed(db: FakeSupabase, users: int, internships: int = 500, seed_value: int = 0):
+    """Fill the fake tables; returns the user ids."""
+    rng = random.Random(seed_value)
+    postings = []
+    for n in range(internships):
+        postings.append({
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "role": f"Intern {n}",
+            "company": f"Company {n % 40}",
+            "skills": rng.sample(SKILLS, 3),
+            "work_type": rng.choice(WORK_TYPES),
+            "location": "Bangalore",
+            "description": f"Work on {', '.join(rng.sample(SKILLS, 3))} projects with the team. " * 20,
+            "stipend": "₹ 10,000 /month",
+            "apply_url": f"https://internshala.com/internship/detail/bench-{n}",
+            "posted_at": f"2026-01-{n % 28 + 1:02d}T00:00:00",
+        })
+    db.tables["internships"] = postings
+
+    user_ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(users)]
+    for user in user_ids:
+        db.tables.setdefault("profiles", []).append({"id": user, "full_name": "Bench User", "email": ""})
+        db.tables.setdefault("resumes", []).append({
+            "id": str(uuid.uuid4()), "user_id": user, "file_name": "resume.pdf",
+            "skills": rng.sample(SKILLS, 4), "ats_score": 70, "created_at": "2026-01-01T00:00:00",
+        })
+        db.tables.setdefault("user_preferences", []).append({
+            "id": str(uuid.uuid4()), "user_id": user, "internship_type": "python",
+            "work_mode": "Remote", "preferred_location": "", "target_roles": [],
+        })
+        for posting in rng.sample(postings, 5):
+            db.tables.setdefault("bookmarks", []).append({
+                "id": str(uuid.uuid4()), "user_id": user, "internship_id": posting["id"],
+                "created_at": "2026-01-02T00:00:00",
+            })
+            db.tables.setdefault("applications", []).append({
+                "id": str(uuid.uuid4()), "user_id": user, "internship_id": posting["id"],
+                "status": "Applied", "applied_at": "2026-01-02T00:00:00", "updated_at": "2026-01-02T00:00:00",
+            })
+    # Materialized match scores, so the dashboard doesn't fall back to rescoring
+    db.rpc_results["match_overview"] = MATCH_OVERVIEW
+    db.rpc_results["get_dashboard"] = get_dashboard_rpc(db)
+    return user_ids
+
+
+async def load(app, paths, concurrency: int):
+    """GET every path, `concurrency` in flight at once; returns (latencies, errors, bytes, elapsed)."""
+    latencies, errors, received = [], 0, 0
+    queue = iter(paths)
+
+    async def client_loop(client):
+        nonlocal errors, received
+        for path in queue:
+            start = time.perf_counter()
+            resp = await client.get(path)
+            latencies.append(time.perf_counter() - start)
+            received += len(resp.content)
+            if resp.status_code != 200:
+                errors += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, errors, received, elapsed
+
+
+def percentile(values, q: float) -> float:
+    return statistics.quantiles(values, n=100)[int(q) - 1] if len(values) > 1 else values[0]
+
+
+def run(requests: int = 1000, concurrency: int = 100, latency: float = 0.02,
+        users: int = 200, pool_sizes=(1, 8, 32), routes=None, dashboard_rpc: bool = True,
+        page_loads: bool = False, fields=None):
+    db = FakeSupabase(latency=latency)
+    user_ids = seed(db, users)
+    if not dashboard_rpc:
+        # As if create_dashboard_rpc.sql hadn't been run
+        db.rpc_results["get_dashboard"] = missing_rpc
+    # Routers bind the client at import time, so swap it in first
+    supabase_client.supabase, supabase_client.supabase_admin = db, None
+    from main import app
+    from services.internship_index import internship_index
+    from services.recommendation_cache import recommendation_cache
+    from services.user_data import user_data
+
+    rng = random.Random(1)
+    templates = [ROUTES[name] for name in (routes or ROUTES)]
+    if page_loads:
+        # Each user's requests go out back to back, like a page firing every endpoint at once
+        paths = []
+        while len(paths) < requests:
+            user = rng.choice(user_ids)
+            paths.extend(template.format(user=user) for template in templates)
+        paths = paths[:requests]
+    else:
+        paths = [rng.choice(templates).format(user=rng.choice(user_ids)) for _ in range(requests)]
+    if fields:
+        paths = [f"{path}{'&' if '?' in path else '?'}fields={fields}" for path in paths]
+
+    print(f"{requests} requests ({', '.join(routes or ROUTES)}), {concurrency} concurrent, {users} users, "
+          f"{latency * 1000:.0f} ms per DB round trip\n")
+    print(f"{'pool size':>9} {'req/sec':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'KiB/resp':>9} {'db calls':>9} {'errors':>7}")
+    results = {}
+    for size in pool_sizes:
+        db_pool.configure(size)
+        # Same cold start for every pool size
+        internship_index.load(db.tables["internships"])
+        recommendation_cache.clear()
+        user_data.clear()
+        db.calls = 0
+
+        latencies, errors, received, elapsed = asyncio.run(load(app, paths, concurrency))
+        results[size] = requests / elapsed
+        print(f"{size:>9} {requests / elapsed:>9.1f} {percentile(latencies, 50) * 1000:>8.1f} "
+              f"{percentile(latencies, 95) * 1000:>8.1f} {percentile(latencies, 99) * 1000:>8.1f} "
+              f"{received / requests / 1024:>9.1f} {db.calls:>9} {errors:>7}")
+    db_pool.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API throughput under parallel requests.")
+    parser.add_argument("--requests", type=int, default=1000, help="Total requests per pool size")
+    parser.add_argument("--concurrency", type=int, default=100, help="Requests in flight at once")
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulated seconds per DB round trip")
+    parser.add_argument("--users", type=int, default=200, help="Distinct users the requests are spread over")
+    parser.add_argument("--pool-sizes", default="1,8,32", help="Comma-separated DB pool sizes to compare")
+    parser.add_argument("--routes", help=f"Comma-separated subset of: {', '.join(ROUTES)}")
+    parser.add_argument("--no-rpc", action="store_true",
+                        help="Dashboard without the get_dashboard RPC (parallel-query fallback)")
+    parser.add_argument("--page-loads", action="store_true",
+                        help="Send each user's requests for every route together instead of at random")
+    parser.add_argument("--fields", help="fields= passed to every route, e.g. id,company,role")
+    args = parser.parse_args()
+
+    # Per-request INFO logs would swamp the report
+    logging.disable(logging.INFO)
+    run(args.requests, args.concurrency, args.latency, args.users,
+        [int(size) for size in args.pool_sizes.split(",")],
+        args.routes.split(",") if args.routes else None, not args.no_rpc, args.page_loads, args.fields)
+
+
+if __name__ == "__main__":
+    main()
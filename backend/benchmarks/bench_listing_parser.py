@@ -0,0 +1,80 @@
+"""Benchmark the listing parser backends over saved listing pages.
+
+Parses every HTML file in benchmarks/fixtures/ with each backend, checks
+that all of them return exactly the same dicts as the original full-page
+html.parser soup, and prints the median time per page over `--repeat`
+rounds.
+
+Usage (from backend/):
+    python -m benchmarks.bench_listing_parser [--repeat N] [--fixtures DIR]
+"""
+import argparse
+import logging
+import statistics
+import time
+from pathlib import Path
+
+from services.listing_parser import LxmlListingParser, SoupListingParser
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+BACKENDS = {
+    "soup (full page, original)": lambda: SoupListingParser(),
+    "soup + SoupStrainer": lambda: SoupListingParser(strainer=True),
+    "lxml": lambda: LxmlListingParser(),
+}
+
+
+def load_fixtures(directory: Path):
+    pages = {path.name: path.read_text(encoding="utf-8") for path in sorted(directory.glob("*.html"))}
+    if not pages:
+        raise SystemExit(f"No .html fixtures found in {directory}")
+    return pages
+
+
+def run(repeat: int = 50, directory: Path = FIXTURES_DIR):
+    pages = load_fixtures(directory)
+    parsers = {name: factory() for name, factory in BACKENDS.items()}
+
+    # Every backend must agree with the original parser before timing anything
+    baseline = parsers["soup (full page, original)"]
+    for page_name, html in pages.items():
+        expected = baseline.parse(html)
+        for name, parser in parsers.items():
+            if parser.parse(html) != expected:
+                raise SystemExit(f"{name} disagrees with the original parser on {page_name}")
+
+    listings = sum(len(baseline.parse(html)) for html in pages.values())
+    print(f"{len(pages)} fixture pages, {listings} listings, {repeat} rounds — all backends agree\n")
+
+    # Backends take turns within each round, so drift in machine load hits
+    # all of them alike; the median round is reported
+    rounds = {name: [] for name in parsers}
+    for _ in range(repeat):
+        for name, parser in parsers.items():
+            start = time.perf_counter()
+            for html in pages.values():
+                parser.parse(html)
+            rounds[name].append((time.perf_counter() - start) / len(pages))
+    timings = {name: statistics.median(samples) for name, samples in rounds.items()}
+
+    reference = timings["soup (full page, original)"]
+    print(f"{'backend':<28} {'ms/page':>9} {'speedup':>8}")
+    for name, per_page in timings.items():
+        print(f"{name:<28} {per_page * 1000:>9.2f} {reference / per_page:>7.1f}x")
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark listing parser backends.")
+    parser.add_argument("--repeat", type=int, default=50, help="Rounds over the fixture set")
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR, help="Directory of saved listing pages")
+    args = parser.parse_args()
+
+    # Per-page "Found N listing containers" logs would swamp the output
+    logging.getLogger("listing_parser").setLevel(logging.WARNING)
+    run(args.repeat, args.fixtures)
+
+
+if __name__ == "__main__":
+    main()
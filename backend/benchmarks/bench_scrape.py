@@ -0,0 +1,275 @@
+"""Benchmark the whole scrape path offline: fetch → parse → enrich → write.
+
+Builds a replay directory from the saved listing pages in
+benchmarks/fixtures/: every fixture is copied to `--copies` categories
+with `--pages` pages each, and apply URLs are made unique per copy. With
+`--details`, every posting also gets a copy of the saved detail page. It
+then runs `scrape_and_save` against ReplayTransport and an in-memory
+fake database, and reports pages/sec, listings/sec, parse and enrich
+time per listing (stage wall time, and busy time summed over the worker
+threads) and peak memory (tracemalloc).
+
+Usage (from backend/):
+    python -m benchmarks.bench_scrape [--copies N] [--pages N] [--latency SECONDS] [--details]
+"""
+import argparse
+import asyncio
+import copy
+import logging
+import re
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+import supabase_client
+from config import SCRAPE_PARSE_WORKERS
+from services.scrape_pipeline import scrape_and_save
+from services.scrape_replay import ReplayTransport, fixture_name
+from services.scraper import InternshalaScraper
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+DETAIL_FIXTURE = FIXTURES_DIR / "detail" / "python-development-internship.html"
+
+_WFH_PREFIX = "work-from-home-"
+_TOTAL_PAGES_RE = re.compile(r'(id=["\']total_pages["\'][^>]*>)\s*\d+')
+_DETAIL_HREF_RE = re.compile(r'href="(/internship/detail/[^"]+)"')
+
+
+# ── Fake database ──
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class _FakeQuery:
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.op = "select"
+        self.payload = None
+        self.filters = []
+        self.window = None
+        self.columns = None
+
+    def select(self, columns="*", **__):
+        # Plain columns only; embedded resources like internships(...) are ignored
+        if columns.strip() != "*":
+            self.columns = [c.strip() for c in columns.split(",") if "(" not in c and ")" not in c]
+        return self
+
+    def in_(self, column, values):
+        values = set(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def order(self, *_, **__):
+        return self
+
+    def limit(self, count):
+        self.window = (0, count)
+        return self
+
+    def range(self, start, end):
+        self.window = (start, end + 1)
+        return self
+
+    def insert(self, row):
+        self.op, self.payload = "insert", row
+        return self
+
+    def delete(self):
+        self.op = "delete"
+        return self
+
+    def update(self, data):
+        self.op, self.payload = "update", data
+        return self
+
+    def upsert(self, rows, on_conflict=None):
+        self.op, self.payload = "upsert", (rows, on_conflict)
+        return self
+
+    def execute(self):
+        self.db.round_trip()
+        rows = self.db.tables.setdefault(self.table, [])
+        if self.op == "insert":
+            row = {"id": str(uuid.uuid4()), **self.payload}
+            rows.append(row)
+            return _Result([dict(row)])
+        if self.op == "upsert":
+            items, key = self.payload
+            by_key = {r.get(key): r for r in rows} if key else {}
+            out = []
+            for item in items:
+                existing = by_key.get(item.get(key))
+                if existing is None:
+                    existing = {"id": str(uuid.uuid4())}
+                    rows.append(existing)
+                existing.update(item)
+                out.append(dict(existing))
+            return _Result(out)
+        matched = [r for r in rows if all(f(r) for f in self.filters)]
+        if self.op == "update":
+            for row in matched:
+                row.update(self.payload)
+        elif self.op == "delete":
+            rows[:] = [r for r in rows if not any(r is m for m in matched)]
+        if self.window:
+            matched = matched[self.window[0]:self.window[1]]
+        if self.columns is not None:
+            return _Result([{c: r[c] for c in self.columns if c in r} for r in matched])
+        return _Result([dict(r) for r in matched])
+
+
+class FakeSupabase:
+    """Just enough of the supabase client for the scrape write path and the API routes.
+
+    `latency` blocks the calling thread for that many seconds per round
+    trip, like the real (synchronous) client waiting on the network.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.tables = {}
+        self.calls = 0
+        self.latency = latency
+        self.rpc_results = {}  # function name → result, or callable(params) → result
+        self._lock = threading.Lock()
+
+    def round_trip(self):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def table(self, name):
+        return _FakeQuery(self, name)
+
+    def rpc(self, name, params=None):
+        db = self
+
+        class _Call:
+            def execute(self):
+                db.round_trip()
+                result = db.rpc_results.get(name, [])
+                if callable(result):
+                    result = result(params or {})
+                return _Result(copy.deepcopy(result))
+
+        return _Call()
+
+
+# ── Replay directory ──
+
+def variant_for(fixture: Path):
+    """(category, work_type) a listing-page fixture was recorded for."""
+    slug = fixture.stem
+    work_type = None
+    if slug.startswith(_WFH_PREFIX):
+        slug, work_type = slug[len(_WFH_PREFIX):], "remote"
+    return slug[:-len("-internships")].replace("-", " "), work_type
+
+
+def build_replay_dir(directory: Path, copies: int, pages: int, details: bool = False):
+    """Write `copies` categories × `pages` pages per fixture; returns the variants."""
+    detail_page = DETAIL_FIXTURE.read_text(encoding="utf-8") if details else None
+    variants = []
+    for fixture in sorted(FIXTURES_DIR.glob("*-internships.html")):
+        html = fixture.read_text(encoding="utf-8")
+        html = _TOTAL_PAGES_RE.sub(lambda m: f"{m.group(1)}{pages}", html)
+        category, work_type = variant_for(fixture)
+        for n in range(copies):
+            name = f"{category} {n}" if n else category
+            url = InternshalaScraper.build_url(name, work_type)
+            for page in range(1, pages + 1):
+                body = html.replace('href="/internship/detail/', f'href="/internship/detail/c{n}p{page}-')
+                page_url = InternshalaScraper.page_url(url, page)
+                (directory / fixture_name(page_url)).write_text(body, encoding="utf-8")
+                if detail_page is not None:
+                    for href in set(_DETAIL_HREF_RE.findall(body)):
+                        detail_url = "https://internshala.com" + href
+                        (directory / fixture_name(detail_url)).write_text(detail_page, encoding="utf-8")
+            variants.append((name, work_type, None))
+    return variants
+
+
+def scrape_once(variants, directory: str, pages: int, latency: float, details: bool, trace_memory: bool = False):
+    """One scrape_and_save run on a fresh fake database."""
+    db = FakeSupabase()
+    supabase_client.supabase, supabase_client.supabase_admin = db, None
+    transport = ReplayTransport(directory, latency=latency)
+
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    stats = asyncio.run(scrape_and_save(
+        variants,
+        details=details,
+        detail_rate=0,
+        transport=transport,
+        max_pages=pages,
+        rate_per_host=0,
+        use_cache=False,
+    ))
+    elapsed = time.perf_counter() - start
+    peak = None
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return stats, elapsed, peak, db, transport
+
+
+def run(copies: int = 4, pages: int = 5, latency: float = 0.0, details: bool = False):
+    with tempfile.TemporaryDirectory() as directory:
+        variants = build_replay_dir(Path(directory), copies, pages, details)
+        # tracemalloc slows allocation-heavy parsing down a lot, so time and
+        # measure memory in separate runs
+        stats, elapsed, _, db, transport = scrape_once(variants, directory, pages, latency, details)
+        _, _, peak, _, _ = scrape_once(variants, directory, pages, latency, details, trace_memory=True)
+
+    stages = stats["stages"]
+    page_count = stages["fetch"]["items_out"]
+    listings = stages["parse"]["items_out"]
+    print(f"{len(variants)} variants, {page_count} pages ({transport.misses} missing), "
+          f"{listings} listings, latency {latency * 1000:.0f} ms/request\n")
+    print(f"{'wall time':<24} {elapsed:>10.2f} s")
+    print(f"{'pages/sec':<24} {page_count / elapsed:>10.1f}")
+    print(f"{'listings/sec':<24} {listings / elapsed:>10.1f}")
+    # Stage wall time runs from its first item to its last, so it includes
+    # waiting on upstream stages; busy time is summed over the worker threads
+    for name in ("parse", "enrich"):
+        stage = stages[name]
+        print(f"{name + ' wall/listing':<24} {stage['elapsed_seconds'] / max(listings, 1) * 1e6:>10.1f} µs")
+        print(f"{name + ' busy/listing':<24} {stage['busy_seconds'] / max(listings, 1) * 1e6:>10.1f} µs "
+              f"(summed over {SCRAPE_PARSE_WORKERS} workers)")
+    if details:
+        print(f"{'detail pages/sec':<24} {stages['details']['items_in'] / elapsed:>10.1f}")
+    print(f"{'peak memory':<24} {peak / 2**20:>10.1f} MiB")
+    print(f"{'rows written':<24} {stats['inserted'] + stats['updated']:>10}")
+    print(f"{'db round trips':<24} {db.calls:>10}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scrape pipeline against recorded pages.")
+    parser.add_argument("--copies", type=int, default=4, help="Categories generated per fixture")
+    parser.add_argument("--pages", type=int, default=5, help="Listing pages per category")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated seconds per request")
+    parser.add_argument("--details", action="store_true", help="Also fetch a detail page per new posting")
+    args = parser.parse_args()
+
+    # Per-page INFO logs would swamp the report
+    for name in ("scraper", "listing_parser", "scrape_pipeline", "internship_index", "match_store"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    run(args.copies, args.pages, args.latency, args.details)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,50 @@ JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-super-secret-key-change-this-
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 JWT_EXPIRATION_HOURS = int(os.getenv("JWT_EXPIRATION_HOURS", "24"))
 
+# Recommendation cache (per-user ranked lists)
+RECOMMENDATION_CACHE_SIZE = int(os.getenv("RECOMMENDATION_CACHE_SIZE", "1000"))
+RECOMMENDATION_CACHE_TTL_SECONDS = int(os.getenv("RECOMMENDATION_CACHE_TTL_SECONDS", "1800"))
+
+# Latest resume / preferences loader (services/user_data.py)
+USER_DATA_CACHE_SIZE = int(os.getenv("USER_DATA_CACHE_SIZE", "5000"))
+USER_DATA_CACHE_TTL_SECONDS = float(os.getenv("USER_DATA_CACHE_TTL_SECONDS", "30"))
+
+# Offline batch recommendation job (jobs/batch_recommendations.py)
+BATCH_RECOMMENDATIONS_TOP_N = int(os.getenv("BATCH_RECOMMENDATIONS_TOP_N", "50"))
+
+# Async data access (services/db_pool.py)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "32"))  # threads running blocking supabase calls
+
+# Dashboard (routers/dashboard.py)
+DASHBOARD_RPC_RETRY_SECONDS = int(os.getenv("DASHBOARD_RPC_RETRY_SECONDS", "300"))  # recheck a missing get_dashboard
+
+# Scraper (services/scraper.py)
+SCRAPE_CONCURRENCY = int(os.getenv("SCRAPE_CONCURRENCY", "8"))
+SCRAPE_RATE_PER_HOST = float(os.getenv("SCRAPE_RATE_PER_HOST", "4"))  # requests/sec per host
+SCRAPE_TIMEOUT_SECONDS = float(os.getenv("SCRAPE_TIMEOUT_SECONDS", "15"))
+SCRAPE_MAX_PAGES = int(os.getenv("SCRAPE_MAX_PAGES", "5"))  # listing pages per category
+SCRAPE_CACHE_ENABLED = os.getenv("SCRAPE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+SCRAPE_CACHE_DIR = os.getenv("SCRAPE_CACHE_DIR", str(Path(__file__).resolve().parent / ".cache" / "scraper"))
+SCRAPE_CACHE_TTL_SECONDS = int(os.getenv("SCRAPE_CACHE_TTL_SECONDS", "3600"))
+SCRAPE_CACHE_MAX_AGE_DAYS = int(os.getenv("SCRAPE_CACHE_MAX_AGE_DAYS", "7"))  # prune cached pages/parses unused this long
+SCRAPE_PARSER = os.getenv("SCRAPE_PARSER", "lxml")  # listing parser backend: lxml or soup
+SCRAPE_REPLAY_DIR = os.getenv("SCRAPE_REPLAY_DIR")  # serve recorded pages from here instead of the network
+SCRAPE_RECORD_DIR = os.getenv("SCRAPE_RECORD_DIR")  # save every fetched page here (for replay/benchmarks)
+SCRAPE_QUEUE_SIZE = int(os.getenv("SCRAPE_QUEUE_SIZE", "64"))  # items buffered between pipeline stages
+SCRAPE_PARSE_WORKERS = int(os.getenv("SCRAPE_PARSE_WORKERS", "4"))  # threads parsing/enriching pages
+SCRAPE_DETAILS_ENABLED = os.getenv("SCRAPE_DETAILS_ENABLED", "true").lower() in ("1", "true", "yes")
+SCRAPE_DETAIL_RATE = float(os.getenv("SCRAPE_DETAIL_RATE", "4"))  # detail pages/sec, on top of the per-host limit
+SCRAPE_DETAIL_CONCURRENCY = int(os.getenv("SCRAPE_DETAIL_CONCURRENCY", "4"))
+SCRAPE_DETAIL_REFRESH_DAYS = int(os.getenv("SCRAPE_DETAIL_REFRESH_DAYS", "30"))  # re-fetch details of still-listed postings this old
+SCRAPE_DETAIL_RETRY_LIMIT = int(os.getenv("SCRAPE_DETAIL_RETRY_LIMIT", "200"))  # unchanged postings per run whose details are (re)fetched
+STALE_AFTER_DAYS = int(os.getenv("STALE_AFTER_DAYS", "14"))  # archive postings not seen by a scrape for this long
+
+# Scrape job scheduler (services/scrape_scheduler.py)
+SCRAPE_JOBS_DB = os.getenv("SCRAPE_JOBS_DB", str(Path(__file__).resolve().parent / ".cache" / "scrape_jobs.sqlite3"))
+SCRAPE_FRESHNESS_SECONDS = int(os.getenv("SCRAPE_FRESHNESS_SECONDS", "3600"))  # skip variants scraped this recently
+SCRAPE_REFRESH_INTERVAL_SECONDS = int(os.getenv("SCRAPE_REFRESH_INTERVAL_SECONDS", "21600"))  # periodic re-scrape
+SCRAPE_JOB_LEASE_SECONDS = int(os.getenv("SCRAPE_JOB_LEASE_SECONDS", "300"))  # requeue running jobs without a heartbeat this long
+
 if not SUPABASE_URL or not SUPABASE_KEY:
     print(f"CRITICAL WARNING: SUPABASE_URL or SUPABASE_KEY not set in {env_path}")
 if JWT_SECRET_KEY == "your-super-secret-key-change-this-in-production":
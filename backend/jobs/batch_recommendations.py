@@ -0,0 +1,152 @@
+"""Offline recommendation job: rank the catalog for every user in one run.
+
+Loads the catalog once, bulk-loads every user's latest resume and
+preferences, scores users across a process pool and writes each user's
+top matches to the `recommendations` table (for daily digests).
+
+Usage (from backend/):
+    python -m jobs.batch_recommendations [--workers N] [--top N] [--dry-run]
+"""
+import argparse
+import datetime
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+import supabase_client
+from config import BATCH_RECOMMENDATIONS_TOP_N
+from services.internship_index import InternshipIndex
+from services.match_store import MatchStore
+from services.recommender import Recommender
+
+logger = logging.getLogger("batch_recommendations")
+logger.setLevel(logging.INFO)
+
+if not logger.handlers:
+    ch = logging.StreamHandler()
+    ch.setLevel(logging.INFO)
+    ch.setFormatter(logging.Formatter("%(asctime)s [%(name)s] %(levelname)s: %(message)s"))
+    logger.addHandler(ch)
+
+# (user_id, resume_skills, preferred_type, preferred_work_mode)
+UserProfile = Tuple[str, List[str], str, str]
+
+# Per-worker catalog index, built once by _init_worker
+_worker_index: Optional[InternshipIndex] = None
+
+
+def _init_worker(catalog: List[Dict]):
+    global _worker_index
+    _worker_index = InternshipIndex(max_age=None)
+    _worker_index.load(catalog)
+
+
+def _score_users(users: List[UserProfile], top_n: int, generated_at: str) -> List[Dict]:
+    """Rank the catalog for a chunk of users (runs inside a worker process)."""
+    rows = []
+    for user_id, skills, preferred_type, preferred_work_mode in users:
+        ranked = Recommender.rank(skills, preferred_type, preferred_work_mode, index=_worker_index)
+        for position, (score, internship_id, matched_skills) in enumerate(ranked[:top_n], start=1):
+            rows.append({
+                "user_id": user_id,
+                "internship_id": internship_id,
+                "rank": position,
+                "match_score": score,
+                "matched_skills": matched_skills,
+                "generated_at": generated_at,
+            })
+    return rows
+
+
+def load_users() -> List[UserProfile]:
+    """Latest resume + preferences for every user that has uploaded a resume."""
+    resumes = MatchStore.latest_resume_skills()
+    preferences = supabase_client.fetch_all("user_preferences", "user_id, internship_type, work_mode")
+    prefs_by_user = {p["user_id"]: p for p in preferences}
+
+    users = []
+    for user_id, skills in resumes.items():
+        prefs = prefs_by_user.get(user_id, {})
+        users.append((
+            user_id,
+            skills,
+            (prefs.get("internship_type") or "").lower(),
+            (prefs.get("work_mode") or "").lower(),
+        ))
+    return users
+
+
+def write_recommendations(user_ids: List[str], rows: List[Dict]):
+    """Replace the stored recommendations of `user_ids` with `rows`, atomically.
+
+    One `replace_recommendations` call per chunk: readers see each user's
+    old list or their new one, never an empty or partial one.
+    """
+    db = supabase_client.supabase_admin or supabase_client.supabase
+    db.rpc("replace_recommendations", {"p_user_ids": user_ids, "p_rows": rows}).execute()
+
+
+def run(workers: Optional[int] = None, top_n: int = BATCH_RECOMMENDATIONS_TOP_N,
+        chunk_size: int = 200, dry_run: bool = False) -> Dict:
+    """Score every user and store their top matches. Returns run stats."""
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+
+    catalog = supabase_client.fetch_all("internships")
+    users = load_users()
+    loaded = time.perf_counter()
+    logger.info(f"Loaded {len(catalog)} internships and {len(users)} users in {loaded - started:.2f}s")
+
+    generated_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    chunks = [users[i:i + chunk_size] for i in range(0, len(users), chunk_size)]
+    scored_users = 0
+    written = 0
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(catalog,)) as pool:
+        futures = {pool.submit(_score_users, chunk, top_n, generated_at): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            chunk = futures[future]
+            try:
+                rows = future.result()
+            except Exception as e:
+                logger.error(f"Scoring failed for a chunk of {len(chunk)} users: {e}")
+                continue
+            if not dry_run:
+                try:
+                    write_recommendations([u[0] for u in chunk], rows)
+                    written += len(rows)
+                except Exception as e:
+                    logger.error(f"Writing recommendations failed for {len(chunk)} users: {e}")
+            scored_users += len(chunk)
+
+    elapsed = time.perf_counter() - started
+    scoring = time.perf_counter() - loaded
+    stats = {
+        "users": scored_users,
+        "internships": len(catalog),
+        "rows_written": written,
+        "workers": workers,
+        "elapsed_seconds": round(elapsed, 2),
+        "users_per_second": round(scored_users / scoring, 1) if scoring > 0 else 0.0,
+    }
+    logger.info(
+        f"✅ Scored {scored_users} users with {workers} workers in {elapsed:.2f}s "
+        f"({stats['users_per_second']} users/sec), wrote {written} rows"
+    )
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute recommendations for every user.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--top", type=int, default=BATCH_RECOMMENDATIONS_TOP_N, help="Matches stored per user")
+    parser.add_argument("--chunk-size", type=int, default=200, help="Users per worker task")
+    parser.add_argument("--dry-run", action="store_true", help="Score without writing to the database")
+    args = parser.parse_args()
+    run(workers=args.workers, top_n=args.top, chunk_size=args.chunk_size, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
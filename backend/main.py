@@ -1,9 +1,11 @@
-import asyncio
 import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from routers import auth, resume, preferences, internships, recommendations, stats, profile, skill_gap, bookmarks, applications, dashboard
+from services import db_pool
+from services.pagination import NEXT_CURSOR_HEADER
+from services.scrape_scheduler import scrape_scheduler
 
 logger = logging.getLogger("main")
 logger.setLevel(logging.INFO)
@@ -19,31 +21,18 @@ if not logger.handlers:
 async def lifespan(app: FastAPI):
     """Run startup tasks when the server boots."""
     logger.info("🚀 CareerLens Backend starting up...")
-    
-    # Auto-scrape internships on startup (in background so it doesn't block)
-    asyncio.create_task(startup_scrape())
+
+    # Scrape job worker: resumes interrupted jobs, then refreshes the
+    # default categories now and periodically (skipping fresh ones)
+    scrape_scheduler.start()
 
     yield  # Server runs here
 
+    await scrape_scheduler.stop()
+    db_pool.shutdown()
     logger.info("👋 CareerLens Backend shutting down...")
 
 
-async def startup_scrape():
-    """Scrape internships in the background on server startup."""
-    # Small delay to let the server finish starting
-    await asyncio.sleep(2)
-
-    logger.info("📡 Auto-scraping internships from Internshala...")
-    categories = [
-        "web development",
-        "python",
-        "machine learning",
-        "frontend development",
-    ]
-
-    await internships.scrape_and_save(categories)
-
-
 app = FastAPI(title="CareerLens Backend", lifespan=lifespan)
 
 # CORS
@@ -56,6 +45,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Include Routers
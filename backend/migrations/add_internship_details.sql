@@ -0,0 +1,10 @@
+-- ================================================================
+-- CareerLens: Detail-page fields on internships
+-- Run this ONCE in Supabase SQL Editor (Dashboard → SQL Editor → New Query)
+-- Safe to re-run — uses IF NOT EXISTS everywhere
+-- ================================================================
+
+-- Filled from each new or changed posting's detail page (services/detail_enricher.py)
+ALTER TABLE internships ADD COLUMN IF NOT EXISTS description TEXT;
+ALTER TABLE internships ADD COLUMN IF NOT EXISTS deadline DATE;
+ALTER TABLE internships ADD COLUMN IF NOT EXISTS details_fetched_at TIMESTAMPTZ;
@@ -0,0 +1,9 @@
+-- ================================================================
+-- CareerLens: Internship duration from the listing card
+-- Run this ONCE in Supabase SQL Editor (Dashboard → SQL Editor → New Query)
+-- Safe to re-run — uses IF NOT EXISTS everywhere
+-- ================================================================
+
+-- Raw card text ("3 Months"); lump-sum stipends are spread over it
+-- when stipend_min / stipend_max are computed (services/stipend.py)
+ALTER TABLE internships ADD COLUMN IF NOT EXISTS duration TEXT;
@@ -0,0 +1,16 @@
+-- ================================================================
+-- CareerLens: Precomputed internship features
+-- Run this ONCE in Supabase SQL Editor (Dashboard → SQL Editor → New Query)
+-- Safe to re-run — uses IF NOT EXISTS everywhere
+-- ================================================================
+
+-- Filled in by scrape_and_save at ingest (services/internship_features.py)
+ALTER TABLE internships ADD COLUMN IF NOT EXISTS search_text TEXT;
+ALTER TABLE internships ADD COLUMN IF NOT EXISTS extracted_skills TEXT[];
+
+-- Backfill search_text for rows scraped before this migration.
+-- extracted_skills is written at ingest; rows scraped earlier get it computed
+-- in memory by the catalog index (InternshipFeatures.ensure) until re-scraped.
+UPDATE internships
+SET search_text = lower(concat_ws(E'\n', coalesce(description, ''), coalesce(role, ''), coalesce(company, '')))
+WHERE search_text IS NULL;
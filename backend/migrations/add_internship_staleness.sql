@@ -0,0 +1,66 @@
+-- ================================================================
+-- CareerLens: Change detection and archival of stale postings
+-- Run this ONCE in Supabase SQL Editor (Dashboard → SQL Editor → New Query)
+-- Safe to re-run — uses IF NOT EXISTS / OR REPLACE everywhere
+-- ================================================================
+
+-- Hash of the scraped fields; a posting is rewritten only when it changes
+ALTER TABLE internships ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+-- Last scrape that still listed the posting
+ALTER TABLE internships ADD COLUMN IF NOT EXISTS last_seen_at TIMESTAMPTZ;
+UPDATE internships SET last_seen_at = COALESCE(scraped_at, NOW()) WHERE last_seen_at IS NULL;
+ALTER TABLE internships ALTER COLUMN last_seen_at SET DEFAULT NOW();
+CREATE INDEX IF NOT EXISTS idx_internships_last_seen_at ON internships(last_seen_at);
+
+-- Set on stale postings kept only because users bookmarked or applied to them
+ALTER TABLE internships ADD COLUMN IF NOT EXISTS expired_at TIMESTAMPTZ;
+
+-- Stale postings moved out of the hot table (full row kept as JSON)
+CREATE TABLE IF NOT EXISTS internships_archive (
+    id UUID PRIMARY KEY,
+    apply_url TEXT,
+    last_seen_at TIMESTAMPTZ,
+    data JSONB NOT NULL,
+    archived_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Called after each scrape (InternshipWriter.archive_stale). Returns the
+-- ids it retired; archived = false means "expired in place".
+CREATE OR REPLACE FUNCTION archive_stale_internships(p_stale_after_days INT)
+RETURNS TABLE (internship_id UUID, archived BOOLEAN)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    cutoff TIMESTAMPTZ := NOW() - make_interval(days => p_stale_after_days);
+BEGIN
+    -- Deleting these would cascade to users' bookmarks/applications
+    RETURN QUERY
+    WITH expired AS (
+        UPDATE internships i
+        SET expired_at = NOW()
+        WHERE i.last_seen_at < cutoff
+          AND i.expired_at IS NULL
+          AND (EXISTS (SELECT 1 FROM bookmarks b WHERE b.internship_id = i.id)
+               OR EXISTS (SELECT 1 FROM applications a WHERE a.internship_id = i.id))
+        RETURNING i.id
+    )
+    SELECT e.id, FALSE FROM expired e;
+
+    RETURN QUERY
+    WITH stale AS (
+        DELETE FROM internships i
+        WHERE i.last_seen_at < cutoff
+          AND NOT EXISTS (SELECT 1 FROM bookmarks b WHERE b.internship_id = i.id)
+          AND NOT EXISTS (SELECT 1 FROM applications a WHERE a.internship_id = i.id)
+        RETURNING i.*
+    ), moved AS (
+        INSERT INTO internships_archive (id, apply_url, last_seen_at, data)
+        SELECT s.id, s.apply_url, s.last_seen_at, to_jsonb(s) FROM stale s
+        ON CONFLICT (id) DO UPDATE
+            SET data = EXCLUDED.data, last_seen_at = EXCLUDED.last_seen_at, archived_at = NOW()
+        RETURNING internships_archive.id
+    )
+    SELECT m.id, TRUE FROM moved m;
+END;
+$$;
@@ -0,0 +1,84 @@
+-- ================================================================
+-- CareerLens: Unique apply_url on internships
+-- Run this ONCE in Supabase SQL Editor (Dashboard → SQL Editor → New Query)
+-- Safe to re-run — skips the constraint if it already exists
+-- ================================================================
+
+-- Duplicate postings left by earlier scrapes → the copy kept for each
+-- apply_url (the first one scraped; rows without scraped_at go last)
+DROP TABLE IF EXISTS internship_duplicates;
+CREATE TEMP TABLE internship_duplicates AS
+SELECT ranked.id, ranked.keeper_id
+FROM (
+    SELECT i.id,
+           first_value(i.id) OVER w AS keeper_id,
+           row_number() OVER w AS n
+    FROM internships i
+    WHERE i.apply_url IS NOT NULL
+    WINDOW w AS (PARTITION BY i.apply_url ORDER BY i.scraped_at ASC NULLS LAST, i.id)
+) ranked
+WHERE ranked.n > 1;
+
+-- bookmarks / applications cascade on delete: move users' rows to the kept
+-- copy first. Where a user has rows on several copies, keep one
+-- (bookmarks: the newest; applications: the most recently updated).
+DO $$
+BEGIN
+    IF to_regclass('public.bookmarks') IS NOT NULL THEN
+        DELETE FROM bookmarks b
+        USING (
+            SELECT bm.id, row_number() OVER (
+                PARTITION BY bm.user_id, coalesce(d.keeper_id, bm.internship_id)
+                ORDER BY bm.created_at DESC NULLS LAST, bm.id
+            ) AS n
+            FROM bookmarks bm
+            LEFT JOIN internship_duplicates d ON d.id = bm.internship_id
+            WHERE bm.internship_id IN (SELECT id FROM internship_duplicates)
+               OR bm.internship_id IN (SELECT keeper_id FROM internship_duplicates)
+        ) ranked
+        WHERE b.id = ranked.id AND ranked.n > 1;
+
+        UPDATE bookmarks b
+        SET internship_id = d.keeper_id
+        FROM internship_duplicates d
+        WHERE b.internship_id = d.id;
+    END IF;
+
+    IF to_regclass('public.applications') IS NOT NULL THEN
+        DELETE FROM applications a
+        USING (
+            SELECT ap.id, row_number() OVER (
+                PARTITION BY ap.user_id, coalesce(d.keeper_id, ap.internship_id)
+                ORDER BY ap.updated_at DESC NULLS LAST, ap.id
+            ) AS n
+            FROM applications ap
+            LEFT JOIN internship_duplicates d ON d.id = ap.internship_id
+            WHERE ap.internship_id IN (SELECT id FROM internship_duplicates)
+               OR ap.internship_id IN (SELECT keeper_id FROM internship_duplicates)
+        ) ranked
+        WHERE a.id = ranked.id AND ranked.n > 1;
+
+        UPDATE applications a
+        SET internship_id = d.keeper_id
+        FROM internship_duplicates d
+        WHERE a.internship_id = d.id;
+    END IF;
+END $$;
+
+-- Derived rows (match scores, recommendations) are recomputed, so letting
+-- them cascade is fine
+DELETE FROM internships i
+USING internship_duplicates d
+WHERE i.id = d.id;
+
+DROP TABLE internship_duplicates;
+
+-- The scraper upserts on apply_url (services/internship_writer.py)
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'internships_apply_url_key'
+    ) THEN
+        ALTER TABLE internships ADD CONSTRAINT internships_apply_url_key UNIQUE (apply_url);
+    END IF;
+END $$;
@@ -0,0 +1,17 @@
+-- ================================================================
+-- CareerLens: Structured stipend columns
+-- Run this ONCE in Supabase SQL Editor (Dashboard → SQL Editor → New Query)
+-- Safe to re-run — uses IF NOT EXISTS everywhere
+-- ================================================================
+
+-- Monthly-normalized stipend range parsed at ingest (services/stipend.py)
+ALTER TABLE internships ADD COLUMN IF NOT EXISTS stipend_min INTEGER;
+ALTER TABLE internships ADD COLUMN IF NOT EXISTS stipend_max INTEGER;
+ALTER TABLE internships ADD COLUMN IF NOT EXISTS stipend_currency TEXT;
+ALTER TABLE internships ADD COLUMN IF NOT EXISTS stipend_period TEXT;
+
+-- Superseded by stipend_min / stipend_max
+ALTER TABLE internships DROP COLUMN IF EXISTS stipend_amount;
+
+-- Backs sort=salary and the min_stipend filter on GET /api/internships
+CREATE INDEX IF NOT EXISTS idx_internships_stipend_max ON internships(stipend_max DESC NULLS LAST);
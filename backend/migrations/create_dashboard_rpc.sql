@@ -0,0 +1,44 @@
+-- ================================================================
+-- CareerLens: Dashboard data in one round trip (routers/dashboard.py)
+-- Run this ONCE in Supabase SQL Editor (Dashboard → SQL Editor → New Query)
+-- Run after create_bookmarks_applications.sql and create_match_scores.sql
+-- Safe to re-run — uses OR REPLACE
+-- ================================================================
+
+-- Everything the dashboard aggregates for one user: latest resume skills,
+-- bookmarks and applications (each read once, with the internship fields
+-- the dashboard shows) and the match overview.
+CREATE OR REPLACE FUNCTION get_dashboard(p_user_id UUID)
+RETURNS JSON
+LANGUAGE sql STABLE
+AS $$
+    SELECT json_build_object(
+        'skills', (
+            SELECT r.skills
+            FROM resumes r
+            WHERE r.user_id = p_user_id
+            ORDER BY r.created_at DESC
+            LIMIT 1
+        ),
+        'bookmarks', coalesce((
+            SELECT json_agg(json_build_object(
+                'created_at', b.created_at,
+                'internships', json_build_object('company', i.company, 'role', i.role, 'skills', i.skills)
+            ) ORDER BY b.created_at DESC)
+            FROM bookmarks b
+            LEFT JOIN internships i ON i.id = b.internship_id
+            WHERE b.user_id = p_user_id
+        ), '[]'::json),
+        'applications', coalesce((
+            SELECT json_agg(json_build_object(
+                'status', a.status,
+                'applied_at', a.applied_at,
+                'internships', json_build_object('company', i.company, 'role', i.role, 'skills', i.skills)
+            ) ORDER BY a.updated_at DESC)
+            FROM applications a
+            LEFT JOIN internships i ON i.id = a.internship_id
+            WHERE a.user_id = p_user_id
+        ), '[]'::json),
+        'match_overview', match_overview(p_user_id)
+    );
+$$;
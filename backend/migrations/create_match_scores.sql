@@ -0,0 +1,49 @@
+-- ================================================================
+-- CareerLens: Materialized match scores (services/match_store.py)
+-- Run this ONCE in Supabase SQL Editor (Dashboard → SQL Editor → New Query)
+-- Safe to re-run — uses IF NOT EXISTS / OR REPLACE everywhere
+-- ================================================================
+
+-- Base match score per (user, internship); pairs scoring 0 are not stored
+CREATE TABLE IF NOT EXISTS match_scores (
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    internship_id UUID NOT NULL REFERENCES internships(id) ON DELETE CASCADE,
+    score INTEGER NOT NULL,
+    matched_skills TEXT[] DEFAULT '{}',
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (user_id, internship_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_match_scores_user_score ON match_scores(user_id, score DESC);
+
+ALTER TABLE match_scores ENABLE ROW LEVEL SECURITY;
+
+DO $$ BEGIN
+    DROP POLICY IF EXISTS "Users read own match scores" ON match_scores;
+    DROP POLICY IF EXISTS "Service role full access match scores" ON match_scores;
+END $$;
+
+CREATE POLICY "Users read own match scores" ON match_scores
+    FOR SELECT USING (auth.uid() = user_id);
+
+CREATE POLICY "Service role full access match scores" ON match_scores
+    FOR ALL USING (auth.role() = 'service_role');
+
+-- Dashboard "match overview" in one round trip. Unstored pairs count as 0,
+-- so the average is taken over the whole catalog.
+CREATE OR REPLACE FUNCTION match_overview(p_user_id UUID)
+RETURNS JSON
+LANGUAGE sql STABLE
+AS $$
+    SELECT json_build_object(
+        'scored', count(m.*),
+        'average_score', round(coalesce(sum(m.score), 0)::numeric / nullif(t.total, 0)),
+        'top_score', coalesce(max(m.score), 0),
+        'above_80', count(*) FILTER (WHERE m.score >= 80),
+        'above_60', count(*) FILTER (WHERE m.score >= 60),
+        'total_internships', t.total
+    )
+    FROM (SELECT count(*) AS total FROM internships) t
+    LEFT JOIN match_scores m ON m.user_id = p_user_id
+    GROUP BY t.total;
+$$;
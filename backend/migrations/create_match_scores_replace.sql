@@ -0,0 +1,94 @@
+-- ================================================================
+-- CareerLens: Atomic match score replacement (services/match_store.py)
+-- Run this ONCE in Supabase SQL Editor (Dashboard → SQL Editor → New Query)
+-- Run after create_match_scores.sql
+-- Safe to re-run — uses IF NOT EXISTS / OR REPLACE everywhere
+-- ================================================================
+
+-- Users whose scores have been computed at least once. A user with no
+-- matching internship has no match_scores rows, and would otherwise look
+-- like one who was never scored.
+CREATE TABLE IF NOT EXISTS match_scored_users (
+    user_id UUID PRIMARY KEY REFERENCES auth.users(id) ON DELETE CASCADE,
+    scored_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+ALTER TABLE match_scored_users ENABLE ROW LEVEL SECURITY;
+
+DO $$ BEGIN
+    DROP POLICY IF EXISTS "Service role full access match scored users" ON match_scored_users;
+END $$;
+
+CREATE POLICY "Service role full access match scored users" ON match_scored_users
+    FOR ALL USING (auth.role() = 'service_role');
+
+-- Replace the stored scores of one user (p_user_id) or of a set of
+-- postings (p_internship_ids) with p_rows, in one transaction: readers see
+-- either the old scores or the new ones, and pairs missing from p_rows
+-- (now scoring 0) are deleted. Returns the number of rows written.
+CREATE OR REPLACE FUNCTION replace_match_scores(
+    p_rows JSONB,
+    p_user_id UUID DEFAULT NULL,
+    p_internship_ids UUID[] DEFAULT NULL
+)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    written INTEGER;
+BEGIN
+    IF p_user_id IS NULL AND p_internship_ids IS NULL THEN
+        RAISE EXCEPTION 'replace_match_scores needs p_user_id or p_internship_ids';
+    END IF;
+
+    DELETE FROM match_scores m
+    WHERE (p_user_id IS NULL OR m.user_id = p_user_id)
+      AND (p_internship_ids IS NULL OR m.internship_id = ANY(p_internship_ids));
+
+    INSERT INTO match_scores (user_id, internship_id, score, matched_skills, updated_at)
+    SELECT r.user_id, r.internship_id, r.score, coalesce(r.matched_skills, '{}'), NOW()
+    FROM jsonb_populate_recordset(NULL::match_scores, coalesce(p_rows, '[]'::jsonb)) r
+    ON CONFLICT (user_id, internship_id) DO UPDATE
+        SET score = EXCLUDED.score, matched_skills = EXCLUDED.matched_skills, updated_at = NOW();
+    GET DIAGNOSTICS written = ROW_COUNT;
+
+    IF p_user_id IS NOT NULL THEN
+        INSERT INTO match_scored_users (user_id) VALUES (p_user_id)
+        ON CONFLICT (user_id) DO UPDATE SET scored_at = NOW();
+    END IF;
+    RETURN written;
+END;
+$$;
+
+-- Only skill-based matches are stored: a posting with no skills that
+-- mentions none of the user's skills scores a neutral 40 without a row.
+-- Drop such rows written before that rule.
+DELETE FROM match_scores WHERE coalesce(cardinality(matched_skills), 0) = 0;
+
+-- Replaces the one in create_match_scores.sql. Counts only live postings
+-- (expired_at IS NULL), like the in-process fallback over the catalog
+-- index; a posting without a stored score counts as 40 if it lists no
+-- skills and 0 otherwise. 'materialized': whether the user has been
+-- scored at all (see match_scored_users).
+CREATE OR REPLACE FUNCTION match_overview(p_user_id UUID)
+RETURNS JSON
+LANGUAGE sql STABLE
+AS $$
+    SELECT json_build_object(
+        'scored', count(s.stored),
+        'materialized', EXISTS (SELECT 1 FROM match_scored_users u WHERE u.user_id = p_user_id),
+        'average_score', round(avg(s.score)),
+        'top_score', coalesce(max(s.score), 0),
+        'above_80', count(*) FILTER (WHERE s.score >= 80),
+        'above_60', count(*) FILTER (WHERE s.score >= 60),
+        'total_internships', count(*)
+    )
+    FROM (
+        SELECT
+            m.internship_id AS stored,
+            coalesce(m.score, CASE WHEN coalesce(cardinality(i.skills), 0) = 0 THEN 40 ELSE 0 END) AS score
+        FROM internships i
+        LEFT JOIN match_scores m ON m.internship_id = i.id AND m.user_id = p_user_id
+        WHERE i.expired_at IS NULL
+    ) s;
+$$;
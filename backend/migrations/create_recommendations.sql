@@ -0,0 +1,32 @@
+-- ================================================================
+-- CareerLens: Precomputed recommendations (written by jobs/batch_recommendations.py)
+-- Run this ONCE in Supabase SQL Editor (Dashboard → SQL Editor → New Query)
+-- Safe to re-run — uses IF NOT EXISTS everywhere
+-- ================================================================
+
+CREATE TABLE IF NOT EXISTS recommendations (
+    id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    internship_id UUID NOT NULL REFERENCES internships(id) ON DELETE CASCADE,
+    rank INTEGER NOT NULL,
+    match_score INTEGER NOT NULL,
+    matched_skills TEXT[] DEFAULT '{}',
+    generated_at TIMESTAMPTZ DEFAULT NOW(),
+    UNIQUE(user_id, internship_id)
+);
+
+-- Digest reads: one user's list in rank order
+CREATE INDEX IF NOT EXISTS idx_recommendations_user_rank ON recommendations(user_id, rank);
+
+ALTER TABLE recommendations ENABLE ROW LEVEL SECURITY;
+
+DO $$ BEGIN
+    DROP POLICY IF EXISTS "Users read own recommendations" ON recommendations;
+    DROP POLICY IF EXISTS "Service role full access recommendations" ON recommendations;
+END $$;
+
+CREATE POLICY "Users read own recommendations" ON recommendations
+    FOR SELECT USING (auth.uid() = user_id);
+
+CREATE POLICY "Service role full access recommendations" ON recommendations
+    FOR ALL USING (auth.role() = 'service_role');
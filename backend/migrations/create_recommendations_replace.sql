@@ -0,0 +1,30 @@
+-- ================================================================
+-- CareerLens: Atomic recommendation replacement (jobs/batch_recommendations.py)
+-- Run this ONCE in Supabase SQL Editor (Dashboard → SQL Editor → New Query)
+-- Run after create_recommendations.sql
+-- Safe to re-run — uses OR REPLACE
+-- ================================================================
+
+-- Replace the stored recommendations of p_user_ids with p_rows in one
+-- transaction, so a digest never reads a user with no or half their list
+-- (and a failed write leaves the previous list in place). Returns the
+-- number of rows written.
+CREATE OR REPLACE FUNCTION replace_recommendations(p_user_ids UUID[], p_rows JSONB)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    written INTEGER;
+BEGIN
+    DELETE FROM recommendations r WHERE r.user_id = ANY(p_user_ids);
+
+    INSERT INTO recommendations (user_id, internship_id, rank, match_score, matched_skills, generated_at)
+    SELECT r.user_id, r.internship_id, r.rank, r.match_score, coalesce(r.matched_skills, '{}'), r.generated_at
+    FROM jsonb_populate_recordset(NULL::recommendations, coalesce(p_rows, '[]'::jsonb)) r
+    ON CONFLICT (user_id, internship_id) DO UPDATE
+        SET rank = EXCLUDED.rank, match_score = EXCLUDED.match_score,
+            matched_skills = EXCLUDED.matched_skills, generated_at = EXCLUDED.generated_at;
+    GET DIAGNOSTICS written = ROW_COUNT;
+    RETURN written;
+END;
+$$;
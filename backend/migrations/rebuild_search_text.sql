@@ -0,0 +1,14 @@
+-- ================================================================
+-- CareerLens: Rebuild search_text with one field per line
+-- Run this ONCE in Supabase SQL Editor (Dashboard → SQL Editor → New Query)
+-- Run after add_internship_features.sql
+-- Safe to re-run — only rewrites rows still joined with spaces
+-- ================================================================
+
+-- search_text used to join description, role and company with spaces, so
+-- a skill could match across two fields ("... react" + "native labs").
+-- services/internship_features.py now joins them with newlines.
+UPDATE internships
+SET search_text = lower(concat_ws(E'\n', coalesce(description, ''), coalesce(role, ''), coalesce(company, '')))
+WHERE search_text IS NOT NULL
+  AND search_text IS DISTINCT FROM lower(concat_ws(E'\n', coalesce(description, ''), coalesce(role, ''), coalesce(company, '')));
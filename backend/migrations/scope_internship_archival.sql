@@ -0,0 +1,60 @@
+-- ================================================================
+-- CareerLens: Archive only postings whose listing a scrape fully covered
+-- Run this ONCE in Supabase SQL Editor (Dashboard → SQL Editor → New Query)
+-- Run after add_internship_staleness.sql
+-- Safe to re-run — uses IF NOT EXISTS / OR REPLACE everywhere
+-- ================================================================
+
+-- Listing URL (category / work type / location) the posting was last seen
+-- on. Postings from before this column are tagged the next time a scrape
+-- lists them; until then they are never archived.
+ALTER TABLE internships ADD COLUMN IF NOT EXISTS scraped_from TEXT;
+CREATE INDEX IF NOT EXISTS idx_internships_scraped_from ON internships(scraped_from, last_seen_at);
+
+-- Replaced by the version below, which takes the covered listings
+DROP FUNCTION IF EXISTS archive_stale_internships(INT);
+
+-- Called after each scrape (InternshipWriter.archive_stale) with the
+-- listings it fetched every page of. A posting on a listing the run
+-- skipped or cut off at SCRAPE_MAX_PAGES may still be up, so only
+-- postings from p_sources are retired. Returns the ids it retired;
+-- archived = false means "expired in place".
+CREATE OR REPLACE FUNCTION archive_stale_internships(p_sources TEXT[], p_stale_after_days INT)
+RETURNS TABLE (internship_id UUID, archived BOOLEAN)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    cutoff TIMESTAMPTZ := NOW() - make_interval(days => p_stale_after_days);
+BEGIN
+    -- Deleting these would cascade to users' bookmarks/applications
+    RETURN QUERY
+    WITH expired AS (
+        UPDATE internships i
+        SET expired_at = NOW()
+        WHERE i.scraped_from = ANY(p_sources)
+          AND i.last_seen_at < cutoff
+          AND i.expired_at IS NULL
+          AND (EXISTS (SELECT 1 FROM bookmarks b WHERE b.internship_id = i.id)
+               OR EXISTS (SELECT 1 FROM applications a WHERE a.internship_id = i.id))
+        RETURNING i.id
+    )
+    SELECT e.id, FALSE FROM expired e;
+
+    RETURN QUERY
+    WITH stale AS (
+        DELETE FROM internships i
+        WHERE i.scraped_from = ANY(p_sources)
+          AND i.last_seen_at < cutoff
+          AND NOT EXISTS (SELECT 1 FROM bookmarks b WHERE b.internship_id = i.id)
+          AND NOT EXISTS (SELECT 1 FROM applications a WHERE a.internship_id = i.id)
+        RETURNING i.*
+    ), moved AS (
+        INSERT INTO internships_archive (id, apply_url, last_seen_at, data)
+        SELECT s.id, s.apply_url, s.last_seen_at, to_jsonb(s) FROM stale s
+        ON CONFLICT (id) DO UPDATE
+            SET data = EXCLUDED.data, last_seen_at = EXCLUDED.last_seen_at, archived_at = NOW()
+        RETURNING internships_archive.id
+    )
+    SELECT m.id, TRUE FROM moved m;
+END;
+$$;
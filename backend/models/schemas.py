@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime
 from uuid import UUID
 
 # Auth Models
@@ -26,13 +26,14 @@ class UserProfile(BaseModel):
     created_at: datetime
 
 # Resume Models
+# List items — extracted_text is deliberately left out
 class ResumeResponse(BaseModel):
     id: UUID
-    file_name: str
-    file_url: str
+    file_name: Optional[str] = None
+    file_url: Optional[str] = None
     ats_score: Optional[int] = None
-    skills: List[str] = []
-    created_at: datetime
+    skills: Optional[List[str]] = []
+    created_at: Optional[datetime] = None
 
 # Preferences Models
 class PreferencesRequest(BaseModel):
@@ -46,6 +47,9 @@ class ScrapeRequest(BaseModel):
     categories: List[str] = []
     work_type: Optional[str] = None
     location: Optional[str] = None
+    # Extra variants scraped concurrently (category × work type × location)
+    work_types: List[str] = []
+    locations: List[str] = []
 
 # Skills Update
 class SkillsUpdateRequest(BaseModel):
@@ -57,15 +61,20 @@ class PreferencesResponse(PreferencesRequest):
     updated_at: datetime
 
 # Internship Models
+# What the frontend renders; every field but id can be left out with `fields=`
 class InternshipResponse(BaseModel):
     id: UUID
-    company: str
-    role: str
+    company: Optional[str] = None
+    role: Optional[str] = None
     location: Optional[str] = None
     work_type: Optional[str] = None
     description: Optional[str] = None
-    skills: List[str] = []
+    skills: Optional[List[str]] = []
     salary: Optional[str] = None
+    duration: Optional[str] = None
+    stipend_min: Optional[int] = None
+    stipend_max: Optional[int] = None
+    deadline: Optional[date] = None
     apply_url: Optional[str] = None
     source: Optional[str] = None
     posted_at: Optional[datetime] = None
@@ -75,3 +84,20 @@ class MatchResponse(BaseModel):
     internship: InternshipResponse
     match_score: int
     matched_skills: List[str] = []
+    search_score: Optional[float] = None
+
+# Bookmark / Application Models
+class BookmarkResponse(BaseModel):
+    id: UUID
+    created_at: Optional[datetime] = None
+    internship_id: UUID
+    internships: Optional[InternshipResponse] = None
+
+class ApplicationResponse(BaseModel):
+    id: UUID
+    status: str
+    notes: Optional[str] = ""
+    applied_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    internship_id: UUID
+    internships: Optional[InternshipResponse] = None
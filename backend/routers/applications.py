@@ -1,7 +1,13 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
 from supabase_client import supabase, supabase_admin
+from services import db_pool
+from services.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, cursor_position, next_cursor, seek,
+)
+from services.projection import columns, parse_fields
+from models.schemas import ApplicationResponse, InternshipResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 import logging
 import datetime
 
@@ -31,20 +37,38 @@ class ApplicationUpdate(BaseModel):
     notes: Optional[str] = None
 
 
-@router.get("/{user_id}")
-async def get_applications(user_id: str, status: Optional[str] = None):
-    """Get all tracked applications for a user, with internship details."""
+@router.get("/{user_id}", response_model=List[ApplicationResponse], response_model_exclude_unset=True)
+async def get_applications(
+    user_id: str,
+    response: Response,
+    status: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Max results per page"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's X-Next-Cursor header"),
+    fields: Optional[str] = Query(None, description="Comma-separated internship fields to return (default: all)"),
+):
+    """Tracked applications for a user, most recently applied first, with internship details.
+
+    Pages are `limit` long; the next page's cursor is in the X-Next-Cursor header.
+    Ordered by applied_at, which never changes: a status update while the
+    client is paging can't move a row onto a page it already fetched.
+    """
+    selected = parse_fields(fields, InternshipResponse)
+    position = cursor_position(cursor, "applied_at")
     try:
         query = (
             db.table("applications")
-            .select("id, status, notes, applied_at, updated_at, internship_id, internships(*)")
+            .select(f"id, status, notes, applied_at, updated_at, internship_id, internships({columns(selected)})")
             .eq("user_id", user_id)
         )
         if status and status in VALID_STATUSES:
             query = query.eq("status", status)
 
-        result = query.order("updated_at", desc=True).execute()
-        return result.data or []
+        result = await db_pool.execute(seek(query, "applied_at", position, limit))
+        rows = result.data or []
+        next_page = next_cursor(rows, "applied_at", "applied_at", limit)
+        if next_page:
+            response.headers[NEXT_CURSOR_HEADER] = next_page
+        return rows
     except Exception as e:
         if _table_missing(e):
             logger.warning("applications table not found — returning empty list")
@@ -61,12 +85,11 @@ async def create_application(user_id: str, body: ApplicationCreate):
 
     try:
         # Check if already tracking this internship
-        existing = (
+        existing = await db_pool.execute(
             db.table("applications")
             .select("id, status")
             .eq("user_id", user_id)
             .eq("internship_id", body.internship_id)
-            .execute()
         )
         if existing.data:
             return {
@@ -75,7 +98,7 @@ async def create_application(user_id: str, body: ApplicationCreate):
                 "status": existing.data[0]["status"],
             }
 
-        result = (
+        result = await db_pool.execute(
             db.table("applications")
             .insert({
                 "user_id": user_id,
@@ -83,7 +106,6 @@ async def create_application(user_id: str, body: ApplicationCreate):
                 "status": body.status,
                 "notes": body.notes or "",
             })
-            .execute()
         )
         return {"message": "Application tracked", "id": result.data[0]["id"], "status": body.status}
     except Exception as e:
@@ -111,12 +133,11 @@ async def update_application(user_id: str, application_id: str, body: Applicatio
     updates["updated_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
 
     try:
-        result = (
+        result = await db_pool.execute(
             db.table("applications")
             .update(updates)
             .eq("id", application_id)
             .eq("user_id", user_id)
-            .execute()
         )
         if not result.data:
             raise HTTPException(status_code=404, detail="Application not found")
@@ -135,9 +156,9 @@ async def update_application(user_id: str, application_id: str, body: Applicatio
 async def delete_application(user_id: str, application_id: str):
     """Remove an application from tracker."""
     try:
-        db.table("applications").delete().eq(
+        await db_pool.execute(db.table("applications").delete().eq(
             "id", application_id
-        ).eq("user_id", user_id).execute()
+        ).eq("user_id", user_id))
         return {"message": "Application removed"}
     except Exception as e:
         if _table_missing(e):
@@ -151,11 +172,10 @@ async def delete_application(user_id: str, application_id: str):
 async def get_application_stats(user_id: str):
     """Get application statistics (counts by status)."""
     try:
-        apps = (
+        apps = await db_pool.execute(
             db.table("applications")
             .select("status")
             .eq("user_id", user_id)
-            .execute()
         )
         all_apps = apps.data or []
         stats = {s: 0 for s in VALID_STATUSES}
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from models.schemas import UserSignup, UserLogin, UserProfile, TokenResponse
 from supabase_client import supabase
+from services import db_pool
 from datetime import datetime
 import logging
 
@@ -32,7 +33,7 @@ async def create_profile(user_id: str, full_name: str = None, email: str = None)
         # Remove None values
         profile_data = {k: v for k, v in profile_data.items() if v is not None}
         
-        result = supabase.table("profiles").insert(profile_data).execute()
+        result = await db_pool.execute(supabase.table("profiles").insert(profile_data))
         if not result.data:
             raise HTTPException(status_code=400, detail="Failed to create profile")
         
@@ -49,7 +50,7 @@ async def get_profile(user_id: str):
     Get a user profile from Supabase.
     """
     try:
-        result = supabase.table("profiles").select("*").eq("id", user_id).execute()
+        result = await db_pool.execute(supabase.table("profiles").select("*").eq("id", user_id))
         
         if not result.data:
             raise HTTPException(status_code=404, detail="Profile not found")
@@ -1,7 +1,13 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
 from supabase_client import supabase, supabase_admin
+from services import db_pool
+from services.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, cursor_position, next_cursor, seek,
+)
+from services.projection import columns, parse_fields
+from models.schemas import BookmarkResponse, InternshipResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 import logging
 
 logger = logging.getLogger("bookmarks_router")
@@ -21,18 +27,32 @@ class BookmarkRequest(BaseModel):
     internship_id: str
 
 
-@router.get("/{user_id}")
-async def get_bookmarks(user_id: str):
-    """Get all bookmarked internships for a user, with internship details."""
+@router.get("/{user_id}", response_model=List[BookmarkResponse], response_model_exclude_unset=True)
+async def get_bookmarks(
+    user_id: str,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Max results per page"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's X-Next-Cursor header"),
+    fields: Optional[str] = Query(None, description="Comma-separated internship fields to return (default: all)"),
+):
+    """Bookmarked internships for a user, newest first, with internship details.
+
+    Pages are `limit` long; the next page's cursor is in the X-Next-Cursor header.
+    """
+    selected = parse_fields(fields, InternshipResponse)
+    position = cursor_position(cursor, "created_at")
     try:
-        bookmarks = (
+        query = (
             db.table("bookmarks")
-            .select("id, created_at, internship_id, internships(*)")
+            .select(f"id, created_at, internship_id, internships({columns(selected)})")
             .eq("user_id", user_id)
-            .order("created_at", desc=True)
-            .execute()
         )
-        return bookmarks.data or []
+        bookmarks = await db_pool.execute(seek(query, "created_at", position, limit))
+        rows = bookmarks.data or []
+        next_page = next_cursor(rows, "created_at", "created_at", limit)
+        if next_page:
+            response.headers[NEXT_CURSOR_HEADER] = next_page
+        return rows
     except Exception as e:
         if _table_missing(e):
             logger.warning("bookmarks table not found — returning empty list")
@@ -46,20 +66,18 @@ async def add_bookmark(user_id: str, body: BookmarkRequest):
     """Bookmark an internship."""
     try:
         # Check if already bookmarked
-        existing = (
+        existing = await db_pool.execute(
             db.table("bookmarks")
             .select("id")
             .eq("user_id", user_id)
             .eq("internship_id", body.internship_id)
-            .execute()
         )
         if existing.data:
             return {"message": "Already bookmarked", "id": existing.data[0]["id"]}
 
-        result = (
+        result = await db_pool.execute(
             db.table("bookmarks")
             .insert({"user_id": user_id, "internship_id": body.internship_id})
-            .execute()
         )
         return {"message": "Bookmarked", "id": result.data[0]["id"]}
     except Exception as e:
@@ -74,9 +92,9 @@ async def add_bookmark(user_id: str, body: BookmarkRequest):
 async def remove_bookmark(user_id: str, internship_id: str):
     """Remove a bookmark."""
     try:
-        db.table("bookmarks").delete().eq(
+        await db_pool.execute(db.table("bookmarks").delete().eq(
             "user_id", user_id
-        ).eq("internship_id", internship_id).execute()
+        ).eq("internship_id", internship_id))
         return {"message": "Bookmark removed"}
     except Exception as e:
         if _table_missing(e):
@@ -90,12 +108,11 @@ async def remove_bookmark(user_id: str, internship_id: str):
 async def check_bookmark(user_id: str, internship_id: str):
     """Check if an internship is bookmarked."""
     try:
-        result = (
+        result = await db_pool.execute(
             db.table("bookmarks")
             .select("id")
             .eq("user_id", user_id)
             .eq("internship_id", internship_id)
-            .execute()
         )
         return {"bookmarked": len(result.data) > 0}
     except Exception as e:
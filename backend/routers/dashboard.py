@@ -1,8 +1,14 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, BackgroundTasks
 from supabase_client import supabase, supabase_admin
+from config import DASHBOARD_RPC_RETRY_SECONDS
+from services import db_pool
+from services.internship_index import internship_index
+from services.match_store import MatchStore
+from services.user_data import user_data
+import asyncio
 import logging
+import time
 from collections import Counter
-import datetime
 
 # Use admin client to bypass RLS, fall back to regular client
 db = supabase_admin or supabase
@@ -10,9 +16,75 @@ db = supabase_admin or supabase
 logger = logging.getLogger("dashboard_router")
 router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
 
+# Columns of the bookmarked/applied internships the dashboard aggregates
+_INTERNSHIP_FIELDS = "internships(company, role, skills)"
+
+# Set when the get_dashboard RPC turns out to be missing (migration not run):
+# skip it until then, so requests don't each pay for a failed call
+_rpc_retry_at = 0.0
+
+
+def _rpc_missing(e: Exception) -> bool:
+    """Check if error is due to the get_dashboard function not being created yet."""
+    msg = str(e).lower()
+    return "pgrst202" in msg or "could not find the function" in msg
+
+
+async def _overview(user_id: str):
+    """Materialized match overview, or None if match_scores isn't available."""
+    try:
+        return await db_pool.call(MatchStore.overview, user_id)
+    except Exception as e:
+        logger.warning(f"match_overview unavailable — computing in-process. {e}")
+        return None
+
+
+async def _fetch_dashboard_rows(user_id: str) -> dict:
+    """Latest resume skills, bookmarks, applications and match overview.
+
+    One round trip through the get_dashboard RPC. If it fails, the same
+    reads are issued concurrently instead (each table read once); a
+    missing function is only retried every DASHBOARD_RPC_RETRY_SECONDS.
+    """
+    global _rpc_retry_at
+    if time.monotonic() >= _rpc_retry_at:
+        try:
+            resp = await db_pool.execute(db.rpc("get_dashboard", {"p_user_id": user_id}))
+            return resp.data or {}
+        except Exception as e:
+            if _rpc_missing(e):
+                _rpc_retry_at = time.monotonic() + DASHBOARD_RPC_RETRY_SECONDS
+                logger.warning(f"get_dashboard RPC not found — using parallel queries for the next "
+                               f"{DASHBOARD_RPC_RETRY_SECONDS}s. {e}")
+            else:
+                logger.warning(f"get_dashboard RPC failed — falling back to parallel queries. {e}")
+
+    resume, bookmarks, applications, overview = await asyncio.gather(
+        user_data.latest_resume(user_id),
+        db_pool.execute(
+            db.table("bookmarks")
+            .select(f"created_at, {_INTERNSHIP_FIELDS}")
+            .eq("user_id", user_id)
+            .order("created_at", desc=True)
+        ),
+        db_pool.execute(
+            db.table("applications")
+            .select(f"status, applied_at, {_INTERNSHIP_FIELDS}")
+            .eq("user_id", user_id)
+            .order("updated_at", desc=True)
+        ),
+        _overview(user_id),
+    )
+    return {
+        "skills": resume.get("skills") if resume else None,
+        "bookmarks": bookmarks.data or [],
+        "applications": applications.data or [],
+        "match_overview": overview,
+    }
+
 
 @router.get("/{user_id}")
-async def get_dashboard(user_id: str):
+async def get_dashboard(user_id: str, background_tasks: BackgroundTasks):
     """Full dashboard data: skills distribution, application funnel, match trends."""
     try:
         data = {
@@ -23,33 +95,17 @@ async def get_dashboard(user_id: str):
             "top_companies": [],
         }
 
+        rows = await _fetch_dashboard_rows(user_id)
+        skills = rows.get("skills") or []
+        all_bookmarks = rows.get("bookmarks") or []
+        all_apps = rows.get("applications") or []
+        recent_bookmarks = all_bookmarks[:5]
+
         # ── 1. Skills Distribution ──
-        resumes = (
-            db.table("resumes")
-            .select("skills")
-            .eq("user_id", user_id)
-            .order("created_at", desc=True)
-            .limit(1)
-            .execute()
-        )
-        if resumes.data and resumes.data[0].get("skills"):
-            skills = resumes.data[0]["skills"]
+        if skills:
             # Count how many saved/bookmarked/applied internships require each skill
-            bookmarks = (
-                db.table("bookmarks")
-                .select("internships(skills)")
-                .eq("user_id", user_id)
-                .execute()
-            )
-            applications = (
-                db.table("applications")
-                .select("internships(skills)")
-                .eq("user_id", user_id)
-                .execute()
-            )
-            # Merge all internship skills from bookmarks + applications
             demand_counter = Counter()
-            for item in (bookmarks.data or []) + (applications.data or []):
+            for item in all_bookmarks + all_apps:
                 intern = item.get("internships")
                 if intern and intern.get("skills"):
                     for sk in intern["skills"]:
@@ -73,14 +129,6 @@ async def get_dashboard(user_id: str):
                     })
 
         # ── 2. Application Funnel ──
-        apps = (
-            db.table("applications")
-            .select("status, applied_at, internships(company, role)")
-            .eq("user_id", user_id)
-            .order("updated_at", desc=True)
-            .execute()
-        )
-        all_apps = apps.data or []
         funnel = {"Applied": 0, "Interview": 0, "Offer": 0, "Rejected": 0, "Withdrawn": 0}
         for a in all_apps:
             status = a.get("status", "Applied")
@@ -89,37 +137,30 @@ async def get_dashboard(user_id: str):
         funnel["total"] = len(all_apps)
         data["application_funnel"] = funnel
 
-        # ── 3. Match Overview (from recommendations) ──
+        # ── 3. Match Overview (from materialized match_scores) ──
         try:
-            from services.matcher import Matcher
-
-            internships_resp = db.table("internships").select("*").limit(100).execute()
-            all_internships = internships_resp.data or []
-
-            resume_skills = []
-            if resumes.data and resumes.data[0].get("skills"):
-                resume_skills = resumes.data[0]["skills"]
-
-            if resume_skills and all_internships:
-                scores = []
-                for intern in all_internships:
-                    intern_skills = intern.get("skills", []) or []
-                    intern_text = " ".join([
-                        intern.get("description") or "",
-                        intern.get("role") or "",
-                        intern.get("company") or "",
-                    ])
-                    score = Matcher.calculate_match(resume_skills, intern_skills, intern_text)
-                    scores.append(score)
-
-                if scores:
-                    data["match_overview"] = {
-                        "average_score": round(sum(scores) / len(scores)),
-                        "top_score": max(scores),
-                        "above_80": sum(1 for s in scores if s >= 80),
-                        "above_60": sum(1 for s in scores if s >= 60),
-                        "total_internships": len(scores),
-                    }
+            if skills:
+                overview = rows.get("match_overview")
+                # materialized: scored before, even if nothing matches
+                if overview and (overview.get("scored") or overview.get("materialized")):
+                    overview.pop("scored")
+                    overview.pop("materialized", None)
+                    data["match_overview"] = overview
+                else:
+                    await db_pool.call(internship_index.ensure_loaded)
+                    matrix = internship_index.matrix()
+                    if matrix.size:
+                        scores = matrix.score(skills)
+                        data["match_overview"] = {
+                            "average_score": round(float(scores.mean())),
+                            "top_score": int(scores.max()),
+                            "above_80": int((scores >= 80).sum()),
+                            "above_60": int((scores >= 60).sum()),
+                            "total_internships": int(scores.size),
+                        }
+                    if overview is not None:
+                        # Table exists but this user isn't materialized yet
+                        background_tasks.add_task(MatchStore.rescore_user, user_id, skills)
         except Exception as e:
             logger.warning(f"Could not compute match overview: {e}")
             data["match_overview"] = {}
@@ -127,15 +168,7 @@ async def get_dashboard(user_id: str):
         # ── 4. Recent Activity ──
         recent = []
         # Recent bookmarks
-        recent_bookmarks = (
-            db.table("bookmarks")
-            .select("created_at, internships(company, role)")
-            .eq("user_id", user_id)
-            .order("created_at", desc=True)
-            .limit(5)
-            .execute()
-        )
-        for b in (recent_bookmarks.data or []):
+        for b in recent_bookmarks:
             intern = b.get("internships") or {}
             recent.append({
                 "type": "bookmark",
@@ -163,7 +196,7 @@ async def get_dashboard(user_id: str):
             company = intern.get("company")
             if company:
                 company_counter[company] += 1
-        for b in (recent_bookmarks.data or []):
+        for b in recent_bookmarks:
             intern = b.get("internships") or {}
             company = intern.get("company")
             if company:
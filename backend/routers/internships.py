@@ -1,10 +1,14 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from services.scraper import InternshalaScraper
-from models.schemas import ScrapeRequest
+from fastapi import APIRouter, HTTPException, Query, Response
+from models.schemas import InternshipResponse, ScrapeRequest
 from supabase_client import supabase
-import datetime
+from services import db_pool
+from services.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, cursor_position, next_cursor, seek,
+)
+from services.projection import columns, parse_fields, project
+from services.scrape_scheduler import DEFAULT_CATEGORIES, scrape_scheduler
+from typing import List, Optional
 import logging
-import traceback
 
 logger = logging.getLogger("internships_router")
 logger.setLevel(logging.DEBUG)
@@ -17,98 +21,89 @@ if not logger.handlers:
 
 router = APIRouter(prefix="/api/internships", tags=["Internships"])
 
+# Column each `sort=` value orders by
+SORT_COLUMNS = {"recent": "scraped_at", "salary": "stipend_max"}
 
-@router.get("/")
-async def get_internships(work_type: str = None):
-    """Get all internships, optionally filtered by work type."""
+
+@router.get("/", response_model=List[InternshipResponse], response_model_exclude_unset=True)
+async def get_internships(
+    response: Response,
+    work_type: str = None,
+    min_stipend: int = None,
+    sort: str = "recent",
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Max results per page"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's X-Next-Cursor header"),
+    fields: Optional[str] = Query(None, description="Comma-separated internship fields to return (default: all)"),
+):
+    """Get all internships, optionally filtered by work type and minimum monthly stipend.
+
+    sort: "recent" (newest scraped first) or "salary" (highest monthly stipend first).
+    Pages are `limit` long; the next page's cursor is in the X-Next-Cursor header.
+    """
+    sort_column = SORT_COLUMNS.get(sort)
+    if sort_column is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown sort '{sort}'. Available: {', '.join(SORT_COLUMNS)}",
+        )
+    selected = parse_fields(fields, InternshipResponse)
+    position = cursor_position(cursor, sort)
     try:
-        query = supabase.table("internships").select("*")
+        # The sort column is needed for the next cursor even if not asked for
+        query = supabase.table("internships").select(columns(selected, sort_column)).is_("expired_at", "null")
         if work_type:
             query = query.ilike("work_type", f"%{work_type}%")
-
-        response = query.order("scraped_at", desc=True).limit(50).execute()
-        logger.info(f"Returning {len(response.data)} internships")
-        return response.data
+        if min_stipend:
+            query = query.gte("stipend_max", min_stipend)
+
+        page = await db_pool.execute(seek(query, sort_column, position, limit))
+        rows = page.data or []
+        next_page = next_cursor(rows, sort_column, sort, limit)
+        if next_page:
+            response.headers[NEXT_CURSOR_HEADER] = next_page
+        logger.info(f"Returning {len(rows)} internships")
+        return [project(row, selected) for row in rows]
     except Exception as e:
         logger.error(f"Error fetching internships: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def scrape_and_save(
-    categories: list[str],
-    work_type: str = None,
-    location: str = None,
-):
-    """Background task: scrape internships from Internshala and save to DB."""
-    total_saved = 0
-
-    for category in categories:
-        logger.info(f"Scraping category: {category} (work_type={work_type}, location={location})")
-        try:
-            internships = await InternshalaScraper.scrape_internships(
-                category,
-                work_type=work_type,
-                location=location,
-            )
-            logger.info(f"Found {len(internships)} internships for '{category}'")
-
-            for item in internships:
-                try:
-                    # Skip entries with no apply_url (can't upsert without unique key)
-                    if not item.get("apply_url"):
-                        continue
-
-                    # Check if already exists by apply_url
-                    existing = supabase.table("internships").select("id").eq(
-                        "apply_url", item["apply_url"]
-                    ).execute()
-
-                    if not existing.data:
-                        item["posted_at"] = item.get("posted_at") or datetime.datetime.now().isoformat()
-                        supabase.table("internships").insert(item).execute()
-                        total_saved += 1
-                except Exception as e:
-                    logger.warning(f"Error saving internship '{item.get('role')}': {e}")
-                    continue
-
-        except Exception as e:
-            logger.error(f"Error scraping category '{category}': {e}")
-            logger.error(traceback.format_exc())
-
-    logger.info(f"✅ Scraping complete! Saved {total_saved} new internships")
-
-
 @router.post("/scrape")
-async def trigger_scrape(
-    background_tasks: BackgroundTasks,
-    body: ScrapeRequest = ScrapeRequest(),
-):
-    """Trigger scraping with optional filters.
+async def trigger_scrape(body: ScrapeRequest = ScrapeRequest()):
+    """Queue a scrape job with optional filters.
 
     Body JSON:
       - categories: list of category strings (default: popular categories)
       - work_type: "remote" to filter for WFH internships on Internshala
       - location: city name to scope results (e.g. "bangalore")
+      - work_types / locations: several variants, scraped concurrently
+
+    Variants scraped recently or already queued are not scraped again; if
+    that covers all of them, the existing job is returned ("coalesced").
+    Poll GET /api/internships/scrape/{job_id} for progress.
     """
-    categories = body.categories if body.categories else [
-        "web development",
-        "python",
-        "machine learning",
-        "data science",
-        "frontend development",
-        "backend development",
-        "mobile app development",
-    ]
+    categories = body.categories if body.categories else DEFAULT_CATEGORIES
 
-    background_tasks.add_task(
-        scrape_and_save,
+    job_id, coalesced = await scrape_scheduler.submit(
         categories,
-        work_type=body.work_type,
-        location=body.location,
+        work_types=body.work_types or [body.work_type],
+        locations=body.locations or [body.location],
+        source="api",
     )
     return {
-        "message": f"Scraping started for categories: {categories}",
+        "message": f"Scraping {'already covered' if coalesced else 'queued'} for categories: {categories}",
+        "job_id": job_id,
+        "coalesced": coalesced,
         "categories": categories,
         "work_type": body.work_type,
         "location": body.location,
     }
+
+
+@router.get("/scrape/{job_id}")
+async def get_scrape_job(job_id: str):
+    """Status of a scrape job, with writer stats and stage metrics once it finishes."""
+    job = await scrape_scheduler.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Scrape job not found")
+    return job
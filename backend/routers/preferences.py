@@ -1,7 +1,10 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException
 from models.schemas import PreferencesRequest
 from supabase_client import supabase
-from routers.internships import scrape_and_save
+from services import db_pool
+from services.scrape_scheduler import scrape_scheduler
+from services.recommendation_cache import recommendation_cache
+from services.user_data import user_data
 import logging
 import traceback
 
@@ -18,7 +21,7 @@ router = APIRouter(prefix="/api/preferences", tags=["Preferences"])
 
 
 @router.post("/{user_id}")
-async def set_preferences(user_id: str, prefs: PreferencesRequest, background_tasks: BackgroundTasks):
+async def set_preferences(user_id: str, prefs: PreferencesRequest):
     logger.info(f"Setting preferences for user: {user_id}")
     logger.info(f"Preferences: {prefs.model_dump()}")
 
@@ -27,25 +30,28 @@ async def set_preferences(user_id: str, prefs: PreferencesRequest, background_ta
 
     try:
         # Check if preferences already exist
-        existing = supabase.table("user_preferences").select("id").eq("user_id", user_id).execute()
+        existing = await db_pool.execute(supabase.table("user_preferences").select("id").eq("user_id", user_id))
 
         if existing.data:
             logger.info("Updating existing preferences...")
-            response = supabase.table("user_preferences").update(data).eq("user_id", user_id).execute()
+            response = await db_pool.execute(supabase.table("user_preferences").update(data).eq("user_id", user_id))
         else:
             logger.info("Inserting new preferences...")
-            response = supabase.table("user_preferences").insert(data).execute()
+            response = await db_pool.execute(supabase.table("user_preferences").insert(data))
 
         if not response.data:
             raise HTTPException(status_code=500, detail="Failed to save preferences")
 
         logger.info(f"✅ Preferences saved: {response.data[0]}")
+        user_data.invalidate(user_id)
+        recommendation_cache.invalidate(user_id)
 
-        # If target_roles changed, trigger background scrape
+        # If target_roles changed, queue a scrape (coalesced with identical recent ones)
         target_roles = prefs.target_roles or []
         if target_roles:
-            logger.info(f"📡 Triggering scrape for target roles: {target_roles}")
-            background_tasks.add_task(scrape_and_save, target_roles)
+            job_id, coalesced = await scrape_scheduler.submit(target_roles, source="preferences")
+            logger.info(f"📡 Scrape for target roles {target_roles}: job {job_id}"
+                        f"{' (already covered)' if coalesced else ''}")
 
         return response.data[0]
 
@@ -61,8 +67,8 @@ async def set_preferences(user_id: str, prefs: PreferencesRequest, background_ta
 async def get_preferences(user_id: str):
     logger.info(f"Getting preferences for user: {user_id}")
     try:
-        response = supabase.table("user_preferences").select("*").eq("user_id", user_id).execute()
-        if not response.data:
+        preferences = await user_data.preferences(user_id)
+        if preferences is None:
             # Return defaults instead of 404
             return {
                 "id": None,
@@ -73,7 +79,7 @@ async def get_preferences(user_id: str):
                 "target_roles": [],
                 "updated_at": None
             }
-        return response.data[0]
+        return preferences
     except Exception as e:
         logger.error(f"Error getting preferences: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get preferences: {str(e)}")
@@ -1,6 +1,11 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 from supabase_client import supabase
 from models.schemas import SkillsUpdateRequest
+from services import db_pool
+from services.recommendation_cache import recommendation_cache
+from services.match_store import MatchStore
+from services.user_data import user_data
+import asyncio
 import logging
 import traceback
 
@@ -22,21 +27,21 @@ async def get_profile(user_id: str):
     logger.info(f"Getting profile for user: {user_id}")
 
     try:
+        # User info, latest resume, preferences and resume count, all at once
+        profile_resp, latest_resume, preferences, all_resumes = await asyncio.gather(
+            db_pool.execute(supabase.table("profiles").select("*").eq("id", user_id)),
+            user_data.latest_resume(user_id),
+            user_data.preferences(user_id),
+            db_pool.execute(supabase.table("resumes").select("id", count="exact").eq("user_id", user_id)),
+        )
+
         # 1. User info from profiles
-        profile_resp = supabase.table("profiles").select("*").eq("id", user_id).execute()
         profile = profile_resp.data[0] if profile_resp.data else {
             "id": user_id, "full_name": "", "email": "", "created_at": None
         }
 
-        # 2. Latest resume
-        resume_resp = supabase.table("resumes").select("*").eq(
-            "user_id", user_id
-        ).order("created_at", desc=True).limit(1).execute()
-        latest_resume = resume_resp.data[0] if resume_resp.data else None
-
-        # 3. Preferences
-        prefs_resp = supabase.table("user_preferences").select("*").eq("user_id", user_id).execute()
-        preferences = prefs_resp.data[0] if prefs_resp.data else {
+        # 2. Preferences
+        preferences = preferences or {
             "internship_type": "",
             "work_mode": "Remote",
             "preferred_location": "",
@@ -44,8 +49,7 @@ async def get_profile(user_id: str):
             "updated_at": None
         }
 
-        # 4. Stats
-        all_resumes = supabase.table("resumes").select("id", count="exact").eq("user_id", user_id).execute()
+        # 3. Stats
         resume_count = len(all_resumes.data) if all_resumes.data else 0
 
         result = {
@@ -78,35 +82,36 @@ async def get_profile(user_id: str):
 
 
 @router.put("/{user_id}/skills")
-async def update_skills(user_id: str, body: SkillsUpdateRequest):
+async def update_skills(user_id: str, body: SkillsUpdateRequest, background_tasks: BackgroundTasks):
     """Update skills on the user's latest resume."""
     logger.info(f"Updating skills for user: {user_id}")
     logger.info(f"New skills: {body.skills}")
 
     try:
-        # Find latest resume
-        resume_resp = supabase.table("resumes").select("id").eq(
-            "user_id", user_id
-        ).order("created_at", desc=True).limit(1).execute()
+        # Find latest resume — uncached, a resume uploaded seconds ago must get the edit
+        latest_resume = await user_data.latest_resume(user_id, fresh=True)
 
-        if not resume_resp.data:
+        if latest_resume is None:
             raise HTTPException(status_code=404, detail="No resume found. Upload a resume first.")
 
-        resume_id = resume_resp.data[0]["id"]
+        resume_id = latest_resume["id"]
         logger.info(f"Updating skills on resume: {resume_id}")
 
         # Update skills
         try:
-            update_resp = supabase.table("resumes").update({
+            update_resp = await db_pool.execute(supabase.table("resumes").update({
                 "skills": body.skills
-            }).eq("id", resume_id).execute()
+            }).eq("id", resume_id))
             logger.info(f"Update response data: {update_resp.data}")
+            user_data.invalidate(user_id)
+            recommendation_cache.invalidate(user_id)
+            background_tasks.add_task(MatchStore.rescore_user, user_id, body.skills)
         except Exception as update_err:
             logger.error(f"Supabase update error: {update_err}")
             raise HTTPException(status_code=500, detail=f"Database update failed: {str(update_err)}")
 
         # Verify the update worked by re-fetching
-        verify = supabase.table("resumes").select("skills").eq("id", resume_id).execute()
+        verify = await db_pool.execute(supabase.table("resumes").select("skills").eq("id", resume_id))
         if verify.data:
             logger.info(f"✅ Skills verified on resume {resume_id}: {verify.data[0].get('skills')}")
 
@@ -1,7 +1,16 @@
-from fastapi import APIRouter, HTTPException, Query
-from supabase_client import supabase
-from services.matcher import Matcher
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Response
+from models.schemas import InternshipResponse, MatchResponse
+from services import db_pool
+from services.internship_index import internship_index
+from services.recommendation_cache import recommendation_cache
+from services.recommender import Recommender
+from services.user_data import user_data
+from services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
+from services.projection import parse_fields, project
+from typing import List, Optional
+from itertools import islice
+import asyncio
+import heapq
 import logging
 import traceback
 
@@ -16,151 +25,196 @@ if not logger.handlers:
 
 router = APIRouter(prefix="/api/recommendations", tags=["Recommendations"])
 
+# Share of the ranking given to keyword relevance when `search` is used
+SEARCH_WEIGHT = 0.3
+
+
+def _cursor_position(position, sort: str):
+    """(sort key, internship id) the next page starts after, or None."""
+    if position is None:
+        return None
+    key, iid = position.get("key"), position.get("id")
+    key_type = str if sort == "recent" else (int, float)
+    if position.get("sort") != sort or not isinstance(key, key_type) or not isinstance(iid, str):
+        raise HTTPException(status_code=400, detail="Cursor does not match this sort order")
+    return (key, iid)
+
+
+def _seek(ranked, after) -> int:
+    """Index of the first (score, id) in the best-first ranked list below `after`."""
+    if after is None:
+        return 0
+    lo, hi = 0, len(ranked)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if (ranked[mid][0], ranked[mid][1]) >= after:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
 
-@router.get("/{user_id}")
+@router.get("/{user_id}", response_model=List[MatchResponse], response_model_exclude_unset=True)
 async def get_recommendations(
     user_id: str,
+    response: Response,
     work_type: Optional[str] = Query(None, description="Filter: Remote, On-site, Hybrid"),
     location: Optional[str] = Query(None, description="Substring match on location"),
-    search: Optional[str] = Query(None, description="Keyword search on role/company/description"),
+    search: Optional[str] = Query(None, description="Keyword search on role/company/description (BM25-ranked)"),
     min_score: int = Query(0, ge=0, le=100, description="Minimum match score"),
+    min_stipend: Optional[int] = Query(None, ge=0, description="Minimum monthly stipend (upper end of the range)"),
     skills_filter: Optional[str] = Query(None, alias="skills", description="Comma-separated skills to filter by"),
     sort: str = Query("match", description="Sort: match, recent, salary"),
-    limit: int = Query(50, ge=1, le=100, description="Max results"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Max results per page"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's X-Next-Cursor header"),
+    fields: Optional[str] = Query(None, description="Comma-separated internship fields to return (default: all)"),
 ):
     logger.info(f"Getting recommendations for user: {user_id} "
                 f"(work_type={work_type}, location={location}, search={search}, "
-                f"min_score={min_score}, sort={sort}, limit={limit})")
+                f"min_score={min_score}, min_stipend={min_stipend}, sort={sort}, limit={limit}, cursor={cursor})")
 
+    selected = parse_fields(fields, InternshipResponse)
     try:
-        # 1. Get latest resume
-        resumes = supabase.table("resumes").select("*").eq(
-            "user_id", user_id
-        ).order("created_at", desc=True).limit(1).execute()
-
-        if not resumes.data:
-            logger.warning("No resume found for user")
-            return []
-
-        resume = resumes.data[0]
-        resume_skills = resume.get("skills", [])
-        logger.info(f"Resume skills ({len(resume_skills)}): {resume_skills}")
-
-        # 2. Get user preferences (for ranking boost, NOT for filtering)
-        prefs = supabase.table("user_preferences").select("*").eq("user_id", user_id).execute()
-        preferred_type = ""
-        preferred_work_mode = ""
-        if prefs.data:
-            preferred_type = (prefs.data[0].get("internship_type") or "").lower()
-            preferred_work_mode = (prefs.data[0].get("work_mode") or "").lower()
-            logger.info(f"Preferences — type: '{preferred_type}', work_mode: '{preferred_work_mode}'")
-
-        # 3. Fetch internships — apply server-side filters where possible
-        query = supabase.table("internships").select("*")
-
-        if work_type and work_type.lower() != "all":
-            query = query.ilike("work_type", f"%{work_type}%")
-
-        if location:
-            query = query.ilike("location", f"%{location}%")
-
-        internships_resp = query.limit(300).execute()
-        all_internships = internships_resp.data or []
-        logger.info(f"Internships after DB filters: {len(all_internships)}")
-
-        if not all_internships:
-            logger.warning("No internships match the filters!")
-            return []
-
-        # 4. Parse skills filter
+        await db_pool.call(internship_index.ensure_loaded)
+        catalog_version = internship_index.version
+
+        # 1-3. Pre-ranked list from cache, or rank the catalog for this user
+        ranked = recommendation_cache.get(user_id, catalog_version)
+        if ranked is None:
+            generation = recommendation_cache.generation(user_id)
+            # Get latest resume and user preferences (for ranking boost, NOT for filtering)
+            resume, prefs = await asyncio.gather(
+                user_data.latest_resume(user_id),
+                user_data.preferences(user_id),
+            )
+
+            if resume is None:
+                logger.warning("No resume found for user")
+                return []
+
+            resume_skills = resume.get("skills", [])
+            logger.info(f"Resume skills ({len(resume_skills)}): {resume_skills}")
+
+            preferred_type = ""
+            preferred_work_mode = ""
+            if prefs:
+                preferred_type = (prefs.get("internship_type") or "").lower()
+                preferred_work_mode = (prefs.get("work_mode") or "").lower()
+                logger.info(f"Preferences — type: '{preferred_type}', work_mode: '{preferred_work_mode}'")
+
+            ranked = Recommender.rank(resume_skills, preferred_type, preferred_work_mode)
+            recommendation_cache.put(user_id, catalog_version, ranked, generation)
+            logger.info(f"Ranked {len(ranked)} candidate internships of {len(internship_index)}")
+        else:
+            logger.info(f"Using cached ranking ({len(ranked)} internships)")
+
+        # 4. Parse filters
+        work_type_l = work_type.lower() if work_type and work_type.lower() != "all" else ""
+        location_l = location.lower() if location else ""
+
         filter_skills_set = set()
         if skills_filter:
             filter_skills_set = set(s.strip().lower() for s in skills_filter.split(",") if s.strip())
 
-        # 5. Keyword search filter
-        search_lower = search.strip().lower() if search else ""
-
-        # 6. Calculate match scores & apply remaining filters
-        matches = []
-        for internship in all_internships:
-            internship_skills = internship.get("skills", []) or []
-            internship_text = " ".join([
-                internship.get("description") or "",
-                internship.get("role") or "",
-                internship.get("company") or ""
-            ])
-
-            # -- Keyword search --
-            if search_lower:
-                role_l = (internship.get("role") or "").lower()
-                company_l = (internship.get("company") or "").lower()
-                desc_l = (internship.get("description") or "").lower()
-                if (search_lower not in role_l
-                        and search_lower not in company_l
-                        and search_lower not in desc_l):
+        # 5. Keyword search — BM25 lookup in the catalog's text index
+        search_scores = None
+        max_relevance = 0.0
+        if search and search.strip():
+            search_scores = internship_index.search(search)
+            max_relevance = max(search_scores.values(), default=0.0)
+            logger.info(f"Search '{search}' matched {len(search_scores)} internships")
+
+        # 6. Resume after the cursor position, if any
+        if sort not in ("recent", "salary"):
+            sort = "match"
+        after = _cursor_position(decode_cursor(cursor), sort)
+
+        def blended(score, relevance):
+            """Match score blended with normalized keyword relevance (0-100)."""
+            return round((1 - SEARCH_WEIGHT) * score + SEARCH_WEIGHT * 100 * relevance / max_relevance, 6)
+
+        def sort_key(score, internship, iid, relevance):
+            if sort == "recent":
+                return (internship.get("posted_at") or "", iid)
+            if sort == "salary":
+                stipend = internship["stipend_max"]
+                return (stipend if stipend is not None else -1, iid)
+            if search_scores is not None:
+                return (blended(score, relevance), iid)
+            return (score, iid)
+
+        def filtered(start):
+            """Lazily apply filters on top of the ranked list."""
+            for n in range(start, len(ranked)):
+                score, iid, matched_skills = ranked[n]
+
+                # -- Min score filter --
+                if score < min_score:
+                    # Ranked best-first, so nothing after this can pass either
+                    return
+
+                internship = internship_index.get(iid)
+                if internship is None:
                     continue
 
-            # -- Skills filter --
-            if filter_skills_set:
-                intern_skills_lower = set(s.lower() for s in internship_skills)
-                if not filter_skills_set.intersection(intern_skills_lower):
-                    # Also check description text for skill mentions
-                    text_lower = internship_text.lower()
-                    if not any(sk in text_lower for sk in filter_skills_set):
-                        continue
-
-            # Base skill match score (0-100)
-            score = Matcher.calculate_match(resume_skills, internship_skills, internship_text)
-
-            # Preference boost: +15 if role matches preferred type
-            role_lower = (internship.get("role") or "").lower()
-            desc_lower = (internship.get("description") or "").lower()
-            if preferred_type and (preferred_type in role_lower or preferred_type in desc_lower):
-                score = min(score + 15, 100)
-
-            # Work mode boost: +5 if matches preferred work mode
-            work_type_lower = (internship.get("work_type") or "").lower()
-            if preferred_work_mode and preferred_work_mode in work_type_lower:
-                score = min(score + 5, 100)
+                if work_type_l and work_type_l not in (internship.get("work_type") or "").lower():
+                    continue
+                if location_l and location_l not in (internship.get("location") or "").lower():
+                    continue
+                if min_stipend is not None and (internship["stipend_max"] or 0) < min_stipend:
+                    continue
 
-            # -- Min score filter --
-            if score < min_score:
-                continue
+                # -- Keyword search --
+                relevance = 0.0
+                if search_scores is not None:
+                    relevance = search_scores.get(iid, 0.0)
+                    if relevance <= 0:
+                        continue
 
-            # Find explicitly matched skills
-            resume_set = set(s.lower() for s in resume_skills)
-            intern_set = set(s.lower() for s in internship_skills)
-            matched_skills = list(resume_set.intersection(intern_set))
+                # -- Skills filter --
+                if filter_skills_set:
+                    intern_skills_lower = set(s.lower() for s in (internship.get("skills") or []))
+                    intern_skills_lower.update(internship["extracted_skills"])
+                    if not filter_skills_set.intersection(intern_skills_lower):
+                        # Also check description text for skill mentions
+                        text_lower = internship["search_text"]
+                        if not any(sk in text_lower for sk in filter_skills_set):
+                            continue
+
+                key = sort_key(score, internship, iid, relevance)
+                if after is not None and key >= after:
+                    continue
+                yield key, score, internship, matched_skills, relevance
 
-            # Also check for skills mentioned in text
-            for skill in resume_set:
-                if skill in internship_text.lower() and skill not in matched_skills:
-                    matched_skills.append(skill)
+        # 7. Top-k selection — never sorts or materializes the whole list
+        if sort == "match" and search_scores is None:
+            # Ranked list is already in this order: seek and take the next page
+            page = list(islice(filtered(_seek(ranked, after)), limit))
+        else:
+            page = heapq.nlargest(limit, filtered(0), key=lambda m: m[0])
 
-            matches.append({
-                "internship": internship,
+        # 8. Build the page
+        result = []
+        for _, score, internship, matched_skills, relevance in page:
+            match = {
+                "internship": project(internship, selected),
                 "match_score": score,
-                "matched_skills": matched_skills
-            })
-
-        # 7. Sort
-        if sort == "recent":
-            matches.sort(key=lambda x: x["internship"].get("posted_at") or "", reverse=True)
-        elif sort == "salary":
-            def salary_key(m):
-                sal = m["internship"].get("salary") or ""
-                # Extract first number from salary string for rough comparison
-                nums = "".join(c if c.isdigit() else " " for c in sal).split()
-                return int(nums[0]) if nums else 0
-            matches.sort(key=salary_key, reverse=True)
-        else:
-            matches.sort(key=lambda x: x["match_score"], reverse=True)
+                "matched_skills": list(matched_skills),
+            }
+            if search_scores is not None:
+                match["search_score"] = round(relevance, 3)
+            result.append(match)
+        if len(page) == limit:
+            last_key = page[-1][0]
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+                {"sort": sort, "key": last_key[0], "id": last_key[1]}
+            )
 
-        # 8. Limit
-        result = matches[:limit]
         logger.info(f"✅ Returning {len(result)} recommendations (top scores: {[m['match_score'] for m in result[:5]]})")
         return result
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Error getting recommendations: {e}")
         logger.error(traceback.format_exc())
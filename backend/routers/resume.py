@@ -1,9 +1,19 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException, Form, Depends
+from fastapi import APIRouter, File, UploadFile, HTTPException, Form, Depends, BackgroundTasks, Query, Response
 from supabase_client import supabase
 from auth_dependencies import get_current_user
+from models.schemas import ResumeResponse
+from services import db_pool
+from services.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, cursor_position, next_cursor, seek,
+)
+from services.projection import columns, parse_fields, project
 from services.resume_parser import ResumeParser
 from services.ats_scorer import ATSScorer
+from services.recommendation_cache import recommendation_cache
+from services.match_store import MatchStore
+from services.user_data import user_data
 from datetime import datetime
+from typing import List, Optional
 import traceback
 import logging
 
@@ -22,6 +32,7 @@ router = APIRouter(prefix="/api/resume", tags=["Resume"])
 
 @router.post("/upload")
 async def upload_resume(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     user_id: str = Depends(get_current_user)
 ):
@@ -95,12 +106,15 @@ async def upload_resume(
         }
 
         try:
-            result = supabase.table("resumes").insert(data).execute()
+            result = await db_pool.execute(supabase.table("resumes").insert(data))
             if not result.data:
                 raise Exception("Failed to insert resume into database")
             
             resume_id = result.data[0]["id"]
             logger.info(f"[Step 5] ✅ Saved! ID: {resume_id}")
+            user_data.invalidate(user_id)
+            recommendation_cache.invalidate(user_id)
+            background_tasks.add_task(MatchStore.rescore_user, user_id, skills)
         except Exception as db_err:
             logger.error(f"[Step 5] ❌ DB insert failed: {db_err}")
             logger.error(traceback.format_exc())
@@ -126,15 +140,31 @@ async def upload_resume(
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 
-@router.get("/list")
-async def list_resumes(user_id: str = Depends(get_current_user)):
-    """List all resumes for the current user."""
+@router.get("/list", response_model=List[ResumeResponse], response_model_exclude_unset=True)
+async def list_resumes(
+    response: Response,
+    user_id: str = Depends(get_current_user),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Max results per page"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's X-Next-Cursor header"),
+    fields: Optional[str] = Query(None, description="Comma-separated resume fields to return (default: all)"),
+):
+    """List the current user's resumes, newest first (without their extracted text).
+
+    Pages are `limit` long; the next page's cursor is in the X-Next-Cursor header.
+    """
     logger.info(f"Listing resumes for user: {user_id}")
+    selected = parse_fields(fields, ResumeResponse)
+    position = cursor_position(cursor, "created_at")
     try:
-        result = supabase.table("resumes").select("*").eq("user_id", user_id).order("created_at", desc=True).execute()
+        # created_at is needed for the next cursor even if not asked for
+        query = supabase.table("resumes").select(columns(selected, "created_at")).eq("user_id", user_id)
+        result = await db_pool.execute(seek(query, "created_at", position, limit))
         resumes = result.data if result.data else []
         logger.info(f"Found {len(resumes)} resumes")
-        return resumes
+        next_page = next_cursor(resumes, "created_at", "created_at", limit)
+        if next_page:
+            response.headers[NEXT_CURSOR_HEADER] = next_page
+        return [project(resume, selected) for resume in resumes]
     except Exception as e:
         logger.error(f"Error listing resumes: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to list resumes: {str(e)}")
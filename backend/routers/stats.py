@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 from supabase_client import supabase
+from services import db_pool
 import logging
 
 logger = logging.getLogger("stats_router")
@@ -9,14 +10,14 @@ router = APIRouter(prefix="/api/stats", tags=["Stats"])
 @router.get("/")
 async def get_stats():
     try:
-        internships = supabase.table("internships").select("*", count="exact", head=True).execute()
+        internships = await db_pool.execute(supabase.table("internships").select("*", count="exact", head=True))
         internship_count = internships.count or 0
     except Exception as e:
         logger.warning(f"Error fetching internship count: {e}")
         internship_count = 0
 
     try:
-        resumes = supabase.table("resumes").select("*", count="exact", head=True).execute()
+        resumes = await db_pool.execute(supabase.table("resumes").select("*", count="exact", head=True))
         resume_count = resumes.count or 0
     except Exception as e:
         logger.warning(f"Error fetching resume count: {e}")
@@ -0,0 +1,54 @@
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from config import DB_POOL_SIZE
+
+logger = logging.getLogger("db_pool")
+
+_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=DB_POOL_SIZE, thread_name_prefix="db")
+    return _pool
+
+
+async def execute(query) -> Any:
+    """Await a built supabase query without blocking the event loop.
+
+    The supabase client is synchronous, so every `.execute()` made from an
+    async route stalls the whole server for one round trip. This runs it on
+    a bounded thread pool instead (DB_POOL_SIZE threads; further queries
+    wait for a free thread):
+
+        resp = await db_pool.execute(db.table("bookmarks").select("*").eq("user_id", user_id))
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor(), query.execute)
+
+
+async def call(fn: Callable, *args, **kwargs) -> Any:
+    """Run any other blocking DB helper (fetch_all, MatchStore, ...) on the same pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor(), functools.partial(fn, *args, **kwargs))
+
+
+def configure(max_workers: int):
+    """Replace the pool with one of `max_workers` threads (benchmarks, tuning)."""
+    global _pool
+    shutdown()
+    _pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+    logger.info(f"DB pool resized to {max_workers} threads")
+
+
+def shutdown():
+    """Wait for in-flight queries and release the pool's threads."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True)
+        _pool = None
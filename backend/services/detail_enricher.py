@@ -0,0 +1,75 @@
+import asyncio
+import datetime
+import logging
+from concurrent.futures import Executor
+from typing import Dict, List, Optional
+
+from config import SCRAPE_DETAIL_RATE, SCRAPE_DETAIL_CONCURRENCY
+from services.internship_features import InternshipFeatures
+from services.scraper import ScrapeSession, TokenBucket
+
+logger = logging.getLogger("detail_enricher")
+
+
+class DetailEnricher:
+    """Fills in description, required skills and deadline from detail pages.
+
+    Only given rows are fetched — the scrape pipeline passes the postings it
+    just inserted or changed, so the cost tracks catalog churn. Fetches run
+    `concurrency` at a time under their own token bucket (`rate` pages/sec,
+    on top of the session's per-host limit) and go through the session's
+    HTTP cache; parsing runs on `executor`.
+    """
+
+    def __init__(
+        self,
+        session: ScrapeSession,
+        executor: Optional[Executor] = None,
+        rate: float = SCRAPE_DETAIL_RATE,
+        concurrency: int = SCRAPE_DETAIL_CONCURRENCY,
+    ):
+        self.session = session
+        self.executor = executor
+        self.bucket = TokenBucket(rate)
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.stats = {"fetched": 0, "failed": 0}
+
+    @staticmethod
+    def merge(row: Dict, details: Dict) -> Dict:
+        """Row with detail-page fields merged in and features recomputed."""
+        merged = dict(row)
+        if details.get("description"):
+            merged["description"] = details["description"]
+        # Listing cards show a few skills; the detail page has the full list
+        merged["skills"] = list(dict.fromkeys((row.get("skills") or []) + details.get("skills", [])))
+        if details.get("deadline"):
+            merged["deadline"] = details["deadline"]
+        merged["details_fetched_at"] = datetime.datetime.now().isoformat()
+        merged.update(InternshipFeatures.compute(merged))
+        return merged
+
+    async def _details(self, url: str) -> Optional[Dict]:
+        async with self._semaphore:
+            await self.bucket.acquire()
+            page = await self.session.fetch(url)
+        if page is None:
+            return None
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.session.parse_detail, page)
+
+    async def enrich(self, rows: List[Dict]) -> List[Dict]:
+        """Rows that got details, merged; rows whose page failed are left out."""
+        results = await asyncio.gather(
+            *(self._details(row["apply_url"]) for row in rows),
+            return_exceptions=True,
+        )
+        enriched = []
+        for row, details in zip(rows, results):
+            if isinstance(details, Exception) or details is None:
+                self.stats["failed"] += 1
+                if isinstance(details, Exception):
+                    logger.warning(f"Error fetching details for {row['apply_url']}: {details}")
+                continue
+            self.stats["fetched"] += 1
+            enriched.append(self.merge(row, details))
+        return enriched
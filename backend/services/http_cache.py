@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config import SCRAPE_CACHE_DIR, SCRAPE_CACHE_MAX_AGE_DAYS, SCRAPE_CACHE_TTL_SECONDS
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class HttpCache:
+    """On-disk cache of fetched pages for the scraper.
+
+    For every URL it keeps the body plus its ETag / Last-Modified validators
+    and a content hash. Within `ttl` a page is served straight from disk;
+    after that the scraper revalidates with a conditional request. Parsed
+    listings are stored by content hash, so a page whose bytes we've seen
+    before (304, or identical body) is never parsed twice.
+
+    Layout:  <dir>/pages/<sha256(url)>.json   {url, etag, last_modified, content_hash, fetched_at}
+             <dir>/pages/<sha256(url)>.html
+             <dir>/parsed/<content_hash>.json          listings of a listing page
+             <dir>/parsed/detail-<content_hash>.json   fields of a detail page
+
+    `prune` deletes files not written or reused for `max_age` seconds, so
+    pages that dropped off the listings and parses of old content go.
+    All methods do blocking file I/O; call them off the event loop.
+    """
+
+    def __init__(
+        self,
+        directory: str = SCRAPE_CACHE_DIR,
+        ttl: float = SCRAPE_CACHE_TTL_SECONDS,
+        max_age: float = SCRAPE_CACHE_MAX_AGE_DAYS * 86400,
+    ):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_age = max_age
+        (self.directory / "pages").mkdir(parents=True, exist_ok=True)
+        (self.directory / "parsed").mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _write(path: Path, data: str):
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(data, encoding="utf-8")
+        os.replace(tmp, path)
+
+    def _page_path(self, url: str, suffix: str) -> Path:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / "pages" / f"{key}{suffix}"
+
+    # ── Pages ──
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Stored metadata for `url`, or None if it was never cached."""
+        try:
+            return json.loads(self._page_path(url, ".json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, meta: Dict) -> bool:
+        return time.time() - meta.get("fetched_at", 0) < self.ttl
+
+    def body(self, url: str) -> Optional[str]:
+        try:
+            return self._page_path(url, ".html").read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    @staticmethod
+    def validators(meta: Optional[Dict]) -> Dict[str, str]:
+        """Conditional-request headers for a cached page."""
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def store(self, url: str, text: str, digest: str, etag: Optional[str], last_modified: Optional[str]):
+        self._write(self._page_path(url, ".html"), text)
+        self._write(self._page_path(url, ".json"), json.dumps({
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_hash": digest,
+            "fetched_at": time.time(),
+        }))
+
+    def touch(self, url: str, meta: Dict):
+        """Restart the TTL after a 304 Not Modified."""
+        meta = dict(meta, fetched_at=time.time())
+        self._write(self._page_path(url, ".json"), json.dumps(meta))
+
+    # ── Parsed listings ──
+
+    def get_parsed(self, digest: str) -> Optional[Any]:
+        path = self.directory / "parsed" / f"{digest}.json"
+        try:
+            parsed = json.loads(path.read_text(encoding="utf-8"))
+            # Still in use: keep it past the next prune
+            os.utime(path)
+            return parsed
+        except (OSError, ValueError):
+            return None
+
+    def put_parsed(self, digest: str, parsed: Any):
+        self._write(self.directory / "parsed" / f"{digest}.json", json.dumps(parsed))
+
+    # ── Eviction ──
+
+    def prune(self) -> int:
+        """Delete cached files older than `max_age`; returns how many went."""
+        cutoff = time.time() - self.max_age
+        removed = 0
+        for sub in ("pages", "parsed"):
+            for path in (self.directory / sub).iterdir():
+                try:
+                    if path.stat().st_mtime < cutoff:
+                        path.unlink()
+                        removed += 1
+                except OSError:
+                    # Removed or rewritten concurrently
+                    continue
+        return removed
@@ -0,0 +1,49 @@
+from typing import Dict
+
+from services.skill_extractor import skill_extractor
+from services.stipend import StipendParser
+
+
+class InternshipFeatures:
+    """Normalized per-posting features, computed once at ingest.
+
+    Stored on the `internships` row so the recommendation and dashboard
+    read paths don't redo string work per request:
+      - search_text:      lowercased description, role and company, one per
+                          line so a phrase match can't span two fields
+      - extracted_skills: canonical skill names found in the description
+      - stipend_min/max:  monthly stipend range, plus stipend_currency and
+                          stipend_period (see StipendParser.parse); lump
+                          sums are spread over the card's `duration`
+    """
+
+    @staticmethod
+    def search_text(item: Dict) -> str:
+        return "\n".join([
+            item.get("description") or "",
+            item.get("role") or "",
+            item.get("company") or "",
+        ]).lower()
+
+    @staticmethod
+    def stipend(item: Dict) -> Dict:
+        return StipendParser.parse(item.get("salary"), StipendParser.duration_months(item.get("duration")))
+
+    @staticmethod
+    def compute(item: Dict) -> Dict:
+        return {
+            "search_text": InternshipFeatures.search_text(item),
+            "extracted_skills": skill_extractor.find(item.get("description") or ""),
+            **InternshipFeatures.stipend(item),
+        }
+
+    @staticmethod
+    def ensure(row: Dict) -> Dict:
+        """Fill in features missing from rows ingested before they existed."""
+        if row.get("search_text") is None:
+            row["search_text"] = InternshipFeatures.search_text(row)
+        if row.get("extracted_skills") is None:
+            row["extracted_skills"] = skill_extractor.find(row.get("description") or "")
+        if row.get("stipend_period") is None:
+            row.update(InternshipFeatures.stipend(row))
+        return row
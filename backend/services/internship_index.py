@@ -0,0 +1,251 @@
+import threading
+import time
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import supabase_client
+from services.matcher import SkillMatrix
+from services.internship_features import InternshipFeatures
+from services.search_index import BM25Index, tokenize
+
+logger = logging.getLogger("internship_index")
+
+# Rebuild from the database at most this often, so rows written by other
+# workers/processes eventually show up even without a local scrape
+MAX_AGE_SECONDS = 15 * 60
+
+
+class _Catalog:
+    """One generation of the index: postings by id, skill and text posting lists."""
+
+    def __init__(self):
+        self.rows: Dict[str, Dict] = {}
+        self.skills: Dict[str, Set[str]] = {}
+        self.row_skills: Dict[str, Set[str]] = {}
+        self.text = BM25Index()
+
+    def add_row(self, row: Dict):
+        iid = str(row["id"])
+        InternshipFeatures.ensure(row)
+        skills = set(s.lower() for s in (row.get("skills") or []))
+        skills.update(row["extracted_skills"])
+
+        self.rows[iid] = row
+        self.row_skills[iid] = skills
+        for skill in skills:
+            self.skills.setdefault(skill, set()).add(iid)
+        self.text.add(iid, row["search_text"])
+
+    def remove_row(self, iid: str) -> bool:
+        if iid not in self.rows:
+            return False
+        for skill in self.row_skills.pop(iid):
+            ids = self.skills.get(skill)
+            if ids is not None:
+                ids.discard(iid)
+                if not ids:
+                    del self.skills[skill]
+        self.text.remove(iid)
+        del self.rows[iid]
+        return True
+
+    def apply(self, rows: Iterable[Dict]) -> int:
+        """Replace or drop (if expired) the given postings; returns how many were applied."""
+        count = 0
+        for row in rows:
+            if row.get("id") is None:
+                continue
+            self.remove_row(str(row["id"]))
+            if not row.get("expired_at"):
+                self.add_row(row)
+            count += 1
+        return count
+
+
+class InternshipIndex:
+    """In-process inverted index over the `internships` table.
+
+    Keeps every posting keyed by id, plus two posting lists:
+      - skill (lowercase)            → internship ids
+      - role/company/description token → internship ids (a BM25 index)
+
+    Recommendations use it to find the postings that share at least one
+    skill with a resume without scanning the whole catalog, and to rank
+    keyword searches.
+
+    A full (re)load builds a new catalog and scoring matrix without holding
+    the lock and publishes them in one swap, so readers always see a whole
+    catalog and only one thread reloads at a time. Scrape updates made
+    while a load is running are replayed onto the new catalog.
+    """
+
+    def __init__(self, max_age: Optional[float] = MAX_AGE_SECONDS):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._catalog = _Catalog()
+        # Updates to replay onto a catalog being built: ("add", rows) / ("remove", ids)
+        self._pending: Optional[List[Tuple[str, List]]] = None
+        self._matrix: Optional[SkillMatrix] = None
+        self._matrix_version = -1
+        self.loaded_at: Optional[float] = None
+        self.version = 0
+
+    # ── Building ──
+
+    def _stale(self) -> bool:
+        if self.loaded_at is None:
+            return True
+        return self.max_age is not None and time.time() - self.loaded_at > self.max_age
+
+    def ensure_loaded(self):
+        """Load the catalog on first use, or reload it once it is stale."""
+        if not self._stale():
+            return
+        if self.loaded_at is not None:
+            # Stale but usable: one caller reloads, the rest keep the current catalog
+            if not self._refresh_lock.acquire(blocking=False):
+                return
+        else:
+            # Nothing to serve yet: wait for whoever is loading
+            self._refresh_lock.acquire()
+        try:
+            if self._stale():
+                self.refresh()
+        finally:
+            self._refresh_lock.release()
+
+    def refresh(self):
+        """Rebuild the whole index from the `internships` table."""
+        with self._lock:
+            self._pending = []
+        try:
+            self.load(supabase_client.fetch_all("internships", client=supabase_client.supabase))
+        finally:
+            with self._lock:
+                self._pending = None
+
+    def load(self, rows: List[Dict]):
+        """Rebuild the whole index from already-fetched rows."""
+        with self._lock:
+            if self._pending is None:
+                self._pending = []
+        try:
+            catalog = _Catalog()
+            for row in rows:
+                # Expired postings stay in the table for bookmarks/applications only
+                if row.get("expired_at"):
+                    continue
+                catalog.add_row(row)
+            matrix = SkillMatrix(list(catalog.rows.values()))
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+
+        with self._lock:
+            replayed = self._pending or []
+            for op, items in replayed:
+                if op == "add":
+                    catalog.apply(items)
+                else:
+                    for iid in items:
+                        catalog.remove_row(iid)
+            if replayed:
+                matrix = None
+            self._pending = None
+            self._catalog = catalog
+            self.loaded_at = time.time()
+            self.version += 1
+            self._matrix, self._matrix_version = matrix, self.version
+        logger.info(f"Indexed {len(catalog.rows)} internships")
+
+    def add(self, rows: Iterable[Dict]):
+        """Index new or updated postings (e.g. right after a scrape)."""
+        rows = list(rows)
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(("add", rows))
+            if self.loaded_at is None:
+                # Nothing indexed yet — the first read will load everything
+                return
+            count = self._catalog.apply(rows)
+            if count:
+                self.version += 1
+        if count:
+            logger.info(f"Indexed {count} new/updated internships")
+
+    def remove(self, ids: Iterable[str]):
+        """Drop postings from the index."""
+        ids = [str(iid) for iid in ids]
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(("remove", ids))
+            removed = sum(1 for iid in ids if self._catalog.remove_row(iid))
+            if removed:
+                self.version += 1
+
+    # ── Lookups ──
+
+    def __len__(self) -> int:
+        return len(self._catalog.rows)
+
+    def get(self, iid: str) -> Optional[Dict]:
+        return self._catalog.rows.get(str(iid))
+
+    def all_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._catalog.rows)
+
+    def matrix(self) -> SkillMatrix:
+        """Batch-scoring matrix over the current catalog, rebuilt on change.
+
+        Built outside the lock; a matrix for a version that changed in the
+        meantime is returned but not kept.
+        """
+        with self._lock:
+            if self._matrix is not None and self._matrix_version == self.version:
+                return self._matrix
+            version, rows = self.version, list(self._catalog.rows.values())
+        matrix = SkillMatrix(rows)
+        with self._lock:
+            if self.version == version:
+                self._matrix, self._matrix_version = matrix, version
+        return matrix
+
+    def candidates(self, skills: Iterable[str]) -> Set[str]:
+        """Ids of postings that share at least one skill with `skills`.
+
+        A posting is a candidate if it lists the skill or mentions it in its
+        description (extracted_skills), or if its search text contains every
+        token of the skill as a whole token. Postings `Matcher.calculate_match`
+        would only match by substring (java inside javascript, a one-letter
+        skill like r inside any word) are deliberately not candidates.
+        """
+        result: Set[str] = set()
+        with self._lock:
+            catalog = self._catalog
+            for skill in skills:
+                skill = skill.lower().strip()
+                if not skill:
+                    continue
+                result |= catalog.skills.get(skill, set())
+
+                tokens = tokenize(skill)
+                if not tokens:
+                    continue
+                postings = [catalog.text.docs_with(t) for t in tokens]
+                if not all(postings):
+                    continue
+                postings.sort(key=len)
+                result |= set(postings[0]).intersection(*postings[1:])
+        return result
+
+    def search(self, query: str) -> Dict[str, float]:
+        """BM25 relevance of every posting matching a keyword query."""
+        with self._lock:
+            return self._catalog.text.search(query)
+
+
+# Shared, process-wide index
+internship_index = InternshipIndex()
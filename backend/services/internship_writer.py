@@ -0,0 +1,230 @@
+import datetime
+import hashlib
+import json
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import supabase_client
+from config import SCRAPE_DETAIL_REFRESH_DAYS, STALE_AFTER_DAYS
+from services.internship_features import InternshipFeatures
+
+logger = logging.getLogger("internship_writer")
+
+# Rows per UPSERT round trip
+WRITE_BATCH_SIZE = 500
+# apply_urls per lookup — they go in the query string, so keep it well under URL limits
+LOOKUP_BATCH_SIZE = 100
+
+# Columns that come from the listing page; their hash decides whether a
+# posting we already have changed
+SCRAPED_FIELDS = ("company", "role", "location", "work_type", "salary", "source", "skills")
+# Stored columns a changed posting's upsert must carry over (see _merge_stored)
+EXISTING_FIELDS = "apply_url, posted_at, content_hash, description, skills, details_fetched_at, expired_at"
+
+
+def listing_hash(item: Dict) -> str:
+    """Content hash of a listing's scraped fields."""
+    payload = json.dumps([item.get(f) for f in SCRAPED_FIELDS], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class InternshipWriter:
+    """Batched ingest of scraped listings into `internships`.
+
+    Listings are deduplicated by apply_url across the whole run, then
+    written per chunk with one lookup and one upsert on the unique
+    apply_url constraint, so a run costs O(rows / batch size) round trips
+    instead of two per listing. Postings whose content hash is unchanged
+    only get their last_seen_at bumped (one UPDATE per chunk and listing);
+    ones that had expired come back in `revived`, and ones whose detail
+    page was never fetched (or not for `detail_refresh_days`) in
+    `details_due`:
+
+        writer = InternshipWriter()
+        writer.add(listings)          # any number of times
+        rows = writer.flush()         # inserted + updated rows
+        writer.revived                # unchanged rows that were expired until now
+        writer.details_due            # unchanged rows missing fresh detail-page data
+        writer.stats                  # {"inserted": .., "updated": .., "unchanged": .., ...}
+    """
+
+    def __init__(self, client=None, batch_size: int = WRITE_BATCH_SIZE,
+                 detail_refresh_days: int = SCRAPE_DETAIL_REFRESH_DAYS):
+        self.client = client or supabase_client.supabase
+        self.batch_size = batch_size
+        self.detail_refresh_days = detail_refresh_days
+        self._pending: Dict[str, Dict] = {}
+        self._seen: Set[str] = set()
+        self.revived: List[Dict] = []
+        self.details_due: List[Dict] = []
+        self.stats = {
+            "received": 0, "duplicates": 0, "skipped": 0,
+            "inserted": 0, "updated": 0, "unchanged": 0, "failed": 0, "detailed": 0,
+        }
+
+    def add(self, items: Iterable[Dict]):
+        """Queue scraped listings; the first copy of each apply_url in the run wins."""
+        for item in items:
+            self.stats["received"] += 1
+            # Can't upsert without the unique key
+            if not item.get("apply_url"):
+                self.stats["skipped"] += 1
+                continue
+            if item["apply_url"] in self._seen:
+                self.stats["duplicates"] += 1
+                continue
+            self._seen.add(item["apply_url"])
+            self._pending[item["apply_url"]] = item
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def flush(self) -> List[Dict]:
+        """Write everything queued so far; returns the inserted and updated rows."""
+        items = list(self._pending.values())
+        self._pending.clear()
+
+        written = []
+        for start in range(0, len(items), self.batch_size):
+            batch = items[start:start + self.batch_size]
+            try:
+                written.extend(self._write_batch(batch))
+            except Exception as e:
+                self.stats["failed"] += len(batch)
+                logger.warning(f"Error saving a batch of {len(batch)} internships: {e}")
+        return written
+
+    def _existing(self, urls: List[str]) -> Dict[str, Dict]:
+        existing = {}
+        for start in range(0, len(urls), LOOKUP_BATCH_SIZE):
+            resp = self.client.table("internships").select(EXISTING_FIELDS).in_(
+                "apply_url", urls[start:start + LOOKUP_BATCH_SIZE]
+            ).execute()
+            for row in resp.data or []:
+                existing[row["apply_url"]] = row
+        return existing
+
+    def _write_batch(self, items: List[Dict]) -> List[Dict]:
+        existing = self._existing([item["apply_url"] for item in items])
+        now = datetime.datetime.now().isoformat()
+
+        rows = []
+        # (listing it was seen on, was expired) → apply_urls
+        seen_urls: Dict[Tuple[Optional[str], bool], List[str]] = defaultdict(list)
+        inserted = updated = 0
+        for item in items:
+            digest = listing_hash(item)
+            current = existing.get(item["apply_url"])
+            if current is not None and current.get("content_hash") == digest:
+                seen_urls[item.get("scraped_from"), current.get("expired_at") is not None].append(item["apply_url"])
+                continue
+
+            row = dict(item, content_hash=digest, last_seen_at=now, expired_at=None)
+            if current is None:
+                row["posted_at"] = row.get("posted_at") or now
+                inserted += 1
+            else:
+                # Keep the original posting date of a listing we already have
+                row["posted_at"] = current.get("posted_at") or row.get("posted_at") or now
+                self._merge_stored(row, current)
+                updated += 1
+            # Enriched already when it came through the scrape pipeline
+            InternshipFeatures.ensure(row)
+            rows.append(row)
+
+        # Unchanged postings: just record that they are still listed
+        for (source, expired), urls in seen_urls.items():
+            values = {"last_seen_at": now, "expired_at": None}
+            if source is not None:
+                values["scraped_from"] = source
+            for start in range(0, len(urls), LOOKUP_BATCH_SIZE):
+                resp = self.client.table("internships").update(values).in_(
+                    "apply_url", urls[start:start + LOOKUP_BATCH_SIZE]
+                ).execute()
+                for row in resp.data or []:
+                    if expired:
+                        # Listed again: back in the index and match scores
+                        self.revived.append(row)
+                    if self._details_due(row):
+                        self.details_due.append(row)
+            self.stats["unchanged"] += len(urls)
+
+        if not rows:
+            return []
+        resp = self.client.table("internships").upsert(rows, on_conflict="apply_url").execute()
+        self.stats["inserted"] += inserted
+        self.stats["updated"] += updated
+        return resp.data or []
+
+    @staticmethod
+    def _merge_stored(row: Dict, current: Dict):
+        """Keep a changed posting's detail-page fields and recompute its features.
+
+        The card only has a few skills and no description, so upserting it
+        as-is would wipe what DetailEnricher stored and rebuild search_text
+        and extracted_skills from the card alone.
+        """
+        if current.get("description") and not row.get("description"):
+            row["description"] = current["description"]
+        if current.get("details_fetched_at"):
+            row["skills"] = list(dict.fromkeys((row.get("skills") or []) + (current.get("skills") or [])))
+        row.update(InternshipFeatures.compute(row))
+
+    def _details_due(self, row: Dict) -> bool:
+        """Whether an unchanged posting's detail page should be fetched again.
+
+        Covers postings whose earlier fetch failed or that predate detail
+        enrichment (details_fetched_at is NULL), and ones enriched more
+        than `detail_refresh_days` ago.
+        """
+        fetched = row.get("details_fetched_at")
+        if not fetched:
+            return True
+        try:
+            fetched_at = datetime.datetime.fromisoformat(fetched)
+        except (TypeError, ValueError):
+            return True
+        if fetched_at.tzinfo is None:
+            fetched_at = fetched_at.astimezone()
+        age = datetime.datetime.now(datetime.timezone.utc) - fetched_at
+        return age > datetime.timedelta(days=self.detail_refresh_days)
+
+    def save_details(self, rows: List[Dict]) -> List[Dict]:
+        """Write back rows enriched from their detail pages (see DetailEnricher)."""
+        saved = []
+        for start in range(0, len(rows), self.batch_size):
+            batch = rows[start:start + self.batch_size]
+            try:
+                resp = self.client.table("internships").upsert(batch, on_conflict="apply_url").execute()
+                saved.extend(resp.data or [])
+            except Exception as e:
+                logger.warning(f"Error saving details for {len(batch)} internships: {e}")
+        self.stats["detailed"] += len(saved)
+        return saved
+
+    @staticmethod
+    def archive_stale(sources: List[str], stale_after_days: int = STALE_AFTER_DAYS) -> List[str]:
+        """Retire postings no scrape has seen for `stale_after_days`.
+
+        Only postings last seen on one of `sources` are considered: the
+        listing URLs this run fetched every page of (see
+        ScrapePipeline.covered). Runs the `archive_stale_internships`
+        function: unreferenced postings are moved to `internships_archive`;
+        ones users bookmarked or applied to stay in place with expired_at
+        set. Returns the ids of both, which should be dropped from the
+        in-memory index.
+        """
+        if not sources:
+            return []
+        # Use admin client to bypass RLS, fall back to regular client
+        client = supabase_client.supabase_admin or supabase_client.supabase
+        resp = client.rpc("archive_stale_internships", {
+            "p_sources": sorted(sources), "p_stale_after_days": stale_after_days,
+        }).execute()
+        rows = resp.data or []
+        archived = sum(1 for r in rows if r.get("archived"))
+        logger.info(f"Archived {archived} and expired {len(rows) - archived} postings "
+                    f"from {len(sources)} listings not seen for {stale_after_days} days")
+        return [str(r["internship_id"]) for r in rows]
@@ -0,0 +1,291 @@
+from typing import Dict, List, Optional
+from bs4 import BeautifulSoup, SoupStrainer
+import datetime
+import logging
+import re
+
+from config import SCRAPE_PARSER
+
+logger = logging.getLogger("listing_parser")
+logger.setLevel(logging.DEBUG)
+
+if not logger.handlers:
+    ch = logging.StreamHandler()
+    ch.setLevel(logging.DEBUG)
+    ch.setFormatter(logging.Formatter("%(asctime)s [%(name)s] %(levelname)s: %(message)s"))
+    logger.addHandler(ch)
+
+
+def build_listing(
+    company: Optional[str],
+    role: Optional[str],
+    location: Optional[str],
+    status_tags: List[str],
+    salary: Optional[str],
+    skills: List[str],
+    href: Optional[str],
+    duration: Optional[str] = None,
+) -> Optional[Dict]:
+    """Internship dict from the raw text pulled out of one listing container.
+
+    Every backend extracts the same fields and hands them here, so the
+    output doesn't depend on which parser is used. Missing elements are
+    passed as None; returns None for listings with neither role nor company.
+    """
+    company = company if company is not None else "Unknown"
+    role = role if role is not None else "Unknown"
+    loc = location if location is not None else "Unknown"
+
+    # Work type
+    intern_work_type = "In-office"
+    if "work from home" in loc.lower() or "remote" in loc.lower():
+        intern_work_type = "Remote"
+        loc = "Remote"
+    # Check for "Work From Home" tag
+    for tag_text in status_tags:
+        tag_text = tag_text.lower()
+        if 'work from home' in tag_text or 'remote' in tag_text:
+            intern_work_type = "Remote"
+
+    # Apply link
+    apply_url = ""
+    if href:
+        apply_url = "https://internshala.com" + href
+
+    # Skip if no valid role or company
+    if company == "Unknown" and role == "Unknown":
+        return None
+
+    return {
+        "company": company,
+        "role": role,
+        "location": loc,
+        "work_type": intern_work_type,
+        "salary": salary if salary is not None else "Unpaid",
+        "duration": duration or None,
+        "apply_url": apply_url,
+        "source": "internshala",
+        "skills": [s.lower() for s in skills],
+        "posted_at": None
+    }
+
+
+def _is_listing_class(value) -> bool:
+    """SoupStrainer sees the raw class string while the tree is being built."""
+    if not value:
+        return False
+    classes = value.split() if isinstance(value, str) else value
+    return "individual_internship" in classes
+
+
+_DEADLINE_RE = re.compile(r"(\d{1,2})\s*([A-Za-z]{3})[A-Za-z]*'?\s*(\d{2,4})")
+_MONTHS = {m: n for n, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1
+)}
+
+
+def parse_deadline(text: Optional[str]) -> Optional[str]:
+    """ISO date from Internshala's "Apply By" text ("3 Dec' 25" → "2025-12-03")."""
+    match = _DEADLINE_RE.search(text or "")
+    if not match:
+        return None
+    day, month, year = match.groups()
+    month = _MONTHS.get(month.lower())
+    if month is None:
+        return None
+    year = int(year) + (2000 if len(year) == 2 else 0)
+    try:
+        return datetime.date(year, month, int(day)).isoformat()
+    except ValueError:
+        return None
+
+
+def build_detail(description: Optional[str], skills: List[str], apply_by: Optional[str]) -> Dict:
+    """Detail-page fields, normalized the same way for every backend."""
+    return {
+        "description": description or None,
+        "skills": [s.lower() for s in skills if s],
+        "deadline": parse_deadline(apply_by),
+    }
+
+
+class SoupListingParser:
+    """BeautifulSoup backend.
+
+    Parses the full page, the way the scraper originally did. With
+    `strainer` on only the `div.individual_internship` subtrees are built;
+    it's off by default because on the saved pages the per-tag class check
+    costs about what the skipped chrome saves (0.8–1.0x the full parse,
+    see bench_listing_parser).
+    """
+
+    name = "soup"
+
+    def __init__(self, strainer: bool = False, features: str = "html.parser"):
+        self.features = features
+        self.parse_only = SoupStrainer("div", class_=_is_listing_class) if strainer else None
+
+    @staticmethod
+    def _text(listing, name: str, class_: str) -> Optional[str]:
+        elem = listing.find(name, class_=class_)
+        return elem.get_text(strip=True) if elem else None
+
+    @staticmethod
+    def _duration(listing) -> Optional[str]:
+        # The card's calendar-icon item, e.g. "3 Months"
+        icon = listing.find('i', class_='ic-16-calendar')
+        return icon.parent.get_text(strip=True) if icon else None
+
+    def parse(self, html: str) -> List[Dict]:
+        soup = BeautifulSoup(html, self.features, parse_only=self.parse_only)
+        listings = soup.find_all('div', class_='individual_internship')
+        logger.info(f"Found {len(listings)} listing containers")
+
+        internships = []
+        for listing in listings:
+            try:
+                link_elem = listing.find('a', class_='job-title-href')
+                item = build_listing(
+                    company=self._text(listing, 'p', 'company-name'),
+                    role=self._text(listing, 'h3', 'job-internship-name'),
+                    location=self._text(listing, 'div', 'locations'),
+                    status_tags=[t.get_text(strip=True) for t in listing.find_all(class_='status-success')],
+                    salary=self._text(listing, 'span', 'stipend'),
+                    skills=[s.get_text(strip=True) for s in listing.find_all('div', class_='job_skill')],
+                    href=link_elem.get('href') if link_elem else None,
+                    duration=self._duration(listing),
+                )
+                if item is not None:
+                    internships.append(item)
+            except Exception as e:
+                logger.warning(f"Error parsing listing: {e}")
+                continue
+        return internships
+
+    def parse_detail(self, html: str) -> Dict:
+        """Description, required skills and deadline from a posting's detail page."""
+        soup = BeautifulSoup(html, self.features)
+        details = soup.find('div', class_='internship_details')
+        description = None
+        skills = []
+        if details is not None:
+            text = details.find('div', class_='text-container')
+            description = text.get_text("\n", strip=True) if text else None
+            heading = details.find(class_='skills_heading')
+            tabs = heading.find_next_sibling('div', class_='round_tabs_container') if heading else None
+            if tabs is not None:
+                skills = [t.get_text(strip=True) for t in tabs.find_all('span', class_='round_tabs')]
+        apply_by = soup.find('div', class_='apply_by')
+        apply_by = apply_by.find('div', class_='item_body') if apply_by else None
+        return build_detail(description, skills, apply_by.get_text(strip=True) if apply_by else None)
+
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching one token of a space-separated class attribute."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+class LxmlListingParser:
+    """lxml backend: C parser plus compiled XPath queries per listing field.
+
+    Text is joined the way BeautifulSoup's get_text(strip=True) does it, so
+    the dicts are identical to SoupListingParser's.
+    """
+
+    name = "lxml"
+
+    def __init__(self):
+        from lxml import etree, html as lxml_html
+
+        self._html = lxml_html
+        # Parse UTF-8 bytes: str input with an XML encoding declaration is rejected
+        self._parser = lxml_html.HTMLParser(encoding="utf-8")
+        self._containers = etree.XPath(f"//div[{_has_class('individual_internship')}]")
+        self._company = etree.XPath(f".//p[{_has_class('company-name')}]")
+        self._role = etree.XPath(f".//h3[{_has_class('job-internship-name')}]")
+        self._location = etree.XPath(f".//div[{_has_class('locations')}]")
+        self._status = etree.XPath(f".//*[{_has_class('status-success')}]")
+        self._stipend = etree.XPath(f".//span[{_has_class('stipend')}]")
+        self._skills = etree.XPath(f".//div[{_has_class('job_skill')}]")
+        self._link = etree.XPath(f".//a[{_has_class('job-title-href')}]")
+        self._duration = etree.XPath(f".//i[{_has_class('ic-16-calendar')}]/..")
+
+        details = f"//div[{_has_class('internship_details')}]"
+        self._description = etree.XPath(f"({details}//div[{_has_class('text-container')}])[1]")
+        self._detail_skills = etree.XPath(
+            f"({details}//*[{_has_class('skills_heading')}])[1]"
+            f"/following-sibling::div[{_has_class('round_tabs_container')}][1]"
+            f"//span[{_has_class('round_tabs')}]"
+        )
+        self._apply_by = etree.XPath(f"//div[{_has_class('apply_by')}]//div[{_has_class('item_body')}]")
+
+    @staticmethod
+    def _text(elem) -> str:
+        return "".join(s.strip() for s in elem.itertext())
+
+    def _first_text(self, query, listing) -> Optional[str]:
+        found = query(listing)
+        return self._text(found[0]) if found else None
+
+    def parse(self, html: str) -> List[Dict]:
+        if not html.strip():
+            return []
+        root = self._html.document_fromstring(html.encode("utf-8"), parser=self._parser)
+        listings = self._containers(root)
+        logger.info(f"Found {len(listings)} listing containers")
+
+        internships = []
+        for listing in listings:
+            try:
+                links = self._link(listing)
+                item = build_listing(
+                    company=self._first_text(self._company, listing),
+                    role=self._first_text(self._role, listing),
+                    location=self._first_text(self._location, listing),
+                    status_tags=[self._text(t) for t in self._status(listing)],
+                    salary=self._first_text(self._stipend, listing),
+                    skills=[self._text(s) for s in self._skills(listing)],
+                    href=links[0].get('href') if links else None,
+                    duration=self._first_text(self._duration, listing),
+                )
+                if item is not None:
+                    internships.append(item)
+            except Exception as e:
+                logger.warning(f"Error parsing listing: {e}")
+                continue
+        return internships
+
+    def parse_detail(self, html: str) -> Dict:
+        """Description, required skills and deadline from a posting's detail page."""
+        if not html.strip():
+            return build_detail(None, [], None)
+        root = self._html.document_fromstring(html.encode("utf-8"), parser=self._parser)
+        found = self._description(root)
+        description = None
+        if found:
+            description = "\n".join(s.strip() for s in found[0].itertext() if s.strip())
+        return build_detail(
+            description,
+            [self._text(t) for t in self._detail_skills(root)],
+            self._first_text(self._apply_by, root),
+        )
+
+
+PARSERS = {
+    "soup": SoupListingParser,
+    "lxml": LxmlListingParser,
+}
+
+
+def get_parser(name: str = SCRAPE_PARSER):
+    """Parser instance for a backend name, falling back to soup if lxml is missing."""
+    try:
+        return PARSERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown listing parser '{name}' (choose from {sorted(PARSERS)})")
+    except ImportError:
+        logger.warning("lxml is not installed; using the soup listing parser instead")
+        return SoupListingParser()
+
+
+listing_parser = get_parser()
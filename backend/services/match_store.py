@@ -0,0 +1,108 @@
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+
+import supabase_client
+from services.internship_index import internship_index
+from services.matcher import SkillMatrix
+
+logger = logging.getLogger("match_store")
+
+# Postings whose scores are replaced per round trip after a scrape
+POSTINGS_PER_REPLACE = 50
+
+
+def _db():
+    # Use admin client to bypass RLS, fall back to regular client
+    return supabase_client.supabase_admin or supabase_client.supabase
+
+
+class MatchStore:
+    """Materialized (user_id, internship_id, score, matched_skills) table.
+
+    Only skill-based matches are stored (base score, no preference
+    boosts): a missing pair scores a neutral 40 if the posting lists no
+    skills (see `Matcher.calculate_match`) and 0 otherwise. The table is
+    kept current incrementally: new postings are scored against every
+    user after a scrape, and a user is rescored across the catalog when
+    their resume or skills change. Both replace the affected rows in one
+    `replace_match_scores` call, so readers never see a half-written set
+    and pairs that no longer match go.
+    """
+
+    @staticmethod
+    def latest_resume_skills() -> Dict[str, List[str]]:
+        """{user_id: skills} from each user's most recent resume."""
+        resumes = supabase_client.fetch_all("resumes", "user_id, skills, created_at", order="created_at", desc=True)
+        latest: Dict[str, List[str]] = {}
+        for resume in resumes:
+            # Rows arrive newest first — keep the latest resume only
+            latest.setdefault(resume["user_id"], resume.get("skills") or [])
+        return latest
+
+    @staticmethod
+    def _rows_for(user_id: str, matrix: SkillMatrix, skills: List[str]) -> List[Dict]:
+        scores, hits, hit_skills = matrix.match(skills)
+        rows = []
+        # Skip the neutral score of postings with no known skills
+        for n in np.flatnonzero((scores > 0) & hits.any(axis=1)):
+            rows.append({
+                "user_id": user_id,
+                "internship_id": matrix.ids[n],
+                "score": int(scores[n]),
+                "matched_skills": [hit_skills[j] for j in np.flatnonzero(hits[n])],
+            })
+        return rows
+
+    @staticmethod
+    def _replace(rows: List[Dict], user_id: Optional[str] = None, internship_ids: Optional[List[str]] = None):
+        """Swap the stored scores of `user_id` or of `internship_ids` for `rows`, atomically."""
+        _db().rpc("replace_match_scores", {
+            "p_rows": rows, "p_user_id": user_id, "p_internship_ids": internship_ids,
+        }).execute()
+
+    @staticmethod
+    def rescore_user(user_id: str, skills: List[str]):
+        """Recompute one user's scores against the whole catalog.
+
+        Runs as a background task, so failures (e.g. the migration not run
+        yet) are logged rather than raised.
+        """
+        try:
+            internship_index.ensure_loaded()
+            rows = MatchStore._rows_for(user_id, internship_index.matrix(), skills or [])
+            MatchStore._replace(rows, user_id=user_id)
+        except Exception as e:
+            logger.warning(f"Could not rescore user {user_id}: {e}")
+            return
+        logger.info(f"Rescored user {user_id}: {len(rows)} matching internships")
+
+    @staticmethod
+    def score_new_postings(internships: List[Dict], users: Optional[Dict[str, List[str]]] = None):
+        """Score freshly ingested or changed postings against every user's latest resume.
+
+        `users` is latest_resume_skills(), for callers scoring several
+        batches in a row; loaded here if not given.
+        """
+        internships = [i for i in internships if i.get("id") is not None]
+        if not internships:
+            return
+        if users is None:
+            users = MatchStore.latest_resume_skills()
+        matches = 0
+        for start in range(0, len(internships), POSTINGS_PER_REPLACE):
+            chunk = internships[start:start + POSTINGS_PER_REPLACE]
+            matrix = SkillMatrix(chunk)
+            rows = []
+            for user_id, skills in users.items():
+                rows.extend(MatchStore._rows_for(user_id, matrix, skills))
+            MatchStore._replace(rows, internship_ids=[str(i["id"]) for i in chunk])
+            matches += len(rows)
+        logger.info(f"Scored {len(internships)} new internships for {len(users)} users ({matches} matches)")
+
+    @staticmethod
+    def overview(user_id: str) -> Dict:
+        """Match overview for the dashboard, aggregated in the database."""
+        resp = _db().rpc("match_overview", {"p_user_id": user_id}).execute()
+        return resp.data or {}
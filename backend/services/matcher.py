@@ -1,4 +1,7 @@
-from typing import List, Dict
+from typing import List, Dict, Optional, Sequence, Tuple
+import numpy as np
+
+from services.internship_features import InternshipFeatures
 
 class Matcher:
     @staticmethod
@@ -30,3 +33,104 @@ class Matcher:
             
         score = (match_count / total_needed) * 100
         return int(min(score, 100))
+
+
+class SkillMatrix:
+    """A catalog of internships encoded for batch scoring.
+
+    Each posting's explicit skills become a row of a boolean postings × skills
+    matrix. Text-fallback hits (skill appears in description/role/company) are
+    computed once per skill and cached as a boolean column, so scoring a resume
+    against the whole catalog is a handful of array ops. Scores are identical
+    to `Matcher.calculate_match`.
+    """
+
+    def __init__(self, internships: Sequence[Dict]):
+        self.size = len(internships)
+        self.ids = [str(i.get("id")) for i in internships]
+        self.row = {iid: n for n, iid in enumerate(self.ids)}
+        self._texts = [
+            i.get("search_text") if i.get("search_text") is not None else InternshipFeatures.search_text(i)
+            for i in internships
+        ]
+
+        skill_sets = [set(k.lower() for k in (i.get("skills") or [])) for i in internships]
+        self._columns: Dict[str, int] = {}
+        for skills in skill_sets:
+            for skill in skills:
+                self._columns.setdefault(skill, len(self._columns))
+
+        self._explicit = np.zeros((self.size, len(self._columns)), dtype=bool)
+        for row, skills in enumerate(skill_sets):
+            for skill in skills:
+                self._explicit[row, self._columns[skill]] = True
+        self._explicit_count = self._explicit.sum(axis=1)
+
+        self._mentions: Dict[str, np.ndarray] = {}
+        self._no_skill = np.zeros(self.size, dtype=bool)
+
+    def _mention_column(self, skill: str) -> np.ndarray:
+        col = self._mentions.get(skill)
+        if col is None:
+            col = np.fromiter((skill in t for t in self._texts), dtype=bool, count=self.size)
+            self._mentions[skill] = col
+        return col
+
+    def _skill_columns(self, skills: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """(explicit, mentioned) boolean matrices of shape postings × len(skills)."""
+        if not skills:
+            empty = np.zeros((self.size, 0), dtype=bool)
+            return empty, empty
+        explicit = np.column_stack([
+            self._explicit[:, self._columns[s]] if s in self._columns else self._no_skill
+            for s in skills
+        ])
+        mentioned = np.column_stack([self._mention_column(s) for s in skills])
+        return explicit, mentioned
+
+    @staticmethod
+    def _to_scores(matched: np.ndarray, needed: np.ndarray) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.minimum((matched / needed) * 100, 100)
+        # No known requirements at all → neutral 40, as in calculate_match
+        return np.where(needed == 0, 40, np.nan_to_num(scores)).astype(int)
+
+    def match(
+        self,
+        resume_skills: List[str],
+        rows: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """Score one resume against every posting (or just `rows`).
+
+        Returns (scores, hits, skills): `hits[i, j]` is True when resume skill
+        `skills[j]` counts as matched for posting i.
+        """
+        skills = sorted(set(k.lower() for k in resume_skills))
+        explicit, mentioned = self._skill_columns(skills)
+        explicit_count = self._explicit_count
+        if rows is not None:
+            explicit, mentioned, explicit_count = explicit[rows], mentioned[rows], explicit_count[rows]
+
+        hits = explicit | mentioned
+        needed = explicit_count + (mentioned & ~explicit).sum(axis=1)
+        return self._to_scores(hits.sum(axis=1), needed), hits, skills
+
+    def score(self, resume_skills: List[str], rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Match scores (0-100) of one resume against every posting (or `rows`)."""
+        return self.match(resume_skills, rows)[0]
+
+    def score_many(self, resumes: Sequence[List[str]]) -> np.ndarray:
+        """Score many resumes at once; returns a postings × resumes int matrix."""
+        resume_sets = [set(k.lower() for k in r) for r in resumes]
+        skills = sorted(set().union(*resume_sets)) if resume_sets else []
+        explicit, mentioned = self._skill_columns(skills)
+
+        owned = np.zeros((len(skills), len(resume_sets)), dtype=np.int32)
+        position = {s: i for i, s in enumerate(skills)}
+        for col, r in enumerate(resume_sets):
+            for skill in r:
+                owned[position[skill], col] = 1
+
+        matched = (explicit | mentioned).astype(np.int32) @ owned
+        needed = self._explicit_count[:, None] + (mentioned & ~explicit).astype(np.int32) @ owned
+        return self._to_scores(matched, needed)
@@ -0,0 +1,82 @@
+import base64
+import json
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+
+# Response header carrying the cursor for the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(position: Dict) -> str:
+    """Opaque, URL-safe cursor for a position in an ordered result set."""
+    raw = json.dumps(position, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Dict]:
+    """Inverse of `encode_cursor`; raises a 400 for anything malformed."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(position, dict):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return position
+
+
+# Page size of every paginated list endpoint, and the most a client may ask for
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+
+def cursor_position(cursor: Optional[str], sort: str) -> Optional[Dict]:
+    """Decoded `seek` position, checked against the endpoint's sort order."""
+    position = decode_cursor(cursor)
+    if position is None:
+        return None
+    key, row_id = position.get("key"), position.get("id")
+    if (
+        position.get("sort") != sort
+        or not isinstance(row_id, str)
+        or not (key is None or isinstance(key, (str, int, float)))
+    ):
+        raise HTTPException(status_code=400, detail="Cursor does not match this sort order")
+    return position
+
+
+def _quoted(value) -> str:
+    """PostgREST filter value, quoted so timestamps (':', '+', '.') parse."""
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def seek(query, column: str, position: Optional[Dict], limit: int):
+    """Keyset page of `query`, ordered by (column desc nulls last, id desc).
+
+    Each page starts right after the previous page's last row instead of at
+    an OFFSET, so it costs the same however deep the client has paged.
+    """
+    query = query.order(column, desc=True, nullsfirst=False).order("id", desc=True)
+    if position is not None:
+        key, row_id = position["key"], position["id"]
+        if key is None:
+            # Already in the trailing NULLs: only the id decides
+            query = query.is_(column, "null").lt("id", row_id)
+        else:
+            query = query.or_(
+                f"{column}.lt.{_quoted(key)},"
+                f"and({column}.eq.{_quoted(key)},id.lt.{_quoted(row_id)}),"
+                f"{column}.is.null"
+            )
+    return query.limit(limit)
+
+
+def next_cursor(rows: List[Dict], column: str, sort: str, limit: int) -> Optional[str]:
+    """Cursor for the page after `rows`, or None if this was the last one."""
+    if len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor({"sort": sort, "key": last.get(column), "id": str(last["id"])})
@@ -0,0 +1,36 @@
+from typing import Dict, List, Optional, Type
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+# Always returned, whatever `fields=` asks for (list keys, cursors)
+ALWAYS_INCLUDED = ("id",)
+
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel]) -> List[str]:
+    """Fields of `model` a list endpoint should return.
+
+    `fields` is the comma-separated `fields=` query parameter; without it
+    every field of the response model is returned. Unknown names are a 400.
+    """
+    available = list(model.model_fields)
+    if not fields:
+        return available
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in model.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(available)}",
+        )
+    return list(dict.fromkeys([*ALWAYS_INCLUDED, *requested]))
+
+
+def columns(fields: List[str], *extra: str) -> str:
+    """PostgREST select list for the given fields, plus any `extra` columns."""
+    return ", ".join(dict.fromkeys([*fields, *extra]))
+
+
+def project(row: Dict, fields: List[str]) -> Dict:
+    """Only the given fields of an in-memory row (e.g. from the catalog index)."""
+    return {name: row[name] for name in fields if name in row}
@@ -0,0 +1,70 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from config import RECOMMENDATION_CACHE_SIZE, RECOMMENDATION_CACHE_TTL_SECONDS
+
+# (match_score, internship_id, matched_skills), ordered by (score, id) descending
+RankedList = List[Tuple[int, str, List[str]]]
+
+
+class RecommendationCache:
+    """Bounded LRU + TTL cache of each user's pre-ranked recommendations.
+
+    Entries are stamped with the catalog index version they were ranked
+    against, so a scrape that adds postings makes them stale automatically.
+    Resume uploads, skill edits and preference changes call `invalidate`,
+    which also bumps the user's generation: a ranking computed from inputs
+    read before the invalidation is refused by `put`.
+    """
+
+    def __init__(self, max_entries: int = RECOMMENDATION_CACHE_SIZE, ttl: float = RECOMMENDATION_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, int, RankedList]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str, catalog_version: int) -> Optional[RankedList]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            stored_at, version, ranked = entry
+            if version != catalog_version or time.time() - stored_at > self.ttl:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return ranked
+
+    def generation(self, user_id: str) -> int:
+        """Current invalidation count for a user; read it before loading their resume."""
+        with self._lock:
+            return self._generations.get(user_id, 0)
+
+    def put(self, user_id: str, catalog_version: int, ranked: RankedList, generation: int):
+        with self._lock:
+            if self._generations.get(user_id, 0) != generation:
+                # Invalidated while this ranking was being computed
+                return
+            self._entries[user_id] = (time.time(), catalog_version, ranked)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str):
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared, process-wide cache
+recommendation_cache = RecommendationCache()
@@ -0,0 +1,63 @@
+from typing import List
+import numpy as np
+
+from services.internship_index import InternshipIndex, internship_index
+from services.recommendation_cache import RankedList
+
+
+class Recommender:
+    @staticmethod
+    def rank(
+        resume_skills: List[str],
+        preferred_type: str = "",
+        preferred_work_mode: str = "",
+        index: InternshipIndex = None,
+    ) -> RankedList:
+        """Score every candidate posting for a resume, best match first.
+
+        Candidates are the postings that share at least one skill with the
+        resume (the whole catalog if the resume has no skills). Scores include
+        the preference boosts: +15 when the posting text mentions the
+        preferred internship type, +5 when the work type matches.
+
+        `index` defaults to the shared catalog index.
+        """
+        if index is None:
+            index = internship_index
+        index.ensure_loaded()
+        matrix = index.matrix()
+        if resume_skills:
+            candidate_ids = [i for i in index.candidates(resume_skills) if i in matrix.row]
+        else:
+            candidate_ids = list(matrix.ids)
+
+        if not candidate_ids:
+            return []
+
+        rows = np.array([matrix.row[i] for i in candidate_ids], dtype=int)
+        base_scores, hits, hit_skills = matrix.match(resume_skills, rows)
+
+        preferred_type = (preferred_type or "").lower()
+        preferred_work_mode = (preferred_work_mode or "").lower()
+
+        ranked = []
+        for n, iid in enumerate(candidate_ids):
+            internship = index.get(iid)
+            if internship is None:
+                continue
+            score = int(base_scores[n])
+
+            # Preference boost: +15 if the posting mentions the preferred type
+            if preferred_type and preferred_type in internship["search_text"]:
+                score = min(score + 15, 100)
+
+            # Work mode boost: +5 if matches preferred work mode
+            work_type_lower = (internship.get("work_type") or "").lower()
+            if preferred_work_mode and preferred_work_mode in work_type_lower:
+                score = min(score + 5, 100)
+
+            ranked.append((score, iid, [hit_skills[j] for j in np.flatnonzero(hits[n])]))
+
+        # Best match first; id breaks ties so cursors see a stable order
+        ranked.sort(key=lambda m: (m[0], m[1]), reverse=True)
+        return ranked
@@ -1,6 +1,7 @@
 import io
 import PyPDF2
 from docx import Document
+from services.skill_extractor import skill_extractor
 
 class ResumeParser:
     @staticmethod
@@ -29,20 +30,5 @@ class ResumeParser:
 
     @staticmethod
     def extract_skills(text: str) -> list[str]:
-        # Simple keyword matching for now
-        # In a real app, this would use a more sophisticated NLP approach or a large skill database
-        common_skills = [
-            "python", "java", "javascript", "react", "node.js", "sql", "aws", "docker", 
-            "machine learning", "data analysis", "communication", "leadership", "html", "css",
-            "git", "linux", "agile", "scrum", "c++", "c#", "typescript", "go", "ruby", "php"
-        ]
-        
-        found_skills = []
-        text_lower = text.lower()
-        for skill in common_skills:
-            # Check for word boundary logic if possible, but basic substring acceptable for MVP
-            if skill in text_lower:
-                found_skills.append(skill)
-        
-        # Remove duplicates
-        return list(set(found_skills))
+        # Single pass over the text with the shared skill automaton
+        return skill_extractor.find(text)
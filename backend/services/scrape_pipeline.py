@@ -0,0 +1,376 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from config import (
+    SCRAPE_QUEUE_SIZE, SCRAPE_PARSE_WORKERS, SCRAPE_DETAILS_ENABLED, SCRAPE_DETAIL_RATE,
+    SCRAPE_DETAIL_RETRY_LIMIT,
+)
+from services.detail_enricher import DetailEnricher
+from services.internship_features import InternshipFeatures
+from services.internship_index import internship_index
+from services.internship_writer import InternshipWriter
+from services.match_store import MatchStore
+from services.scraper import InternshalaScraper, ScrapeSession
+
+logger = logging.getLogger("scrape_pipeline")
+logger.setLevel(logging.DEBUG)
+
+if not logger.handlers:
+    ch = logging.StreamHandler()
+    ch.setLevel(logging.DEBUG)
+    ch.setFormatter(logging.Formatter("%(asctime)s [%(name)s] %(levelname)s: %(message)s"))
+    logger.addHandler(ch)
+
+# End-of-stream marker passed down the queues
+_DONE = object()
+
+Variant = Tuple[str, Optional[str], Optional[str]]
+
+
+def _timed(fn, *args):
+    """Run fn(*args) on a worker thread; returns (result, seconds it took there)."""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+class StageMetrics:
+    """Counters for one pipeline stage.
+
+    busy:    seconds spent doing the stage's own work, summed over its workers
+    blocked: seconds spent waiting on a full downstream queue (backpressure)
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items_in = 0
+        self.items_out = 0
+        self.errors = 0
+        self.busy = 0.0
+        self.blocked = 0.0
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    def start(self):
+        if self.started is None:
+            self.started = time.perf_counter()
+
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    def as_dict(self) -> Dict:
+        if self.started is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self.finished or time.perf_counter()) - self.started
+        return {
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy, 3),
+            "blocked_seconds": round(self.blocked, 3),
+            "elapsed_seconds": round(elapsed, 3),
+            "per_second": round(self.items_out / elapsed, 1) if elapsed > 0 else None,
+        }
+
+
+class ScrapePipeline:
+    """Streaming fetch → parse → enrich → write → details pipeline for one scrape run.
+
+    - fetch:   one coroutine per variant pulls listing pages off the
+               session as they arrive
+    - parse:   HTML → listing dicts in a thread pool
+    - enrich:  skill extraction and stipend parsing, same thread pool
+    - write:   InternshipWriter batches, flushed on a dedicated thread
+    - details: detail pages of the postings just inserted or changed,
+               plus up to `detail_retries` unchanged ones whose details
+               are missing or old (DetailEnricher), written back in
+               batches; skipped when `details` is off
+
+    `on_saved(rows)` is called for every batch the write and details
+    stages save (and for re-listed postings), so callers can publish
+    postings as they land instead of after the slow detail fetches.
+
+    Stages are joined by bounded queues, so a slow stage holds back the
+    ones before it instead of buffering the whole run in memory. Only
+    fetching runs on the event loop. Each listing is tagged with the
+    listing URL it came from (`scraped_from`):
+
+        async with ScrapeSession() as session:
+            pipeline = ScrapePipeline(session)
+            rows = await pipeline.run(variants)    # inserted + updated rows
+            pipeline.metrics                         # per-stage counters
+            pipeline.covered                         # listing URLs fetched in full
+            pipeline.failed                          # variants with no page fetched
+    """
+
+    def __init__(
+        self,
+        session: ScrapeSession,
+        writer: Optional[InternshipWriter] = None,
+        queue_size: int = SCRAPE_QUEUE_SIZE,
+        workers: int = SCRAPE_PARSE_WORKERS,
+        details: bool = SCRAPE_DETAILS_ENABLED,
+        detail_rate: float = SCRAPE_DETAIL_RATE,
+        detail_retries: int = SCRAPE_DETAIL_RETRY_LIMIT,
+        on_saved: Optional[Callable[[List[Dict]], Awaitable[None]]] = None,
+    ):
+        self.session = session
+        self.writer = writer or InternshipWriter()
+        self.queue_size = queue_size
+        self.workers = workers
+        self.details = details
+        self.detail_rate = detail_rate
+        self.detail_retries = detail_retries
+        # apply_urls of unchanged postings sent to the details stage
+        self._retrying: Set[str] = set()
+        self.on_saved = on_saved
+        self._publishing: List[asyncio.Task] = []
+        self.stages = {
+            name: StageMetrics(name) for name in ("fetch", "parse", "enrich", "write", "details")
+        }
+        self.saved_rows: List[Dict] = []
+        # Listing URLs whose every page was fetched (not cut off at max_pages)
+        self.covered: Set[str] = set()
+        # Variants not a single page could be fetched for
+        self.failed: List[Variant] = []
+
+    @property
+    def metrics(self) -> Dict[str, Dict]:
+        return {name: stage.as_dict() for name, stage in self.stages.items()}
+
+    async def _put(self, stage: StageMetrics, queue: asyncio.Queue, item):
+        start = time.perf_counter()
+        await queue.put(item)
+        stage.blocked += time.perf_counter() - start
+
+    def _publish(self, rows: List[Dict]):
+        if self.on_saved is not None and rows:
+            self._publishing.append(asyncio.create_task(self.on_saved(rows)))
+
+    # ── Stages ──
+
+    async def _fetch(self, variant: Variant, out: asyncio.Queue):
+        stage = self.stages["fetch"]
+        stage.start()
+        stage.items_in += 1
+        source = InternshalaScraper.build_url(*variant)
+        total, fetched = None, 0
+        try:
+            start = time.perf_counter()
+            async for number, page in self.session.iter_pages(*variant):
+                stage.busy += time.perf_counter() - start
+                stage.items_out += 1
+                fetched += 1
+                if number == 1:
+                    total = InternshalaScraper.page_count(page.text)
+                await self._put(stage, out, (source, page))
+                start = time.perf_counter()
+        except Exception as e:
+            logger.error(f"Error fetching {variant}: {e}")
+            fetched = 0
+        if not fetched:
+            stage.errors += 1
+            self.failed.append(variant)
+            return
+        if total is not None and fetched == total:
+            self.covered.add(source)
+
+    async def _parse(self, pool: ThreadPoolExecutor, inbox: asyncio.Queue, out: asyncio.Queue):
+        stage = self.stages["parse"]
+        loop = asyncio.get_running_loop()
+        while (fetched := await inbox.get()) is not _DONE:
+            source, page = fetched
+            stage.start()
+            stage.items_in += 1
+            try:
+                listings, took = await loop.run_in_executor(pool, _timed, self.session.parse, page)
+            except Exception as e:
+                stage.errors += 1
+                logger.warning(f"Error parsing {page.url}: {e}")
+                continue
+            stage.busy += took
+            for item in listings:
+                item["scraped_from"] = source
+            stage.items_out += len(listings)
+            await self._put(stage, out, listings)
+
+    @staticmethod
+    def _enrich_batch(listings: List[Dict]) -> List[Dict]:
+        for item in listings:
+            item.update(InternshipFeatures.compute(item))
+        return listings
+
+    async def _enrich(self, pool: ThreadPoolExecutor, inbox: asyncio.Queue, out: asyncio.Queue):
+        stage = self.stages["enrich"]
+        loop = asyncio.get_running_loop()
+        while (listings := await inbox.get()) is not _DONE:
+            stage.start()
+            stage.items_in += len(listings)
+            try:
+                listings, took = await loop.run_in_executor(pool, _timed, self._enrich_batch, listings)
+            except Exception as e:
+                stage.errors += 1
+                logger.warning(f"Error enriching {len(listings)} listings: {e}")
+                continue
+            stage.busy += took
+            stage.items_out += len(listings)
+            await self._put(stage, out, listings)
+
+    async def _write(self, db_thread: ThreadPoolExecutor, inbox: asyncio.Queue, out: Optional[asyncio.Queue]):
+        stage = self.stages["write"]
+        loop = asyncio.get_running_loop()
+
+        async def flush():
+            revived, due = len(self.writer.revived), len(self.writer.details_due)
+            rows, took = await loop.run_in_executor(db_thread, _timed, self.writer.flush)
+            stage.busy += took
+            stage.items_out += len(rows)
+            self._publish(rows + self.writer.revived[revived:])
+            if out is None:
+                self.saved_rows.extend(rows)
+                return
+            retry = self.writer.details_due[due:due + self.detail_retries - len(self._retrying)]
+            self._retrying.update(row["apply_url"] for row in retry)
+            if rows or retry:
+                await self._put(stage, out, rows + retry)
+
+        while (listings := await inbox.get()) is not _DONE:
+            stage.start()
+            stage.items_in += len(listings)
+            self.writer.add(listings)
+            if self.writer.pending >= self.writer.batch_size:
+                await flush()
+        if self.writer.pending:
+            await flush()
+
+    async def _details(self, enricher: DetailEnricher, db_thread: ThreadPoolExecutor, inbox: asyncio.Queue):
+        stage = self.stages["details"]
+        loop = asyncio.get_running_loop()
+        while (rows := await inbox.get()) is not _DONE:
+            stage.start()
+            stage.items_in += len(rows)
+            start = time.perf_counter()
+            enriched = await enricher.enrich(rows)
+            stage.busy += time.perf_counter() - start
+
+            saved = {}
+            if enriched:
+                detailed, took = await loop.run_in_executor(db_thread, _timed, self.writer.save_details, enriched)
+                stage.busy += took
+                saved = {row["apply_url"]: row for row in detailed}
+                self._publish(detailed)
+            stage.items_out += len(saved)
+            stage.errors = enricher.stats["failed"]
+            # Postings whose detail page failed keep their listing-card data;
+            # unchanged ones only count if their details were saved
+            self.saved_rows.extend(
+                saved.get(row["apply_url"], row) for row in rows
+                if row["apply_url"] in saved or row["apply_url"] not in self._retrying
+            )
+
+    # ── Orchestration ──
+
+    async def run(self, variants: List[Variant]) -> List[Dict]:
+        """Scrape and save every variant; returns the inserted and updated rows."""
+        pages: asyncio.Queue = asyncio.Queue(self.queue_size)
+        parsed: asyncio.Queue = asyncio.Queue(self.queue_size)
+        enriched: asyncio.Queue = asyncio.Queue(self.queue_size)
+        written: Optional[asyncio.Queue] = asyncio.Queue(self.queue_size) if self.details else None
+
+        # One DB thread keeps writes ordered and off the event loop. Both pools
+        # are shut down from a worker thread: leaving a `with` block would
+        # wait for their threads on the event loop
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scrape-parse")
+        db_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scrape-write")
+        fetchers = [asyncio.create_task(self._fetch(v, pages)) for v in variants]
+        parsers = [asyncio.create_task(self._parse(pool, pages, parsed)) for _ in range(self.workers)]
+        enrichers = [asyncio.create_task(self._enrich(pool, parsed, enriched)) for _ in range(self.workers)]
+        writers = [asyncio.create_task(self._write(db_thread, enriched, written))]
+        details = []
+        if self.details:
+            enricher = DetailEnricher(self.session, pool, rate=self.detail_rate)
+            details.append(asyncio.create_task(self._details(enricher, db_thread, written)))
+        tasks = fetchers + parsers + enrichers + writers + details
+
+        try:
+            # Close each stage once everything upstream of it has finished
+            for name, upstream, queue, consumers in (
+                ("fetch", fetchers, pages, len(parsers)),
+                ("parse", parsers, parsed, len(enrichers)),
+                ("enrich", enrichers, enriched, len(writers)),
+                ("write", writers, written, len(details)),
+            ):
+                await asyncio.gather(*upstream)
+                self.stages[name].finish()
+                for _ in range(consumers):
+                    await queue.put(_DONE)
+            await asyncio.gather(*details)
+            self.stages["details"].finish()
+            await asyncio.gather(*self._publishing)
+        except BaseException:
+            for task in tasks + self._publishing:
+                task.cancel()
+            raise
+        finally:
+            for executor in (pool, db_thread):
+                await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+        logger.info(f"Pipeline metrics: {self.metrics}")
+        return self.saved_rows
+
+
+async def scrape_and_save(
+    variants: List[Variant],
+    details: bool = SCRAPE_DETAILS_ENABLED,
+    detail_rate: float = SCRAPE_DETAIL_RATE,
+    **session_options,
+) -> Dict:
+    """Scrape (category, work_type, location) variants from Internshala and save to DB.
+
+    Streams every variant through the pipeline. New, changed and re-listed
+    postings are added to the index and scored as each batch is written,
+    and again once their detail pages are in; afterwards postings that
+    dropped off the site are retired. Returns the writer stats, the
+    variants no page could be fetched for and stage metrics.
+    `details` / `detail_rate` control detail-page enrichment;
+    `session_options` go to ScrapeSession (e.g. a replay transport).
+    """
+    logger.info(f"Scraping {len(variants)} variants concurrently")
+    users: Optional[Dict[str, List[str]]] = None
+    # A batch's detail-page scores must not be overwritten by its earlier card-only ones
+    scoring = asyncio.Lock()
+
+    async def publish(rows: List[Dict]):
+        nonlocal users
+        # Make the postings visible to recommendations right away
+        internship_index.add(rows)
+        # Score only those postings against existing users
+        async with scoring:
+            try:
+                if users is None:
+                    users = await asyncio.to_thread(MatchStore.latest_resume_skills)
+                await asyncio.to_thread(MatchStore.score_new_postings, rows, users)
+            except Exception as e:
+                logger.warning(f"Could not update match scores for {len(rows)} new internships: {e}")
+
+    async with ScrapeSession(**session_options) as session:
+        pipeline = ScrapePipeline(session, details=details, detail_rate=detail_rate, on_saved=publish)
+        await pipeline.run(variants)
+
+    # Retire postings that have dropped off the listings this run fetched in full
+    expired = 0
+    try:
+        expired_ids = await asyncio.to_thread(InternshipWriter.archive_stale, pipeline.covered)
+        internship_index.remove(expired_ids)
+        expired = len(expired_ids)
+    except Exception as e:
+        logger.warning(f"Could not archive stale internships: {e}")
+
+    stats = dict(pipeline.writer.stats, revived=len(pipeline.writer.revived), expired=expired)
+    logger.info(f"✅ Scraping complete! {stats['inserted']} new, {stats['updated']} updated, "
+                f"{stats['unchanged']} unchanged internships ({stats['duplicates']} duplicates skipped)")
+    return {**stats, "failed_variants": pipeline.failed, "stages": pipeline.metrics}
@@ -0,0 +1,88 @@
+import asyncio
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+_LISTING_PREFIX = "/internships/"
+
+
+def fixture_name(url) -> str:
+    """File a listing URL is recorded under.
+
+    https://internshala.com/internships/python-internships/page-2
+        → python-internships__page-2.html
+    """
+    path = httpx.URL(str(url)).path
+    if path.startswith(_LISTING_PREFIX):
+        path = path[len(_LISTING_PREFIX):]
+    return path.strip("/").replace("/", "__") + ".html"
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Serves recorded listing pages from a directory instead of the network.
+
+    Pages missing from the directory get a 404, like a listing page that
+    doesn't exist. `latency` adds a fixed delay per request to mimic a
+    real round trip. Plug it into a session with
+    `ScrapeSession(transport=ReplayTransport(directory))`, or set
+    SCRAPE_REPLAY_DIR to use it for every scrape.
+    """
+
+    def __init__(self, directory: str, latency: float = 0.0):
+        self.directory = Path(directory)
+        self.latency = latency
+        self.requests = 0
+        self.misses = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        path = self.directory / fixture_name(request.url)
+        try:
+            body = path.read_bytes()
+        except OSError:
+            self.misses += 1
+            return httpx.Response(404, request=request)
+        return httpx.Response(
+            200,
+            content=body,
+            headers={"content-type": "text/html; charset=utf-8"},
+            request=request,
+        )
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Passes requests through to the network and saves every 200 page.
+
+    Set SCRAPE_RECORD_DIR for one real scrape to capture fixtures that
+    ReplayTransport (and the benchmarks) can serve later.
+    """
+
+    def __init__(self, directory: str, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.transport = transport or httpx.AsyncHTTPTransport(http2=True)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.transport.handle_async_request(request)
+        if response.status_code != 200:
+            return response
+        body = await response.aread()
+        (self.directory / fixture_name(request.url)).write_bytes(body)
+        # Hand back a response with the already-read (and decoded) body
+        headers = [
+            (name, value) for name, value in response.headers.items()
+            if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=body,
+            request=request,
+            extensions=response.extensions,
+        )
+
+    async def aclose(self):
+        await self.transport.aclose()
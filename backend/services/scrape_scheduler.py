@@ -0,0 +1,372 @@
+import asyncio
+import datetime
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import (
+    SCRAPE_JOBS_DB, SCRAPE_FRESHNESS_SECONDS, SCRAPE_REFRESH_INTERVAL_SECONDS, SCRAPE_JOB_LEASE_SECONDS,
+)
+from services.scrape_pipeline import Variant, scrape_and_save
+
+logger = logging.getLogger("scrape_scheduler")
+logger.setLevel(logging.DEBUG)
+
+if not logger.handlers:
+    ch = logging.StreamHandler()
+    ch.setLevel(logging.DEBUG)
+    ch.setFormatter(logging.Formatter("%(asctime)s [%(name)s] %(levelname)s: %(message)s"))
+    logger.addHandler(ch)
+
+# Scraped on boot and by the periodic refresh, and when a request names no categories
+DEFAULT_CATEGORIES = [
+    "web development",
+    "python",
+    "machine learning",
+    "data science",
+    "frontend development",
+    "backend development",
+    "mobile app development",
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    status TEXT NOT NULL,              -- queued | running | done | failed
+    variants TEXT NOT NULL,            -- JSON [[category, work_type, location], ...]
+    stats TEXT,                        -- JSON, set when the job finishes
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    heartbeat_at REAL,                 -- refreshed by the worker running it
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at);
+
+-- One row per (category, work_type, location): who covers it and when it last ran
+CREATE TABLE IF NOT EXISTS variants (
+    key TEXT PRIMARY KEY,
+    job_id TEXT NOT NULL,              -- latest job that scraped or is scraping it
+    scraped_at REAL                    -- when that job finished successfully
+);
+"""
+
+
+def _variant(category: str, work_type: Optional[str] = None, location: Optional[str] = None) -> Variant:
+    """Normalized variant, so "Python" and " python" coalesce."""
+    work_type = (work_type or "").strip().lower() or None
+    location = (location or "").strip().lower() or None
+    return ((category or "").strip().lower(), work_type, location)
+
+
+def _key(variant: Variant) -> str:
+    return json.dumps(variant)
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).isoformat()
+
+
+class ScrapeScheduler:
+    """Durable scrape job queue backed by SQLite.
+
+    Jobs survive restarts. A running job holds a lease its worker renews
+    every `lease / 3` seconds; once `lease` seconds pass without a
+    heartbeat (the worker crashed or was killed) the job is queued again,
+    so workers sharing the database never take over live jobs. A job no
+    variant could be fetched for fails, and variants that fetched nothing
+    are not marked fresh. A submitted variant is dropped if it was
+    scraped within `freshness` seconds or is already queued/running in
+    another job; when every variant is covered, that job's id is returned
+    instead of a new one. One worker runs jobs in order (each job is
+    already concurrent internally), and a refresh of DEFAULT_CATEGORIES is
+    submitted every `refresh_interval` seconds. SQLite calls run on a
+    worker thread, off the event loop:
+
+        job_id, coalesced = await scrape_scheduler.submit(["python"], source="api")
+        await scrape_scheduler.get(job_id)      # status, variants, stats
+    """
+
+    def __init__(
+        self,
+        path: str = SCRAPE_JOBS_DB,
+        freshness: float = SCRAPE_FRESHNESS_SECONDS,
+        refresh_interval: float = SCRAPE_REFRESH_INTERVAL_SECONDS,
+        lease: float = SCRAPE_JOB_LEASE_SECONDS,
+    ):
+        self.path = path
+        self.freshness = freshness
+        self.refresh_interval = refresh_interval
+        self.lease = lease
+        self._lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self):
+        """Connection that commits on success and is always closed."""
+        if not self._initialized:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            if not self._initialized:
+                conn.executescript(_SCHEMA)
+                # Databases created before job leases
+                columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+                if "heartbeat_at" not in columns:
+                    conn.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at REAL")
+                self._initialized = True
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ── Submitting ──
+
+    async def submit(
+        self,
+        categories: Iterable[str],
+        work_types: Optional[Iterable[Optional[str]]] = None,
+        locations: Optional[Iterable[Optional[str]]] = None,
+        source: str = "api",
+    ) -> Tuple[str, bool]:
+        """Queue every category × work type × location variant.
+
+        Returns (job_id, coalesced); coalesced means no new job was needed
+        and job_id is the job that already covers the first variant.
+        """
+        job_id, coalesced = await asyncio.to_thread(
+            self._submit, list(categories), list(work_types or [None]), list(locations or [None]), source
+        )
+        if not coalesced and self._wakeup is not None:
+            self._wakeup.set()
+        return job_id, coalesced
+
+    def _submit(
+        self,
+        categories: List[str],
+        work_types: List[Optional[str]],
+        locations: List[Optional[str]],
+        source: str,
+    ) -> Tuple[str, bool]:
+        variants = list(dict.fromkeys(
+            _variant(category, work_type, location)
+            for category in categories
+            for work_type in work_types
+            for location in locations
+        ))
+        now = time.time()
+
+        with self._lock, self._connect() as conn:
+            needed, covering_job = [], None
+            for variant in variants:
+                row = conn.execute(
+                    "SELECT v.job_id, v.scraped_at, j.status FROM variants v "
+                    "JOIN jobs j ON j.id = v.job_id WHERE v.key = ?",
+                    (_key(variant),),
+                ).fetchone()
+                in_flight = row is not None and row["status"] in ("queued", "running")
+                fresh = row is not None and row["scraped_at"] is not None and now - row["scraped_at"] < self.freshness
+                if in_flight or fresh:
+                    covering_job = covering_job or row["job_id"]
+                else:
+                    needed.append(variant)
+
+            if not needed:
+                logger.info(f"Coalesced {source} scrape of {len(variants)} variants into job {covering_job}")
+                return covering_job, True
+
+            job_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO jobs (id, source, status, variants, created_at) VALUES (?, ?, 'queued', ?, ?)",
+                (job_id, source, json.dumps(needed), now),
+            )
+            conn.executemany(
+                "INSERT INTO variants (key, job_id) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET job_id = excluded.job_id",
+                [(_key(variant), job_id) for variant in needed],
+            )
+
+        logger.info(f"Queued {source} scrape job {job_id}: {len(needed)} of {len(variants)} variants "
+                    f"({len(variants) - len(needed)} fresh or already queued)")
+        return job_id, False
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        """Status, variants and stats of a job, or None if it doesn't exist."""
+        return await asyncio.to_thread(self._get, job_id)
+
+    def _get(self, job_id: str) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "job_id": row["id"],
+            "source": row["source"],
+            "status": row["status"],
+            "variants": [
+                {"category": category, "work_type": work_type, "location": location}
+                for category, work_type, location in json.loads(row["variants"])
+            ],
+            "stats": json.loads(row["stats"]) if row["stats"] else None,
+            "error": row["error"],
+            "created_at": _isoformat(row["created_at"]),
+            "started_at": _isoformat(row["started_at"]),
+            "finished_at": _isoformat(row["finished_at"]),
+        }
+
+    # ── Running ──
+
+    def _requeue_expired(self, conn: sqlite3.Connection) -> int:
+        """Queue running jobs whose worker stopped renewing the lease."""
+        return conn.execute(
+            "UPDATE jobs SET status = 'queued', started_at = NULL, heartbeat_at = NULL "
+            "WHERE status = 'running' AND coalesce(heartbeat_at, started_at, 0) < ?",
+            (time.time() - self.lease,),
+        ).rowcount
+
+    def _heartbeat(self, job_id: str):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = 'running'",
+                (time.time(), job_id),
+            )
+
+    def _claim_next(self) -> Optional[Tuple[str, List[Variant]]]:
+        with self._lock, self._connect() as conn:
+            requeued = self._requeue_expired(conn)
+            if requeued:
+                logger.warning(f"Requeued {requeued} scrape jobs whose lease expired")
+            while True:
+                row = conn.execute(
+                    "SELECT id, variants FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    return None
+                # Another process sharing the database may claim the same job first
+                now = time.time()
+                claimed = conn.execute(
+                    "UPDATE jobs SET status = 'running', started_at = ?, heartbeat_at = ? "
+                    "WHERE id = ? AND status = 'queued'",
+                    (now, now, row["id"]),
+                ).rowcount
+                if claimed:
+                    return row["id"], [tuple(v) for v in json.loads(row["variants"])]
+
+    def _finish(self, job_id: str, variants: List[Variant], stats: Optional[Dict], error: Optional[str]):
+        """Record a job's outcome; only variants that fetched something become fresh."""
+        failed = set()
+        if stats:
+            failed = {_key(tuple(variant)) for variant in stats.get("failed_variants") or []}
+            if not error and variants and len(failed) >= len(variants):
+                error = f"No page could be fetched for any of the {len(variants)} variants"
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, stats = ?, error = ?, finished_at = ? WHERE id = ?",
+                ("failed" if error else "done", json.dumps(stats) if stats else None, error, now, job_id),
+            )
+            if not error:
+                conn.executemany(
+                    "UPDATE variants SET scraped_at = ? WHERE key = ? AND job_id = ?",
+                    [(now, _key(variant), job_id) for variant in variants if _key(variant) not in failed],
+                )
+        if error:
+            logger.error(f"Scrape job {job_id} failed: {error}")
+        elif failed:
+            logger.warning(f"Scrape job {job_id}: {len(failed)} of {len(variants)} variants fetched nothing")
+
+    async def _renew_lease(self, job_id: str):
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            try:
+                await asyncio.to_thread(self._heartbeat, job_id)
+            except Exception as e:
+                logger.warning(f"Could not renew the lease of scrape job {job_id}: {e}")
+
+    async def _run_next(self) -> bool:
+        claimed = await asyncio.to_thread(self._claim_next)
+        if claimed is None:
+            return False
+        job_id, variants = claimed
+        logger.info(f"📡 Running scrape job {job_id} ({len(variants)} variants)")
+        lease = asyncio.create_task(self._renew_lease(job_id))
+        try:
+            stats = await scrape_and_save(variants)
+        except Exception as e:
+            await asyncio.to_thread(self._finish, job_id, variants, None, str(e))
+        else:
+            await asyncio.to_thread(self._finish, job_id, variants, stats, None)
+        finally:
+            lease.cancel()
+        return True
+
+    async def _worker(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                while await self._run_next():
+                    pass
+            except Exception as e:
+                # e.g. a locked or unreadable jobs database: keep scheduling.
+                # A job left running is requeued once its lease expires.
+                logger.error(f"Scrape worker error: {e}")
+                await asyncio.sleep(min(self.lease, 30))
+                continue
+            try:
+                # Wake up at least once per lease to pick up expired ones
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.lease)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _periodic_refresh(self):
+        while True:
+            try:
+                await self.submit(DEFAULT_CATEGORIES, source="periodic")
+            except Exception as e:
+                # Try again next interval rather than ending the refresh loop
+                logger.error(f"Could not queue the periodic scrape: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self, delay: float = 2.0):
+        """Requeue interrupted jobs and start the worker and periodic refresh.
+
+        Only jobs whose lease expired are requeued; ones another worker is
+        still running keep their lease.
+        """
+        with self._lock, self._connect() as conn:
+            requeued = self._requeue_expired(conn)
+        if requeued:
+            logger.info(f"Requeued {requeued} scrape jobs interrupted by a shutdown")
+
+        self._wakeup = asyncio.Event()
+
+        async def delayed(loop_forever):
+            # Let the server finish starting first
+            await asyncio.sleep(delay)
+            await loop_forever()
+
+        self._tasks = [
+            asyncio.create_task(delayed(self._worker)),
+            asyncio.create_task(delayed(self._periodic_refresh)),
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+scrape_scheduler = ScrapeScheduler()
@@ -1,8 +1,18 @@
+import asyncio
+import re
+import time
 import httpx
-from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, NamedTuple, Optional, Tuple
 import logging
 
+from config import (
+    SCRAPE_CONCURRENCY, SCRAPE_RATE_PER_HOST, SCRAPE_TIMEOUT_SECONDS, SCRAPE_MAX_PAGES,
+    SCRAPE_CACHE_ENABLED, SCRAPE_REPLAY_DIR, SCRAPE_RECORD_DIR,
+)
+from services.http_cache import HttpCache, content_hash
+from services.scrape_replay import RecordingTransport, ReplayTransport
+from services.listing_parser import listing_parser
+
 logger = logging.getLogger("scraper")
 logger.setLevel(logging.DEBUG)
 
@@ -12,17 +22,278 @@ if not logger.handlers:
     ch.setFormatter(logging.Formatter("%(asctime)s [%(name)s] %(levelname)s: %(message)s"))
     logger.addHandler(ch)
 
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+}
+
+_TOTAL_PAGES_RE = re.compile(r'id=["\']total_pages["\'][^>]*>\s*(\d+)')
+_PAGE_LINK_RE = re.compile(r'/page-(\d+)')
+
+
+class Page(NamedTuple):
+    url: str
+    text: str
+    content_hash: str
+    unchanged: bool  # served from cache, 304, or identical to the cached body
+
+
+class TokenBucket:
+    """Async token bucket: `rate` requests/sec with bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class ScrapeSession:
+    """One pooled HTTP client shared by every fetch in a scrape run.
+
+    Reuses connections (keep-alive, HTTP/2), caps in-flight requests at
+    `concurrency`, rate-limits each host with a token bucket and, unless
+    disabled, goes through the on-disk HttpCache (conditional requests,
+    no re-parsing of pages already seen). A custom `transport` (e.g.
+    ReplayTransport for recorded pages) replaces the network:
+
+        async with ScrapeSession() as session:
+            results = await session.scrape_many([("python", None, None), ...])
+    """
+
+    def __init__(
+        self,
+        concurrency: int = SCRAPE_CONCURRENCY,
+        rate_per_host: float = SCRAPE_RATE_PER_HOST,
+        timeout: float = SCRAPE_TIMEOUT_SECONDS,
+        max_pages: int = SCRAPE_MAX_PAGES,
+        cache: Optional[HttpCache] = None,
+        use_cache: bool = SCRAPE_CACHE_ENABLED,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.concurrency = concurrency
+        self.max_pages = max_pages
+        self.rate_per_host = rate_per_host
+        self.timeout = timeout
+        self.client: Optional[httpx.AsyncClient] = None
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self.cache = cache if cache is not None else (HttpCache() if use_cache else None)
+        if transport is None and SCRAPE_REPLAY_DIR:
+            transport = ReplayTransport(SCRAPE_REPLAY_DIR)
+        elif transport is None and SCRAPE_RECORD_DIR:
+            transport = RecordingTransport(SCRAPE_RECORD_DIR)
+        self.transport = transport
+        self.stats = {
+            "requests": 0,
+            "cache_fresh": 0,
+            "not_modified": 0,
+            "unchanged": 0,
+            "parsed": 0,
+            "parse_skipped": 0,
+        }
+
+    async def __aenter__(self):
+        if self.cache:
+            pruned = await asyncio.to_thread(self.cache.prune)
+            if pruned:
+                logger.info(f"Pruned {pruned} stale scrape cache files")
+        self.client = httpx.AsyncClient(
+            http2=True,
+            timeout=self.timeout,
+            headers=HEADERS,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency,
+            ),
+            transport=self.transport,
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.client.aclose()
+        self.client = None
+        logger.info(f"Scrape session stats: {self.stats}")
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.rate_per_host)
+        return bucket
+
+    async def fetch(self, url: str) -> Optional[Page]:
+        """GET a page through the cache and shared client; None on failure.
+
+        Cache reads and writes run in a worker thread, off the event loop.
+        """
+        meta = await asyncio.to_thread(self.cache.lookup, url) if self.cache else None
+        if meta is not None and self.cache.is_fresh(meta):
+            body = await asyncio.to_thread(self.cache.body, url)
+            if body is not None:
+                self.stats["cache_fresh"] += 1
+                return Page(url, body, meta["content_hash"], True)
+
+        headers = HttpCache.validators(meta)
+        async with self._semaphore:
+            await self._bucket(httpx.URL(url).host).acquire()
+            response = await self.client.get(url, headers=headers)
+        self.stats["requests"] += 1
+
+        if response.status_code == 304 and meta is not None:
+            body = await asyncio.to_thread(self.cache.body, url)
+            if body is not None:
+                await asyncio.to_thread(self.cache.touch, url, meta)
+                self.stats["not_modified"] += 1
+                return Page(url, body, meta["content_hash"], True)
+            # Body went missing — fetch it again unconditionally
+            async with self._semaphore:
+                await self._bucket(httpx.URL(url).host).acquire()
+                response = await self.client.get(url)
+            self.stats["requests"] += 1
+
+        if response.status_code != 200:
+            logger.error(f"Failed to fetch {url}: {response.status_code}")
+            return None
+
+        text = response.text
+        digest = content_hash(text)
+        unchanged = meta is not None and meta.get("content_hash") == digest
+        if unchanged:
+            self.stats["unchanged"] += 1
+        if self.cache:
+            await asyncio.to_thread(
+                self.cache.store, url, text, digest, response.headers.get("etag"), response.headers.get("last-modified")
+            )
+        return Page(url, text, digest, unchanged)
+
+    def parse(self, page: Page) -> List[Dict]:
+        """Listings on a page, reusing the cached parse of identical content."""
+        if self.cache:
+            listings = self.cache.get_parsed(page.content_hash)
+            if listings is not None:
+                self.stats["parse_skipped"] += 1
+                return listings
+        listings = InternshalaScraper.parse_listings(page.text)
+        self.stats["parsed"] += 1
+        if self.cache:
+            self.cache.put_parsed(page.content_hash, listings)
+        return listings
+
+    def parse_detail(self, page: Page) -> Dict:
+        """Fields from a posting's detail page, reusing the cached parse of identical content."""
+        key = f"detail-{page.content_hash}"
+        if self.cache:
+            details = self.cache.get_parsed(key)
+            if details is not None:
+                self.stats["parse_skipped"] += 1
+                return details
+        details = listing_parser.parse_detail(page.text)
+        self.stats["parsed"] += 1
+        if self.cache:
+            self.cache.put_parsed(key, details)
+        return details
+
+    async def iter_pages(
+        self,
+        category: str = "",
+        work_type: Optional[str] = None,
+        location: Optional[str] = None,
+    ) -> AsyncIterator[Tuple[int, Page]]:
+        """Yield (page number, page) for every listing page of a category.
+
+        The first page tells us how many pages there are; the rest (up to
+        `max_pages`) are fetched in parallel and yielded as they finish.
+        """
+        url = InternshalaScraper.build_url(category, work_type, location)
+        logger.info(f"Scraping: {url}")
+
+        first = await self.fetch(url)
+        if first is None:
+            return
+        yield 1, first
+
+        total = min(InternshalaScraper.page_count(first.text), self.max_pages)
+        if total < 2:
+            return
+        logger.info(f"Fetching pages 2-{total} of {url}")
+
+        async def fetch_page(number: int) -> Tuple[int, Optional[Page]]:
+            try:
+                return number, await self.fetch(InternshalaScraper.page_url(url, number))
+            except Exception as e:
+                logger.error(f"Error fetching page {number} of {url}: {e}")
+                return number, None
+
+        tasks = [asyncio.ensure_future(fetch_page(number)) for number in range(2, total + 1)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                number, page = await next_done
+                if page is not None:
+                    yield number, page
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def iter_listings(
+        self,
+        category: str = "",
+        work_type: Optional[str] = None,
+        location: Optional[str] = None,
+    ) -> AsyncIterator[Dict]:
+        """Stream parsed listings from every page of a category as pages arrive."""
+        async for _, page in self.iter_pages(category, work_type, location):
+            for listing in self.parse(page):
+                yield listing
+
+    async def scrape(
+        self,
+        category: str = "",
+        work_type: Optional[str] = None,
+        location: Optional[str] = None,
+    ) -> List[Dict]:
+        """Scrape every listing page (up to `max_pages`) of one variant."""
+        internships = []
+        try:
+            async for listing in self.iter_listings(category, work_type, location):
+                internships.append(listing)
+        except Exception as e:
+            logger.error(f"Scraping error: {e}")
+
+        logger.info(f"Successfully scraped {len(internships)} internships")
+        return internships
+
+    async def scrape_many(
+        self,
+        jobs: List[Tuple[str, Optional[str], Optional[str]]],
+    ) -> List[List[Dict]]:
+        """Scrape several (category, work_type, location) variants concurrently."""
+        return await asyncio.gather(*(self.scrape(*job) for job in jobs))
+
 
 class InternshalaScraper:
     BASE_URL = "https://internshala.com/internships"
 
     @staticmethod
-    async def scrape_internships(
+    def build_url(
         category: str = "",
         work_type: Optional[str] = None,
         location: Optional[str] = None,
-    ) -> List[Dict]:
-        """Scrape internships from Internshala for a given category.
+    ) -> str:
+        """Listing URL for a category.
 
         Args:
             category: e.g. "python", "web development"
@@ -48,91 +319,40 @@ class InternshalaScraper:
             loc_slug = location.strip().lower().replace(" ", "-")
             url = f"{url}/in-{loc_slug}"
 
-        logger.info(f"Scraping: {url}")
+        return url
 
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        }
+    @staticmethod
+    def page_url(url: str, page: int) -> str:
+        """URL of page `page` (1-based) of a listing URL."""
+        return url if page <= 1 else f"{url}/page-{page}"
 
-        internships = []
+    @staticmethod
+    def page_count(html: str) -> int:
+        """Number of listing pages, read from the first page (1 if unknown)."""
+        match = _TOTAL_PAGES_RE.search(html)
+        if match:
+            return max(int(match.group(1)), 1)
+        pages = [int(n) for n in _PAGE_LINK_RE.findall(html)]
+        return max(pages, default=1)
 
-        try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                response = await client.get(url, headers=headers, follow_redirects=True)
-
-            if response.status_code != 200:
-                logger.error(f"Failed to fetch Internshala: {response.status_code}")
-                return []
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-            listings = soup.find_all('div', class_='individual_internship')
-            logger.info(f"Found {len(listings)} listing containers")
-
-            for listing in listings:
-                try:
-                    # Company name
-                    company_elem = listing.find('p', class_='company-name')
-                    company = company_elem.get_text(strip=True) if company_elem else "Unknown"
-
-                    # Role / title
-                    role_elem = listing.find('h3', class_='job-internship-name')
-                    role = role_elem.get_text(strip=True) if role_elem else "Unknown"
-
-                    # Location
-                    location_elem = listing.find('div', class_='locations')
-                    loc = location_elem.get_text(strip=True) if location_elem else "Unknown"
-
-                    # Work type
-                    intern_work_type = "In-office"
-                    if "work from home" in loc.lower() or "remote" in loc.lower():
-                        intern_work_type = "Remote"
-                        loc = "Remote"
-                    # Check for "Work From Home" tag
-                    status_tags = listing.find_all(class_='status-success')
-                    for tag in status_tags:
-                        tag_text = tag.get_text(strip=True).lower()
-                        if 'work from home' in tag_text or 'remote' in tag_text:
-                            intern_work_type = "Remote"
-
-                    # Stipend
-                    stipend_elem = listing.find('span', class_='stipend')
-                    salary = stipend_elem.get_text(strip=True) if stipend_elem else "Unpaid"
-
-                    # Duration
-                    duration_elem = listing.find('div', class_='item_body')
-                    duration = duration_elem.get_text(strip=True) if duration_elem else ""
-
-                    # Skills
-                    skill_elems = listing.find_all('div', class_='job_skill')
-                    skills = [s.get_text(strip=True).lower() for s in skill_elems]
-
-                    # Apply link
-                    link_elem = listing.find('a', class_='job-title-href')
-                    apply_url = ""
-                    if link_elem and link_elem.get('href'):
-                        apply_url = "https://internshala.com" + link_elem['href']
-
-                    # Skip if no valid role or company
-                    if company == "Unknown" and role == "Unknown":
-                        continue
-
-                    internships.append({
-                        "company": company,
-                        "role": role,
-                        "location": loc,
-                        "work_type": intern_work_type,
-                        "salary": salary,
-                        "apply_url": apply_url,
-                        "source": "internshala",
-                        "skills": skills,
-                        "posted_at": None
-                    })
-                except Exception as e:
-                    logger.warning(f"Error parsing listing: {e}")
-                    continue
+    @staticmethod
+    async def scrape_internships(
+        category: str = "",
+        work_type: Optional[str] = None,
+        location: Optional[str] = None,
+        session: Optional[ScrapeSession] = None,
+    ) -> List[Dict]:
+        """Scrape internships from Internshala for a given category.
 
-        except Exception as e:
-            logger.error(f"Scraping error: {e}")
+        Pass a shared `session` to reuse its pooled client; otherwise a
+        one-off session is opened for this call.
+        """
+        if session is not None:
+            return await session.scrape(category, work_type, location)
+        async with ScrapeSession() as own_session:
+            return await own_session.scrape(category, work_type, location)
 
-        logger.info(f"Successfully scraped {len(internships)} internships")
-        return internships
+    @staticmethod
+    def parse_listings(html: str) -> List[Dict]:
+        """Extract internship dicts from a listing page (backend set by SCRAPE_PARSER)."""
+        return listing_parser.parse(html)
@@ -0,0 +1,85 @@
+import math
+import re
+from typing import Dict, List
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens; keeps '+' and '#' so c++ / c# survive."""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(text.lower())
+
+
+class BM25Index:
+    """Incremental inverted index with Okapi BM25 ranking.
+
+    postings: token → {doc_id: term frequency}. Documents can be added and
+    removed one at a time, so the catalog index keeps it in sync after each
+    scrape instead of rebuilding it.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_tokens: Dict[str, Dict[str, int]] = {}
+        self._doc_len: Dict[str, int] = {}
+        self._total_len = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_len)
+
+    def add(self, doc_id: str, text: str):
+        self.remove(doc_id)
+        counts: Dict[str, int] = {}
+        for token in tokenize(text):
+            counts[token] = counts.get(token, 0) + 1
+        for token, tf in counts.items():
+            self._postings.setdefault(token, {})[doc_id] = tf
+        self._doc_tokens[doc_id] = counts
+        length = sum(counts.values())
+        self._doc_len[doc_id] = length
+        self._total_len += length
+
+    def remove(self, doc_id: str):
+        counts = self._doc_tokens.pop(doc_id, None)
+        if counts is None:
+            return
+        for token in counts:
+            docs = self._postings.get(token)
+            if docs is not None:
+                docs.pop(doc_id, None)
+                if not docs:
+                    del self._postings[token]
+        self._total_len -= self._doc_len.pop(doc_id)
+
+    def docs_with(self, token: str) -> Dict[str, int]:
+        """{doc_id: tf} for one token (empty if unseen)."""
+        return self._postings.get(token, {})
+
+    def search(self, query: str) -> Dict[str, float]:
+        """BM25 score of every document matching at least one query token."""
+        n_docs = len(self._doc_len)
+        if not n_docs:
+            return {}
+        avg_len = self._total_len / n_docs or 1.0
+
+        scores: Dict[str, float] = {}
+        for token in set(tokenize(query)):
+            docs = self._postings.get(token)
+            if not docs:
+                continue
+            df = len(docs)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for doc_id, tf in docs.items():
+                norm = self.k1 * (1 - self.b + self.b * self._doc_len[doc_id] / avg_len)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+    def clear(self):
+        self._postings.clear()
+        self._doc_tokens.clear()
+        self._doc_len.clear()
+        self._total_len = 0
@@ -0,0 +1,123 @@
+from typing import Dict, List
+
+
+# Extended skill/keyword database for better detection
+SKILL_DATABASE = [
+    # Programming Languages
+    "python", "java", "javascript", "typescript", "c++", "c#", "go", "rust", "ruby",
+    "php", "swift", "kotlin", "scala", "r", "matlab", "perl", "dart", "lua",
+
+    # Frontend
+    "react", "angular", "vue", "vue.js", "next.js", "nuxt.js", "svelte", "html", "css",
+    "sass", "scss", "tailwind", "tailwind css", "bootstrap", "material ui", "jquery",
+    "redux", "webpack", "vite", "figma", "responsive design",
+
+    # Backend
+    "node.js", "express", "express.js", "django", "flask", "fastapi", "spring boot",
+    "spring", "rails", "ruby on rails", "asp.net", "laravel", "nestjs", "graphql",
+    "rest api", "restful", "microservices",
+
+    # Databases
+    "sql", "mysql", "postgresql", "redis", "elasticsearch", "sqlite",
+    "oracle", "cassandra", "dynamodb", "firebase", "supabase",
+
+    # Cloud & DevOps
+    "aws", "azure", "gcp", "google cloud", "docker", "kubernetes", "terraform",
+    "jenkins", "ci/cd", "github actions", "gitlab ci", "ansible", "nginx",
+    "linux", "bash", "shell scripting",
+
+    # Data & AI/ML
+    "machine learning", "deep learning", "data analysis", "data science",
+    "artificial intelligence", "nlp", "natural language processing",
+    "computer vision", "tensorflow", "pytorch", "keras", "scikit-learn",
+    "pandas", "numpy", "matplotlib", "tableau", "power bi", "spark",
+    "hadoop", "big data", "data visualization", "statistics",
+
+    # Mobile
+    "react native", "flutter", "android", "ios", "swiftui", "jetpack compose",
+
+    # Tools & Practices
+    "git", "github", "gitlab", "jira", "agile", "scrum", "kanban",
+    "unit testing", "tdd", "test driven development", "selenium", "cypress",
+    "postman", "swagger",
+
+    # Soft Skills
+    "communication", "leadership", "teamwork", "problem solving",
+    "project management", "time management", "critical thinking",
+    "presentation", "collaboration",
+]
+
+
+class SkillExtractor:
+    """Aho-Corasick automaton that finds every known skill in one pass.
+
+    Built once from a list of skill names. `find` walks the lowercased text
+    a single time regardless of how many skills there are, and only keeps
+    matches that start and end on a word boundary (so "go" does not match
+    inside "google" and "java" does not match inside "javascript").
+    """
+
+    def __init__(self, skills: List[str]):
+        self.skills = list(dict.fromkeys(s.lower().strip() for s in skills if s.strip()))
+
+        # Trie: node → {char: child}; outputs hold indices into self.skills
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        for idx, skill in enumerate(self.skills):
+            node = 0
+            for ch in skill:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(idx)
+
+        # Breadth-first failure links
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, text: str) -> List[str]:
+        """Unique skills found in `text`, in order of first appearance."""
+        if not text:
+            return []
+        # Collapse whitespace so skills broken across lines still match
+        text = " ".join(text.lower().split())
+
+        goto, fail, out, skills = self._goto, self._fail, self._out, self.skills
+        found: Dict[int, None] = {}
+        node = 0
+        last = len(text) - 1
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            if i < last and text[i + 1].isalnum():
+                continue
+            for idx in out[node]:
+                start = i - len(skills[idx]) + 1
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                found.setdefault(idx, None)
+        return [skills[idx] for idx in found]
+
+
+# Shared automaton over the skill database, compiled once at import
+skill_extractor = SkillExtractor(SKILL_DATABASE)
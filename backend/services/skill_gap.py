@@ -1,53 +1,6 @@
-import re
 from typing import List, Dict
 from services.resume_parser import ResumeParser
-
-
-# Extended skill/keyword database for better detection
-SKILL_DATABASE = [
-    # Programming Languages
-    "python", "java", "javascript", "typescript", "c++", "c#", "go", "rust", "ruby",
-    "php", "swift", "kotlin", "scala", "r", "matlab", "perl", "dart", "lua",
-
-    # Frontend
-    "react", "angular", "vue", "vue.js", "next.js", "nuxt.js", "svelte", "html", "css",
-    "sass", "scss", "tailwind", "tailwind css", "bootstrap", "material ui", "jquery",
-    "redux", "webpack", "vite", "figma", "responsive design",
-
-    # Backend
-    "node.js", "express", "express.js", "django", "flask", "fastapi", "spring boot",
-    "spring", "rails", "ruby on rails", "asp.net", "laravel", "nestjs", "graphql",
-    "rest api", "restful", "microservices",
-
-    # Databases
-    "sql", "mysql", "postgresql", "redis", "elasticsearch", "sqlite",
-    "oracle", "cassandra", "dynamodb", "firebase", "supabase",
-
-    # Cloud & DevOps
-    "aws", "azure", "gcp", "google cloud", "docker", "kubernetes", "terraform",
-    "jenkins", "ci/cd", "github actions", "gitlab ci", "ansible", "nginx",
-    "linux", "bash", "shell scripting",
-
-    # Data & AI/ML
-    "machine learning", "deep learning", "data analysis", "data science",
-    "artificial intelligence", "nlp", "natural language processing",
-    "computer vision", "tensorflow", "pytorch", "keras", "scikit-learn",
-    "pandas", "numpy", "matplotlib", "tableau", "power bi", "spark",
-    "hadoop", "big data", "data visualization", "statistics",
-
-    # Mobile
-    "react native", "flutter", "android", "ios", "swiftui", "jetpack compose",
-
-    # Tools & Practices
-    "git", "github", "gitlab", "jira", "agile", "scrum", "kanban",
-    "unit testing", "tdd", "test driven development", "selenium", "cypress",
-    "postman", "swagger",
-
-    # Soft Skills
-    "communication", "leadership", "teamwork", "problem solving",
-    "project management", "time management", "critical thinking",
-    "presentation", "collaboration",
-]
+from services.skill_extractor import SKILL_DATABASE, skill_extractor
 
 
 class SkillGapAnalyzer:
@@ -57,21 +10,7 @@ class SkillGapAnalyzer:
         if not text or not text.strip():
             return []
 
-        found_skills = []
-        text_lower = text.lower()
-
-        for skill in SKILL_DATABASE:
-            # Use word boundary-like check for short skills to avoid false positives
-            if len(skill) <= 2:
-                # For very short skills like "r", "go" — require word boundaries
-                pattern = r'\b' + re.escape(skill) + r'\b'
-                if re.search(pattern, text_lower):
-                    found_skills.append(skill)
-            else:
-                if skill in text_lower:
-                    found_skills.append(skill)
-
-        return list(set(found_skills))
+        return skill_extractor.find(text)
 
     @staticmethod
     def analyze(job_description: str, resume_text: str) -> Dict:
@@ -0,0 +1,107 @@
+import re
+from typing import Dict, Optional
+
+# Multipliers that turn an amount per <period> into a monthly amount
+MONTHLY_FACTORS = {
+    "month": 1.0,
+    "week": 52 / 12,
+    "day": 52 * 5 / 12,
+    "hour": 52 * 40 / 12,
+    "year": 1 / 12,
+}
+
+_CURRENCIES = [
+    ("₹", "INR"), ("inr", "INR"), ("rs", "INR"),
+    ("$", "USD"), ("usd", "USD"),
+    ("€", "EUR"), ("eur", "EUR"),
+    ("£", "GBP"), ("gbp", "GBP"),
+]
+
+_PERIODS = [
+    ("lump", "lump_sum"), ("one time", "lump_sum"), ("one-time", "lump_sum"),
+    ("month", "month"), ("/mo", "month"), ("pm", "month"),
+    ("week", "week"), ("/wk", "week"),
+    ("day", "day"), ("hour", "hour"), ("/hr", "hour"),
+    ("year", "year"), ("annum", "year"), ("/yr", "year"),
+]
+
+# Months per unit of an internship duration ("3 Months", "6 Weeks", "45 Days")
+_DURATION_UNITS = {"month": 1.0, "week": 12 / 52, "day": 12 / 365, "year": 12.0}
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(month|week|day|year)", re.IGNORECASE)
+
+_AMOUNT_RE = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*(k\b)?", re.IGNORECASE)
+_WORD_RE = re.compile(r"[a-z]+")
+
+
+class StipendParser:
+    @staticmethod
+    def parse(salary: Optional[str], duration_months: Optional[float] = None) -> Dict:
+        """Parse free-text stipend into monthly min/max, currency and period.
+
+        "₹ 10,000 - 15,000 /month" → min 10000, max 15000, INR, month.
+        Weekly/daily/yearly amounts are converted to monthly. A lump sum is
+        spread over `duration_months` when known, otherwise kept as-is with
+        period "lump_sum". Unpaid → 0; no amount (e.g. "Performance based")
+        → min/max None.
+        """
+        result = {
+            "stipend_min": None,
+            "stipend_max": None,
+            "stipend_currency": None,
+            "stipend_period": None,
+        }
+        text = (salary or "").strip().lower()
+        if not text:
+            return result
+
+        if "unpaid" in text:
+            result.update(stipend_min=0, stipend_max=0, stipend_currency="INR", stipend_period="month")
+            return result
+
+        amounts = []
+        for number, thousands in _AMOUNT_RE.findall(text):
+            value = float(number.replace(",", ""))
+            amounts.append(value * 1000 if thousands else value)
+        if not amounts:
+            return result
+
+        words = set(_WORD_RE.findall(text))
+        for marker, code in _CURRENCIES:
+            if (marker in words) if marker.isalpha() else (marker in text):
+                result["stipend_currency"] = code
+                break
+        else:
+            # Internshala lists stipends in rupees unless stated otherwise
+            result["stipend_currency"] = "INR"
+
+        period = "month"
+        for marker, name in _PERIODS:
+            if (marker in words) if marker.isalpha() and len(marker) <= 3 else (marker in text):
+                period = name
+                break
+
+        # "10,000 - 15,000" is a range; anything after (e.g. "+ incentives") is ignored
+        low = high = amounts[0]
+        if len(amounts) > 1 and amounts[1] >= amounts[0]:
+            high = amounts[1]
+
+        if period == "lump_sum":
+            factor = 1 / duration_months if duration_months else 1.0
+        else:
+            factor = MONTHLY_FACTORS[period]
+
+        result.update(
+            stipend_min=int(round(low * factor)),
+            stipend_max=int(round(high * factor)),
+            stipend_period=period,
+        )
+        return result
+
+    @staticmethod
+    def duration_months(duration: Optional[str]) -> Optional[float]:
+        """Internship length in months from the card's duration ("6 Weeks" → 1.38), or None."""
+        match = _DURATION_RE.search(duration or "")
+        if not match:
+            return None
+        months = float(match.group(1)) * _DURATION_UNITS[match.group(2).lower()]
+        return months or None
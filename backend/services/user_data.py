@@ -0,0 +1,135 @@
+import asyncio
+import copy
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import supabase_client
+from config import USER_DATA_CACHE_SIZE, USER_DATA_CACHE_TTL_SECONDS
+from services import db_pool
+
+logger = logging.getLogger("user_data")
+
+_MISSING = object()
+
+
+def _db():
+    # Use admin client to bypass RLS, fall back to regular client
+    return supabase_client.supabase_admin or supabase_client.supabase
+
+
+class UserDataLoader:
+    """Shared loader for the per-user rows most routes start with.
+
+    A page load fires several endpoints at once (dashboard, profile,
+    recommendations), and each needs the user's latest resume and/or
+    preferences. Concurrent loads of the same row share one query, and the
+    result is kept for `ttl` seconds (bounded LRU of `max_entries`).
+    Resume uploads, skill edits and preference changes call `invalidate`;
+    a query still in flight when that happens isn't cached.
+
+        resume = await user_data.latest_resume(user_id)    # row dict or None
+        prefs = await user_data.preferences(user_id)
+
+    Write paths that act on the row they read pass `fresh=True`.
+    """
+
+    def __init__(self, ttl: float = USER_DATA_CACHE_TTL_SECONDS, max_entries: int = USER_DATA_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Optional[Dict]]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+    # ── Queries ──
+
+    @staticmethod
+    async def _fetch_latest_resume(user_id: str) -> Optional[Dict]:
+        resp = await db_pool.execute(
+            _db().table("resumes")
+            .select("*")
+            .eq("user_id", user_id)
+            .order("created_at", desc=True)
+            .limit(1)
+        )
+        return resp.data[0] if resp.data else None
+
+    @staticmethod
+    async def _fetch_preferences(user_id: str) -> Optional[Dict]:
+        resp = await db_pool.execute(_db().table("user_preferences").select("*").eq("user_id", user_id))
+        return resp.data[0] if resp.data else None
+
+    async def latest_resume(self, user_id: str, fresh: bool = False) -> Optional[Dict]:
+        """The user's most recently uploaded resume row, or None.
+
+        `fresh` reads it from the database, bypassing (and not filling) the cache.
+        """
+        if fresh:
+            return await self._fetch_latest_resume(user_id)
+        return await self._load("resume", user_id, self._fetch_latest_resume)
+
+    async def preferences(self, user_id: str) -> Optional[Dict]:
+        """The user's preferences row, or None if they never saved any."""
+        return await self._load("preferences", user_id, self._fetch_preferences)
+
+    # ── Caching ──
+
+    async def _load(self, kind: str, user_id: str, fetch: Callable[[str], Awaitable[Optional[Dict]]]) -> Optional[Dict]:
+        key = (kind, user_id)
+        value = self._cached(key)
+        if value is _MISSING:
+            task = self._inflight.get(key)
+            if task is None:
+                self.stats["misses"] += 1
+                task = asyncio.ensure_future(fetch(user_id))
+                self._inflight[key] = task
+                task.add_done_callback(lambda done: self._settle(key, done))
+            else:
+                self.stats["coalesced"] += 1
+            # One caller giving up must not cancel the query for the others
+            value = await asyncio.shield(task)
+        else:
+            self.stats["hits"] += 1
+        # Callers get their own copy (skills lists included); the cached row stays untouched
+        return copy.deepcopy(value)
+
+    def _cached(self, key: Tuple[str, str]):
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        stored_at, value = entry
+        if time.time() - stored_at > self.ttl:
+            del self._entries[key]
+            return _MISSING
+        self._entries.move_to_end(key)
+        return value
+
+    def _settle(self, key: Tuple[str, str], task: asyncio.Task):
+        if self._inflight.get(key) is not task:
+            # Invalidated while the query was running
+            return
+        del self._inflight[key]
+        if task.cancelled() or task.exception() is not None or self.ttl <= 0:
+            return
+        self._entries[key] = (time.time(), task.result())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str):
+        """Forget the user's cached rows after a write."""
+        for kind in ("resume", "preferences"):
+            self._entries.pop((kind, user_id), None)
+            self._inflight.pop((kind, user_id), None)
+
+    def clear(self):
+        self._entries.clear()
+        self._inflight.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared, process-wide loader
+user_data = UserDataLoader()
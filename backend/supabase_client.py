@@ -11,3 +11,25 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 else:
     supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
     supabase_admin: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+
+def fetch_all(table: str, columns: str = "*", order: str = "id", desc: bool = False,
+              page_size: int = 1000, client: Client = None) -> list:
+    """Read every row of a table, one page (PostgREST caps at 1000) per round trip.
+
+    Rows are also ordered by id, so pages don't skip or repeat rows that
+    tie on a non-unique `order` column.
+    """
+    client = client or supabase_admin or supabase
+    rows = []
+    start = 0
+    while True:
+        query = client.table(table).select(columns).order(order, desc=desc)
+        if order != "id":
+            query = query.order("id", desc=desc)
+        resp = query.range(start, start + page_size - 1).execute()
+        batch = resp.data or []
+        rows.extend(batch)
+        if len(batch) < page_size:
+            return rows
+        start += page_size
@@ -0,0 +1,137 @@
+import pytest
+from fastapi import HTTPException
+
+from models.schemas import InternshipResponse
+from services.pagination import cursor_position, encode_cursor, next_cursor, seek
+from services.projection import parse_fields
+
+
+class RecordingQuery:
+    """Stand-in for a postgrest query builder that records the calls made on it."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        def record(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return record
+
+
+def test_seek_first_page_only_orders_and_limits():
+    query = seek(RecordingQuery(), "scraped_at", None, 50)
+    assert query.calls == [
+        ("order", ("scraped_at",), {"desc": True, "nullsfirst": False}),
+        ("order", ("id",), {"desc": True}),
+        ("limit", (50,), {}),
+    ]
+
+
+def test_seek_after_timestamp_key_uses_quoted_or_filter():
+    position = {"sort": "recent", "key": "2026-01-02T03:04:05.123+00:00", "id": "b1"}
+    query = seek(RecordingQuery(), "scraped_at", position, 50)
+    filters = [call for call in query.calls if call[0] == "or_"]
+    assert filters == [(
+        "or_",
+        ('scraped_at.lt."2026-01-02T03:04:05.123+00:00",'
+         'and(scraped_at.eq."2026-01-02T03:04:05.123+00:00",id.lt."b1"),'
+         'scraped_at.is.null',),
+        {},
+    )]
+
+
+def test_seek_after_null_key_stays_in_trailing_nulls():
+    position = {"sort": "salary", "key": None, "id": "b1"}
+    query = seek(RecordingQuery(), "stipend_max", position, 20)
+    names = [call[0] for call in query.calls]
+    assert "or_" not in names
+    assert ("is_", ("stipend_max", "null"), {}) in query.calls
+    assert ("lt", ("id", "b1"), {}) in query.calls
+    assert query.calls[-1] == ("limit", (20,), {})
+
+
+def test_cursor_for_another_sort_is_rejected():
+    cursor = encode_cursor({"sort": "recent", "key": "2026-01-02T00:00:00", "id": "b1"})
+    with pytest.raises(HTTPException) as error:
+        cursor_position(cursor, "salary")
+    assert error.value.status_code == 400
+
+
+def test_malformed_cursor_is_rejected():
+    with pytest.raises(HTTPException) as error:
+        cursor_position("not-a-cursor", "recent")
+    assert error.value.status_code == 400
+
+
+def test_cursor_round_trips():
+    cursor = encode_cursor({"sort": "salary", "key": 15000, "id": "b1"})
+    assert cursor_position(cursor, "salary") == {"sort": "salary", "key": 15000, "id": "b1"}
+
+
+def test_next_cursor_points_after_the_last_row():
+    rows = [{"id": "b2", "stipend_max": 20000}, {"id": "b1", "stipend_max": None}]
+    cursor = next_cursor(rows, "stipend_max", "salary", limit=2)
+    assert cursor_position(cursor, "salary") == {"sort": "salary", "key": None, "id": "b1"}
+
+
+def test_next_cursor_is_omitted_on_a_short_last_page():
+    rows = [{"id": "b1", "scraped_at": "2026-01-02T00:00:00"}]
+    assert next_cursor(rows, "scraped_at", "recent", limit=2) is None
+    assert next_cursor([], "scraped_at", "recent", limit=2) is None
+
+
+def test_parse_fields_defaults_to_every_field():
+    assert parse_fields(None, InternshipResponse) == list(InternshipResponse.model_fields)
+
+
+def test_parse_fields_always_includes_id():
+    assert parse_fields("company, role", InternshipResponse) == ["id", "company", "role"]
+
+
+def test_parse_fields_rejects_unknown_fields():
+    with pytest.raises(HTTPException) as error:
+        parse_fields("company,salary_usd", InternshipResponse)
+    assert error.value.status_code == 400
+    assert "salary_usd" in error.value.detail
+
+
+def test_applications_page_on_immutable_applied_at(monkeypatch):
+    import asyncio
+
+    from fastapi import Response
+
+    from routers import applications
+
+    class FakeDB:
+        def __init__(self):
+            self.query = RecordingQuery()
+
+        def table(self, name):
+            return self.query
+
+    class Result:
+        data = [{"id": "a2", "applied_at": "2026-01-03T00:00:00+00:00"},
+                {"id": "a1", "applied_at": "2026-01-02T00:00:00+00:00"}]
+
+    async def execute(query):
+        return Result()
+
+    db = FakeDB()
+    monkeypatch.setattr(applications, "db", db)
+    monkeypatch.setattr(applications.db_pool, "execute", execute)
+
+    response = Response()
+    cursor = encode_cursor({"sort": "applied_at", "key": "2026-01-04T00:00:00+00:00", "id": "a3"})
+    asyncio.run(applications.get_applications("u1", response, limit=2, cursor=cursor, fields="id"))
+
+    assert ("order", ("applied_at",), {"desc": True, "nullsfirst": False}) in db.query.calls
+    assert cursor_position(response.headers["X-Next-Cursor"], "applied_at") == {
+        "sort": "applied_at", "key": "2026-01-02T00:00:00+00:00", "id": "a1",
+    }
+
+    # Cursors handed out while pages were ordered by updated_at no longer apply
+    stale = encode_cursor({"sort": "updated_at", "key": "2026-01-04T00:00:00+00:00", "id": "a3"})
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(applications.get_applications("u1", Response(), limit=2, cursor=stale, fields="id"))
+    assert error.value.status_code == 400
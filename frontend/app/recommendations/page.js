@@ -2,7 +2,7 @@
 
 import { useState, useEffect, useCallback } from "react";
 import Link from "next/link";
-import { fetchAPI } from "../../lib/api";
+import { fetchAPI, fetchAllPages } from "../../lib/api";
 import { auth } from "../../lib/auth";
 import { useRouter } from "next/navigation";
 
@@ -132,11 +132,11 @@ export default function RecommendationsPage() {
 
             // Load saved & applied IDs
             try {
-                const bms = await fetchAPI(`/bookmarks/${user.id}`);
+                const bms = await fetchAllPages(`/bookmarks/${user.id}?fields=id`);
                 if (bms) setSavedIds(new Set(bms.map(b => b.internship_id)));
             } catch (e) { /* table may not exist yet */ }
             try {
-                const apps = await fetchAPI(`/applications/${user.id}`);
+                const apps = await fetchAllPages(`/applications/${user.id}?fields=id`);
                 if (apps) setAppliedIds(new Set(apps.map(a => a.internship_id)));
             } catch (e) { /* table may not exist yet */ }
         };
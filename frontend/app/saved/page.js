@@ -1,7 +1,7 @@
 "use client";
 
 import { useState, useEffect } from "react";
-import { fetchAPI } from "../../lib/api";
+import { fetchAPI, fetchAllPages } from "../../lib/api";
 import { auth } from "../../lib/auth";
 import Link from "next/link";
 
@@ -33,7 +33,7 @@ export default function SavedPage() {
     const loadBookmarks = async (uid) => {
         setLoading(true);
         try {
-            const data = await fetchAPI(`/bookmarks/${uid}`);
+            const data = await fetchAllPages(`/bookmarks/${uid}`);
             setBookmarks(data || []);
         } catch (err) {
             /* table may not exist yet */
@@ -44,7 +44,7 @@ export default function SavedPage() {
 
     const loadAppliedIds = async (uid) => {
         try {
-            const apps = await fetchAPI(`/applications/${uid}`);
+            const apps = await fetchAllPages(`/applications/${uid}?fields=id`);
             if (apps) setAppliedIds(new Set(apps.map(a => a.internship_id)));
         } catch (e) { /* table may not exist yet */ }
     };
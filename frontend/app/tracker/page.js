@@ -1,7 +1,7 @@
 "use client";
 
 import { useState, useEffect } from "react";
-import { fetchAPI } from "../../lib/api";
+import { fetchAPI, fetchAllPages } from "../../lib/api";
 import { auth } from "../../lib/auth";
 import Link from "next/link";
 
@@ -41,7 +41,7 @@ export default function TrackerPage() {
     const loadApplications = async (uid) => {
         setLoading(true);
         try {
-            const data = await fetchAPI(`/applications/${uid}`);
+            const data = await fetchAllPages(`/applications/${uid}`);
             setApplications(data || []);
         } catch (err) {
             /* table may not exist yet */
@@ -41,6 +41,31 @@ export async function fetchAPI(endpoint, options = {}) {
     }
 }
 
+// Fetch every page of a cursor-paginated list; the backend puts the next
+// page's cursor in the X-Next-Cursor header and leaves it off the last page
+export async function fetchAllPages(endpoint, pageSize = 100) {
+    const token = getAuthToken();
+    const headers = token ? { 'Authorization': `Bearer ${token}` } : {};
+    const separator = endpoint.includes('?') ? '&' : '?';
+    const items = [];
+    let cursor = null;
+
+    do {
+        const query = `limit=${pageSize}` + (cursor ? `&cursor=${encodeURIComponent(cursor)}` : '');
+        const res = await fetch(`${API_BASE_URL}${endpoint}${separator}${query}`, { headers });
+
+        if (!res.ok) {
+            const errorData = await res.json().catch(() => ({}));
+            throw new Error(errorData.detail || `API Error: ${res.status}`);
+        }
+
+        items.push(...(await res.json()));
+        cursor = res.headers.get('X-Next-Cursor');
+    } while (cursor);
+
+    return items;
+}
+
 export async function uploadFile(file) {
     console.log('[uploadFile] Starting upload...');
     console.log('[uploadFile] File:', file.name, 'Size:', file.size, 'Type:', file.type);